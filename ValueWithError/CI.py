@@ -1,22 +1,55 @@
 from __future__ import annotations
 
-from typing import Iterator
+import itertools
+from typing import Iterator, Sequence
 
 import numpy as np
 from overrides import overrides
-from pydantic import BaseModel, model_validator, Field
+from pydantic import BaseModel, ConfigDict, model_validator, Field
 
 from .iface import I_CI
 from .repr_config import ValueWithErrorRepresentationConfig, CI_repr
+from .trusted import construct_trusted
+
+
+def is_level_95(level: float) -> bool:
+    """Same tolerance as `np.isclose(level, 0.95)`, without its overhead on scalars."""
+    return abs(level - 0.95) <= 1e-8 + 1e-5 * 0.95
+
+
+def checked_levels(levels: float | Sequence[float] | np.ndarray) -> np.ndarray:
+    """
+    CI levels as a float64 vector, for the batch CIs. The levels close to 0.95 are snapped to it, as by
+    `is_level_95` in `get_CI`.
+    """
+    levels = np.atleast_1d(np.asarray(levels, dtype=np.float64))
+    if levels.ndim != 1:
+        raise ValueError(f"Expected a sequence of CI levels, got shape {levels.shape}")
+    if not np.all((levels > 0) & (levels < 1)):
+        raise ValueError(f"CI levels must be between 0 and 1, got {levels}")
+    return np.where(np.abs(levels - 0.95) <= 1e-8 + 1e-5 * 0.95, 0.95, levels)
+
+
+def _as_vector(generator: Iterator[float] | np.ndarray, N: int | None) -> np.ndarray:
+    """The first N values as a numpy array, without a detour through a Python list."""
+    if isinstance(generator, np.ndarray):
+        return generator if N is None else generator[:N]
+    return np.fromiter(itertools.islice(generator, N), dtype=np.float64)
 
 
 class CI_95(I_CI, BaseModel):
     lower_: float  # type: ignore
     upper_: float  # type: ignore
+    model_config = ConfigDict(defer_build=True)
 
     def __init__(self, lower: float, upper: float, **kwargs):
         super().__init__(lower_=lower, upper_=upper, **kwargs)
 
+    @classmethod
+    def _from_trusted(cls, lower: float, upper: float) -> CI_95:
+        """Builds the CI from already valid bounds, without pydantic validation."""
+        return construct_trusted(cls, {"lower_": float(lower), "upper_": float(upper)})
+
     @property
     @overrides
     def lower(self) -> float:
@@ -47,9 +80,9 @@ class CI_95(I_CI, BaseModel):
     def CreateFromVector(
         generator: Iterator[float] | np.ndarray, N: int | None = None
     ) -> CI_95:
-        v = [x for i, x in enumerate(generator) if N is None or i < N]
+        v = _as_vector(generator, N)
         perc = np.percentile(v, [2.5, 97.5])
-        return CI_95(lower=float(perc[0]), upper=float(perc[1]))
+        return CI_95._from_trusted(perc[0], perc[1])
 
     @property
     @overrides
@@ -57,13 +90,14 @@ class CI_95(I_CI, BaseModel):
         return 0.95
 
     def __neg__(self) -> CI_95:
-        return CI_95(lower=-self.upper, upper=-self.lower)
+        return CI_95._from_trusted(-self.upper_, -self.lower_)
 
 
 class CI_any(I_CI, BaseModel):
     lower_: float  # type: ignore
     upper_: float  # type: ignore
     level_: float = Field(gt=0, lt=1)  # type: ignore
+    model_config = ConfigDict(defer_build=True)
 
     @property
     def level(self) -> float:
@@ -72,6 +106,19 @@ class CI_any(I_CI, BaseModel):
     def __init__(self, lower: float, upper: float, level: float = 0.95, **kwargs):
         super().__init__(lower_=lower, upper_=upper, level_=level, **kwargs)
 
+    @classmethod
+    def _from_trusted(cls, lower: float, upper: float, level: float) -> CI_any:
+        """
+        Builds the CI from already valid bounds, without pydantic validation.
+        The level usually comes from the user, so it is still checked.
+        """
+        if not 0 < level < 1:
+            raise ValueError(f"CI level must be between 0 and 1, got {level}")
+        return construct_trusted(
+            cls,
+            {"lower_": float(lower), "upper_": float(upper), "level_": float(level)},
+        )
+
     @model_validator(mode="after")
     def lower_le_upper(self):
         if self.lower_ > self.upper_:
@@ -104,15 +151,13 @@ class CI_any(I_CI, BaseModel):
         N: int | None = None,
         level: float = 0.95,
     ) -> CI_95 | CI_any:
-        v = [x for i, x in enumerate(generator) if N is None or i < N]
+        v = _as_vector(generator, N)
 
         perc = np.percentile(v, [(1 - level) * 50, 100 - (1 - level) * 50])
-        if level == 0.95:
-            return CI_95(lower=float(perc[0]), upper=float(perc[1]), level=0.95)
+        if is_level_95(level):
+            return CI_95._from_trusted(perc[0], perc[1])
         else:
-            return CI_any(
-                lower=float(perc[0]), upper=float(perc[1]), level=float(level)
-            )
+            return CI_any._from_trusted(perc[0], perc[1], level)
 
     def __neg__(self) -> CI_any:
-        return CI_any(lower=-self.upper, upper=-self.lower, level=self.level)
+        return CI_any._from_trusted(-self.upper_, -self.lower_, self.level_)
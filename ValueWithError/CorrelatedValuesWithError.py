@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+from numbers import Number
+
+import numpy as np
+
+from .ImplNormalValueWithError import ImplNormalValueWithError
+from .ValueWithError import ValueWithError
+from .ValueWithErrorArray import KIND_NORMAL, ValueWithErrorArray
+
+
+class CorrelatedValuesWithError:
+    """
+    Vector of normal estimates with their covariance matrix, for the estimates that are not independent.
+
+    The covariance is stored either as a full matrix or, for estimates correlated only with their
+    neighbours (e.g. along time), as its bands: `bands[k, i]` is the covariance of the elements i and i + k,
+    for k up to the bandwidth. Linear transforms propagate the covariance exactly: `A @ x` has the covariance
+    `A Σ Aᵀ`, computed with BLAS for the full matrices and band by band for the banded ones, and sums and
+    contrasts are `wᵀ Σ w`. Indexing gives the ordinary (marginal) `ValueWithError` of an element.
+
+    Unlike the scalar estimates, the vector is scaled as a random variable: `c * x` has the covariance `c² Σ`.
+    """
+
+    # Let numpy defer to our reflected operators, i.e. `ndarray @ CorrelatedValuesWithError`.
+    __array_ufunc__ = None
+
+    def __init__(
+        self,
+        value: np.ndarray | list[float],
+        covariance: np.ndarray | list[list[float]],
+    ):
+        value = np.asarray(value, dtype=np.float64)
+        covariance = np.asarray(covariance, dtype=np.float64)
+        if value.ndim != 1:
+            raise ValueError(f"Expected a 1-dimensional array, got shape {value.shape}")
+        if covariance.shape != (len(value), len(value)):
+            raise ValueError(
+                f"Covariance of shape {covariance.shape} does not match {len(value)} values"
+            )
+        if not np.allclose(covariance, covariance.T, rtol=1e-12, atol=0):
+            raise ValueError("Covariance matrix must be symmetric")
+        if not np.all(np.diag(covariance) >= 0):
+            raise ValueError("Variances must be non-negative")
+        self._value = value
+        self._covariance: np.ndarray | None = (covariance + covariance.T) / 2
+        self._bands: np.ndarray | None = None
+
+    @classmethod
+    def _from_trusted(
+        cls,
+        value: np.ndarray,
+        covariance: np.ndarray | None = None,
+        bands: np.ndarray | None = None,
+    ) -> CorrelatedValuesWithError:
+        """Builds the vector from an already valid covariance, given either as a full matrix or as bands."""
+        ans = cls.__new__(cls)
+        ans._value = value
+        ans._covariance = covariance
+        ans._bands = bands
+        return ans
+
+    @classmethod
+    def from_bands(
+        cls, value: np.ndarray | list[float], bands: np.ndarray | list[list[float]]
+    ) -> CorrelatedValuesWithError:
+        """
+        :param bands: Array of shape (bandwidth + 1, n): `bands[0]` are the variances and `bands[k, i]` the
+            covariance of the elements i and i + k. The last k elements of `bands[k]` are ignored, and so are
+            the bands beyond the (n - 1)-th, which have no elements.
+        """
+        value = np.asarray(value, dtype=np.float64)
+        bands = np.array(bands, dtype=np.float64, ndmin=2)
+        if value.ndim != 1:
+            raise ValueError(f"Expected a 1-dimensional array, got shape {value.shape}")
+        if bands.ndim != 2 or bands.shape[1] != len(value):
+            raise ValueError(
+                f"Bands of shape {bands.shape} do not match {len(value)} values"
+            )
+        if not np.all(bands[0] >= 0):
+            raise ValueError("Variances must be non-negative")
+        bands = bands[: max(1, len(value))]
+        for k in range(1, len(bands)):
+            bands[k, len(value) - k :] = 0
+        return cls._from_trusted(value, bands=bands)
+
+    @classmethod
+    def from_array(cls, array: ValueWithErrorArray) -> CorrelatedValuesWithError:
+        """Independent estimates (a diagonal covariance). Elements without error have zero variance."""
+        variance = np.where(np.isnan(array.SE), 0.0, array.SE**2)
+        return cls._from_trusted(array.value.copy(), bands=variance[None, :])
+
+    @classmethod
+    def from_samples(cls, samples: np.ndarray) -> CorrelatedValuesWithError:
+        """
+        Means of the columns of the draws of shape (n_draws, n), with the covariance of the means,
+        i.e. the sample covariance of the columns divided by the number of draws.
+        """
+        samples = np.asarray(samples, dtype=np.float64)
+        if samples.ndim != 2 or len(samples) < 2:
+            raise ValueError("Expected at least 2 draws of shape (n_draws, n)")
+        covariance = np.atleast_2d(np.cov(samples, rowvar=False)) / len(samples)
+        return cls._from_trusted(samples.mean(axis=0), covariance=covariance)
+
+    def __len__(self) -> int:
+        return len(self._value)
+
+    @property
+    def value(self) -> np.ndarray:
+        return self._value
+
+    @property
+    def variance(self) -> np.ndarray:
+        if self._bands is not None:
+            return self._bands[0]
+        assert self._covariance is not None
+        return np.diag(self._covariance)
+
+    @property
+    def SE(self) -> np.ndarray:
+        return np.sqrt(self.variance)
+
+    @property
+    def bandwidth(self) -> int | None:
+        """Number of the stored off-diagonal bands, or None if the covariance is a full matrix."""
+        return None if self._bands is None else len(self._bands) - 1
+
+    @property
+    def covariance(self) -> np.ndarray:
+        """The full covariance matrix (built from the bands for the banded vectors)."""
+        if self._covariance is not None:
+            return self._covariance
+        assert self._bands is not None
+        n = len(self)
+        ans = np.diag(self._bands[0])
+        for k in range(1, len(self._bands)):
+            index = np.arange(n - k)
+            ans[index, index + k] = ans[index + k, index] = self._bands[k, : n - k]
+        return ans
+
+    @property
+    def correlation(self) -> np.ndarray:
+        SE = self.SE
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.covariance / np.outer(SE, SE)
+
+    def _covariance_times(self, B: np.ndarray) -> np.ndarray:
+        """Σ @ B for a matrix B of shape (n, m)."""
+        if self._covariance is not None:
+            return self._covariance @ B
+        assert self._bands is not None
+        ans = self._bands[0][:, None] * B
+        n = len(self)
+        for k in range(1, min(len(self._bands), n)):
+            band = self._bands[k, : n - k][:, None]
+            ans[: n - k] += band * B[k:]
+            ans[k:] += band * B[: n - k]
+        return ans
+
+    def contrast(self, weights: np.ndarray | list[float]) -> ValueWithError:
+        """The linear combination `weights · x`, with the variance `wᵀ Σ w`."""
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.shape != self._value.shape:
+            raise ValueError(
+                f"Weights of shape {weights.shape} do not match {len(self)} values"
+            )
+        variance = float(weights @ self._covariance_times(weights[:, None])[:, 0])
+        return ValueWithError._from_trusted(
+            ImplNormalValueWithError._from_trusted(
+                weights @ self._value, np.sqrt(max(variance, 0.0))
+            )
+        )
+
+    def sum(self) -> ValueWithError:
+        return self.contrast(np.ones(len(self)))
+
+    def mean(self) -> ValueWithError:
+        return self.contrast(np.full(len(self), 1 / len(self)))
+
+    def __rmatmul__(self, A: np.ndarray) -> CorrelatedValuesWithError | ValueWithError:
+        """`A @ x`: the linear transform with the covariance `A Σ Aᵀ`. A vector A gives the contrast."""
+        A = np.asarray(A, dtype=np.float64)
+        if A.ndim == 1:
+            return self.contrast(A)
+        if A.ndim != 2 or A.shape[1] != len(self):
+            raise ValueError(f"Cannot multiply {A.shape} matrix by {len(self)} values")
+        covariance = A @ self._covariance_times(A.T)
+        return CorrelatedValuesWithError._from_trusted(
+            A @ self._value, covariance=(covariance + covariance.T) / 2
+        )
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return ValueWithError._from_trusted(
+                ImplNormalValueWithError._from_trusted(
+                    self._value[index], np.sqrt(self.variance[index])
+                )
+            )
+        if (
+            isinstance(index, slice)
+            and self._bands is not None
+            and index.step in (None, 1)
+        ):
+            # A contiguous part of a banded covariance is still banded.
+            start, stop, _ = index.indices(len(self))
+            stop = max(start, stop)
+            bands = self._bands[: max(stop - start, 1), start:stop].copy()
+            for k in range(1, len(bands)):
+                bands[k, stop - start - k :] = 0
+            return CorrelatedValuesWithError._from_trusted(
+                self._value[start:stop], bands=bands
+            )
+        index = np.arange(len(self))[index]
+        return CorrelatedValuesWithError._from_trusted(
+            np.atleast_1d(self._value[index]),
+            covariance=self.covariance[np.ix_(index, index)],
+        )
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def to_array(self) -> ValueWithErrorArray:
+        """The marginal estimates, as independent normal ones."""
+        n = len(self)
+        return ValueWithErrorArray._from_trusted(
+            self._value,
+            self.SE,
+            np.full(n, np.nan),
+            np.full(n, KIND_NORMAL, dtype=np.int8),
+        )
+
+    def __neg__(self) -> CorrelatedValuesWithError:
+        return CorrelatedValuesWithError._from_trusted(
+            -self._value, covariance=self._covariance, bands=self._bands
+        )
+
+    def __add__(self, other) -> CorrelatedValuesWithError:
+        """Adds a constant, or an independent vector of estimates (the covariances add up)."""
+        if isinstance(other, (Number, np.ndarray)):
+            return CorrelatedValuesWithError._from_trusted(
+                self._value + np.asarray(other, dtype=np.float64),
+                covariance=self._covariance,
+                bands=self._bands,
+            )
+        if isinstance(other, ValueWithErrorArray):
+            other = CorrelatedValuesWithError.from_array(other)
+        if not isinstance(other, CorrelatedValuesWithError):
+            return NotImplemented
+        if len(other) != len(self):
+            raise ValueError(
+                f"Cannot add vectors of different lengths: {len(self)} and {len(other)}"
+            )
+        value = self._value + other._value
+        if self._bands is not None and other._bands is not None:
+            bands = np.zeros((max(len(self._bands), len(other._bands)), len(self)))
+            bands[: len(self._bands)] += self._bands
+            bands[: len(other._bands)] += other._bands
+            return CorrelatedValuesWithError._from_trusted(value, bands=bands)
+        return CorrelatedValuesWithError._from_trusted(
+            value, covariance=self.covariance + other.covariance
+        )
+
+    def __radd__(self, other) -> CorrelatedValuesWithError:
+        return self.__add__(other)
+
+    def __sub__(self, other) -> CorrelatedValuesWithError:
+        return self.__add__(-other)
+
+    def __rsub__(self, other) -> CorrelatedValuesWithError:
+        return (-self).__add__(other)
+
+    def __mul__(self, other) -> CorrelatedValuesWithError:
+        """
+        Scales the elements by constants: the covariance becomes `D Σ D` for D = diag(other), as for any linear
+        transform. The SEs are thus scaled by |other|, as by `ValueWithErrorArray`, so `(2 * x).to_array()`
+        equals `2 * x.to_array()`.
+        """
+        if not isinstance(other, (Number, np.ndarray)):
+            return NotImplemented
+        scale = np.broadcast_to(np.asarray(other, dtype=np.float64), self._value.shape)
+        value = self._value * scale
+        if self._bands is not None:
+            n = len(self)
+            bands = self._bands * scale
+            for k in range(min(len(bands), n)):
+                bands[k, : n - k] *= scale[k:]
+            return CorrelatedValuesWithError._from_trusted(value, bands=bands)
+        assert self._covariance is not None
+        return CorrelatedValuesWithError._from_trusted(
+            value, covariance=self._covariance * np.outer(scale, scale)
+        )
+
+    def __rmul__(self, other) -> CorrelatedValuesWithError:
+        return self.__mul__(other)
+
+    def __repr__(self) -> str:
+        if self._bands is not None:
+            return f"CorrelatedValuesWithError.from_bands(value={self._value!r}, bands={self._bands!r})"
+        return f"CorrelatedValuesWithError(value={self._value!r}, covariance={self._covariance!r})"
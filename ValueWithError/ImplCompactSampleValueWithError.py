@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+from typing import Literal, Sequence
+
+import numpy as np
+from overrides import overrides
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from .CI import CI_95, CI_any, checked_levels, is_level_95
+from .critical_values import COMMON_LEVELS
+from .ImplNormalValueWithError import ImplNormalValueWithError
+from .ImplStudentValueWithError import ImplStudentValueWithError
+from .iface import I_CI, IValueWithError_Estimate
+from .moments import Moments, frequency_moments, sample_moments
+from .order_statistics import frequency_quantiles, sample_quantiles
+from .pydantic_numpy import NDArraySerializer
+from .repr_config import (
+    ValueWithErrorRepresentationConfig as Config,
+    suggested_precision_digit_pos_for_SE,
+    repr_value_with_error,
+)
+
+# Number of the evenly spaced cells of the quantile grid. With the tails of the common CI levels it makes
+# about 150 quantiles, i.e. about 1.2 KB of float64 data.
+DEFAULT_GRID_SIZE = 128
+
+
+# Probabilities of the bounds of `CI95`, which are slightly different from `_CI_probabilities(0.95)`
+_CI95_PROBABILITIES = np.true_divide([2.5, 97.5], 100)
+
+
+def _CI_probabilities(level: float | np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Probabilities of the CI bounds, computed exactly as for the percentile CIs of the full sample."""
+    level = np.asarray(level, dtype=np.float64)
+    return (
+        np.true_divide((1 - level) * 50, 100),
+        np.true_divide(100 - (1 - level) * 50, 100),
+    )
+
+
+def quantile_grid(grid_size: int = DEFAULT_GRID_SIZE) -> np.ndarray:
+    """
+    Probabilities of the quantiles kept by the compact sample: an even grid of `grid_size` cells, plus the
+    bounds of the CIs at the common levels, so that these CIs are exactly the ones of the full sample.
+    """
+    if grid_size < 1:
+        raise ValueError(f"grid_size must be positive, got {grid_size}")
+    lower, upper = _CI_probabilities(np.asarray(COMMON_LEVELS))
+    return np.unique(
+        np.concatenate(
+            [np.linspace(0, 1, grid_size + 1), lower, upper, _CI95_PROBABILITIES]
+        )
+    )
+
+
+class ImplCompactSampleValueWithError(IValueWithError_Estimate, BaseModel):
+    """
+    Fixed-size summary of a sample: its exact count, mean and M2, and its quantiles on a grid of probabilities.
+
+    It gives the same mean, SD, SE and Student estimate as the full sample, and the percentile CIs at the
+    common levels exactly. Other quantiles are interpolated linearly between the neighbouring grid
+    points. The exact quantile lies between the same two points, so the error is bounded by the distance
+    between them (see `quantile_error_bound` and `CI_error_bound`).
+
+    It is built from the raw draws (`from_sample`, also for memory-mapped samples bigger than RAM) or
+    directly from a frequency table (`from_frequencies`), and takes a few KB whatever the size of the sample.
+    """
+
+    kind_: Literal["compact_sample"] = Field(default="compact_sample", alias="kind")
+    N_: int = Field(alias="N", ge=1)
+    value_: float = Field(alias="value")
+    M2_: float = Field(alias="M2", ge=0)
+    probabilities_: NDArraySerializer = Field(alias="probabilities")
+    quantiles_: NDArraySerializer = Field(alias="quantiles")
+    model_config = ConfigDict(
+        arbitrary_types_allowed=True, serialize_by_alias=True, defer_build=True
+    )
+
+    @model_validator(mode="after")
+    def check_grid(self):
+        self._check_grid()
+        return self
+
+    def _check_grid(self):
+        probabilities = np.asarray(self.probabilities_, dtype=np.float64)
+        quantiles = np.asarray(self.quantiles_, dtype=np.float64)
+        if probabilities.ndim != 1 or probabilities.shape != quantiles.shape:
+            raise ValueError(
+                "probabilities and quantiles must be vectors of the same length"
+            )
+        if len(probabilities) < 2 or probabilities[0] != 0 or probabilities[-1] != 1:
+            raise ValueError("probabilities must start at 0 and end at 1")
+        if not np.all(np.diff(probabilities) > 0):
+            raise ValueError("probabilities must be strictly increasing")
+        if not np.isnan(quantiles).any() and np.any(np.diff(quantiles) < 0):
+            raise ValueError("quantiles must be non-decreasing")
+        self.probabilities_ = probabilities
+        self.quantiles_ = quantiles
+
+    @classmethod
+    def _from_trusted(
+        cls, moments: Moments, probabilities: np.ndarray, quantiles: np.ndarray
+    ) -> ImplCompactSampleValueWithError:
+        count, mean, M2 = moments
+        if count == 0:
+            raise ValueError("Cannot summarize an empty sample")
+        return cls.model_construct(
+            N_=count,
+            value_=mean,
+            M2_=M2,
+            probabilities_=probabilities,
+            quantiles_=quantiles,
+        )
+
+    @classmethod
+    def from_sample(
+        cls,
+        sample: np.ndarray,
+        grid_size: int = DEFAULT_GRID_SIZE,
+        moments: Moments | None = None,
+    ) -> ImplCompactSampleValueWithError:
+        """
+        Summarizes the raw draws. Both the moments and the quantiles are computed in chunks, so the sample
+        can be a memory map bigger than RAM.
+        :param moments: Already known moments of the sample, to save a pass over it.
+        """
+        probabilities = quantile_grid(grid_size)
+        if moments is None:
+            moments = sample_moments(sample)
+        if moments[0] == 0:
+            raise ValueError("Cannot summarize an empty sample")
+        return cls._from_trusted(
+            moments, probabilities, sample_quantiles(sample, probabilities)
+        )
+
+    @classmethod
+    def from_frequencies(
+        cls,
+        values: np.ndarray,
+        counts: np.ndarray,
+        grid_size: int = DEFAULT_GRID_SIZE,
+    ) -> ImplCompactSampleValueWithError:
+        """
+        Summarizes the sample given as a frequency table: `counts[i]` draws of `values[i]`. The result is the
+        same as from `np.repeat(values, counts)`, but the table is never expanded. The counts must be whole
+        numbers, though they may be given as floats.
+        """
+        counts = np.asarray(counts)
+        if not np.issubdtype(counts.dtype, np.integer):
+            with np.errstate(invalid="ignore"):
+                whole = np.all(np.isfinite(counts) & (np.round(counts) == counts))
+            if not whole:
+                raise ValueError("counts must be whole numbers")
+            counts = counts.astype(np.int64)
+        probabilities = quantile_grid(grid_size)
+        return cls._from_trusted(
+            frequency_moments(values, counts),
+            probabilities,
+            frequency_quantiles(values, counts, probabilities),
+        )
+
+    def quantile(self, q: float | np.ndarray) -> np.ndarray:
+        """
+        Quantiles of the sample (as `np.quantile` with the default, linear method). Exact on the grid points,
+        linearly interpolated between them.
+        """
+        q = np.asarray(q, dtype=np.float64)
+        if np.any((q < 0) | (q > 1)):
+            raise ValueError("Quantiles must be in the range [0, 1]")
+        with np.errstate(invalid="ignore"):
+            ans = np.interp(q, self.probabilities_, self.quantiles_)
+        # np.interp is not exact on the grid points next to infinite quantiles
+        index = np.minimum(
+            np.searchsorted(self.probabilities_, q), len(self.probabilities_) - 1
+        )
+        return np.where(self.probabilities_[index] == q, self.quantiles_[index], ans)
+
+    def quantile_error_bound(self, q: float | np.ndarray) -> np.ndarray:
+        """
+        Upper bound of the absolute error of `quantile(q)`: the distance between the grid points around q
+        (zero on the grid points).
+        """
+        q = np.asarray(q, dtype=np.float64)
+        index = np.clip(
+            np.searchsorted(self.probabilities_, q, side="right"),
+            1,
+            len(self.probabilities_) - 1,
+        )
+        on_grid = (self.probabilities_[index - 1] == q) | (
+            self.probabilities_[index] == q
+        )
+        width = self.quantiles_[index] - self.quantiles_[index - 1]
+        return np.where(on_grid, 0.0, width)
+
+    def CI_error_bound(self, level: float) -> float:
+        """Upper bound of the absolute error of both bounds of `get_CI(level)`."""
+        return float(np.max(self.quantile_error_bound(_CI_probabilities(level))))
+
+    @property
+    def moments(self) -> Moments:
+        return self.N_, self.value_, self.M2_
+
+    @property
+    @overrides
+    def N(self) -> int:
+        return self.N_
+
+    @overrides
+    def get_CI_from_SD(self, level: float) -> I_CI:
+        return self.student_estimate().get_CI_from_SD(level=level)
+
+    @property
+    @overrides
+    def value(self) -> float:
+        return self.value_
+
+    @property
+    @overrides
+    def SD(self) -> float:
+        return float(np.sqrt(self.M2_ / self.N_))
+
+    @property
+    @overrides
+    def SE(self) -> float:
+        return float(self.SD / np.sqrt(self.N_))
+
+    @overrides
+    def suggested_precision_digit_pos(self, config: Config) -> int | None:
+        return suggested_precision_digit_pos_for_SE(
+            self.value, self.SD if config.prefer_sd else self.SE, config
+        )
+
+    @overrides
+    def pretty_repr(
+        self,
+        config: Config,
+        absolute_precision_digit: int | None = None,
+    ) -> str:
+        if absolute_precision_digit is None:
+            absolute_precision_digit = self.suggested_precision_digit_pos(config)
+        if absolute_precision_digit is None:
+            absolute_precision_digit = config.significant_digit_bare - 1
+        if config.prefer_sd:
+            return repr_value_with_error(
+                self.value, self.SD, absolute_precision_digit, config
+            )
+        return repr_value_with_error(
+            self.value, self.SE, absolute_precision_digit, config
+        )
+
+    @property
+    @overrides
+    def CI95(self) -> CI_95:
+        lower, upper = self.quantile(_CI95_PROBABILITIES).tolist()
+        return CI_95._from_trusted(lower, upper)
+
+    @overrides
+    def get_CI(self, level: float) -> I_CI:
+        lower, upper = self.quantile(_CI_probabilities(level)).tolist()
+        if is_level_95(level):
+            return CI_95._from_trusted(lower, upper)
+        return CI_any._from_trusted(lower, upper, level)
+
+    @overrides
+    def get_CIs(
+        self, levels: Sequence[float] | np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        lower, upper = _CI_probabilities(checked_levels(levels))
+        return self.quantile(lower), self.quantile(upper)
+
+    def student_estimate(self) -> ImplStudentValueWithError:
+        SE = self.SE
+        if not SE >= 0:
+            raise ValueError(f"Failed to create student estimate: SE is {SE}")
+        return ImplStudentValueWithError._from_trusted(self.value, SE, self.N)
+
+    @property
+    def SDEstimate(self) -> ImplNormalValueWithError:
+        SD = self.SD
+        return ImplNormalValueWithError._from_trusted(SD, SD / np.sqrt(self.N - 1))
+
+    @property
+    def SEEstimate(self) -> ImplNormalValueWithError:
+        SE = self.SE
+        return ImplNormalValueWithError._from_trusted(SE, SE / np.sqrt(self.N - 1))
+
+    def __str__(self) -> str:
+        config = Config()
+        return self.pretty_repr(config, self.suggested_precision_digit_pos(config))
+
+    @property
+    @overrides
+    def short_description(self) -> str:
+        return f"summary of a continuous sample of size {self.N} with mean {self}"
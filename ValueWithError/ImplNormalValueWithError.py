@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import numpy as np
 from numbers import Number
+from typing import Sequence
 from overrides import overrides
-from pydantic import BaseModel, Field, ConfigDict
-from scipy.stats import norm as norm_dist
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import core_schema
 
-from .CI import CI_95, CI_any
+from .CI import CI_95, CI_any, checked_levels, is_level_95
+from .critical_values import critical_value, critical_values
 from .ImplValueWithoutError import ImplValueWithoutError
 from .iface import (
     IValueWithError_SE,
@@ -19,17 +21,38 @@ from .repr_config import (
     repr_value_with_error,
     suggested_precision_digit_pos_for_SE,
 )
+from .slots_model import SlotsModel, checked_float, checked_non_negative
 
 
 class ImplNormalValueWithError(
-    BaseModel, IValueWithError_SE, IValueWithError_LinearTransforms
+    SlotsModel, IValueWithError_SE, IValueWithError_LinearTransforms
 ):
-    value_: float = Field(alias="value")
-    SE_: float = Field(ge=0, alias="SE")
-    model_config = ConfigDict(serialize_by_alias=True)
-
-    # def __init__(self, value: float, SE: float, **kwargs):
-    #     super().__init__(value_=value, SE_=SE, **kwargs)
+    __slots__ = ("value_", "SE_")
+    _fields = {"value_": "value", "SE_": "SE"}
+    kind_ = "normal"
+    value_: float
+    SE_: float
+
+    def __init__(self, value: float, SE: float):
+        object.__setattr__(self, "value_", checked_float("value", value))
+        object.__setattr__(self, "SE_", checked_non_negative("SE", SE))
+
+    @classmethod
+    def _from_trusted(cls, value: float, SE: float) -> ImplNormalValueWithError:
+        """Builds the object from already valid values, without validation."""
+        ans = object.__new__(cls)
+        object.__setattr__(ans, "value_", float(value))
+        object.__setattr__(ans, "SE_", float(SE))
+        return ans
+
+    @classmethod
+    def _fields_schema(
+        cls, handler: GetCoreSchemaHandler
+    ) -> dict[str, core_schema.TypedDictField]:
+        return {
+            "value": core_schema.typed_dict_field(core_schema.float_schema()),
+            "SE": core_schema.typed_dict_field(core_schema.float_schema(ge=0)),
+        }
 
     @property
     @overrides
@@ -47,25 +70,30 @@ class ImplNormalValueWithError(
 
     @overrides
     def get_CI(self, level: float) -> I_CI:
-        if np.isclose(level, 0.95):
-            return CI_95(
+        if is_level_95(level):
+            return CI_95._from_trusted(
                 self.value_ - 1.959963984540054 * self.SE_,
                 self.value_ + 1.959963984540054 * self.SE_,
             )
         else:
-            z = float(norm_dist.ppf(1 - (1 - level) / 2))
-            return CI_any(
-                lower=self.value_ - z * self.SE_,
-                upper=self.value_ + z * self.SE_,
-                level=level,
+            z = critical_value(level)
+            return CI_any._from_trusted(
+                self.value_ - z * self.SE_, self.value_ + z * self.SE_, level
             )
 
+    @overrides
+    def get_CIs(
+        self, levels: Sequence[float] | np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        half_width = critical_values(checked_levels(levels)) * self.SE_
+        return self.value_ - half_width, self.value_ + half_width
+
     @property
     @overrides
     def CI95(self) -> I_CI:
-        return CI_95(
-            lower=self.value_ - 1.959963984540054 * self.SE_,
-            upper=self.value_ + 1.959963984540054 * self.SE_,
+        return CI_95._from_trusted(
+            self.value_ - 1.959963984540054 * self.SE_,
+            self.value_ + 1.959963984540054 * self.SE_,
         )
 
     @overrides
@@ -84,7 +112,7 @@ class ImplNormalValueWithError(
 
     @overrides
     def __neg__(self) -> ImplNormalValueWithError:
-        return ImplNormalValueWithError(value=-self.value_, SE=self.SE_)
+        return ImplNormalValueWithError._from_trusted(-self.value_, self.SE_)
 
     @overrides
     def __add__(  # pyright: ignore[reportIncompatibleMethodOverride]
@@ -92,18 +120,18 @@ class ImplNormalValueWithError(
     ) -> IValueWithError_LinearTransforms:
         if isinstance(other, Number):
             # noinspection PyTypeChecker
-            return ImplNormalValueWithError(
-                value=self.value_ + float(other),  # type: ignore[reportArgumentType]
-                SE=self.SE_,  # type: ignore[reportArgumentType]
+            return ImplNormalValueWithError._from_trusted(
+                self.value_ + float(other),  # type: ignore[reportArgumentType]
+                self.SE_,
             )
         elif isinstance(other, ImplValueWithoutError):
-            return ImplNormalValueWithError(
-                value=self.value_ + other.value_, SE=self.SE_
+            return ImplNormalValueWithError._from_trusted(
+                self.value_ + other.value_, self.SE_
             )
         elif isinstance(other, ImplNormalValueWithError):
             # A little controversial, as this implies that the errors are independent
-            return ImplNormalValueWithError(
-                value=self.value_ + other.value_, SE=np.sqrt(self.SE_**2 + other.SE_**2)
+            return ImplNormalValueWithError._from_trusted(
+                self.value_ + other.value_, np.sqrt(self.SE_**2 + other.SE_**2)
             )
         else:
             raise ValueError(f"Unsupported type for addition: {type(other)}")
@@ -113,13 +141,13 @@ class ImplNormalValueWithError(
         self, other: IValueWithError_Minimal | Number
     ) -> IValueWithError_LinearTransforms:
         if isinstance(other, Number):
-            return ImplNormalValueWithError(
-                value=self.value_ * float(other),  # type: ignore[reportArgumentType]
-                SE=self.SE_,  # type: ignore[reportArgumentType]
+            return ImplNormalValueWithError._from_trusted(
+                self.value_ * float(other),  # type: ignore[reportArgumentType]
+                self.SE_,
             )
         elif isinstance(other, ImplValueWithoutError):
-            return ImplNormalValueWithError(
-                value=self.value_ * other.value_, SE=self.SE_
+            return ImplNormalValueWithError._from_trusted(
+                self.value_ * other.value_, self.SE_
             )
         else:
             raise ValueError(
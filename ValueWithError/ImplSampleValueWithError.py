@@ -1,13 +1,47 @@
 from __future__ import annotations
 
+from numbers import Number
+from typing import Literal, Sequence
+
 import numpy as np
 from overrides import overrides
-from pydantic import BaseModel, ConfigDict, Field
+from numpy.typing import DTypeLike
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PrivateAttr,
+    field_validator,
+    model_serializer,
+    model_validator,
+)
 
-from .CI import CI_95, CI_any
+from .bootstrap import (
+    BOOTSTRAP_CHUNK_SIZE,
+    DEFAULT_RESAMPLES,
+    BootstrapResult,
+    Statistic,
+    bootstrap,
+)
+from .CI import CI_95, CI_any, checked_levels, is_level_95
+from .ImplCompactSampleValueWithError import (
+    DEFAULT_GRID_SIZE,
+    ImplCompactSampleValueWithError,
+    quantile_grid,
+)
 from .ImplNormalValueWithError import ImplNormalValueWithError
 from .ImplStudentValueWithError import ImplStudentValueWithError
-from .iface import IValueWithError_Sample, I_CI, IValueWithError_Estimate
+from .ImplValueWithoutError import ImplValueWithoutError
+from .iface import (
+    IValueWithError_Sample,
+    I_CI,
+    IValueWithError_Estimate,
+    IValueWithError_LinearTransforms,
+    IValueWithError_Minimal,
+)
+from .moments import Moments, sample_moments
+from .order_statistics import sample_quantiles, sorted_quantiles
+from .parallel import TASK_SIZE
 from .pydantic_numpy import NDArraySerializer
 from .repr_config import (
     ValueWithErrorRepresentationConfig as Config,
@@ -15,16 +49,173 @@ from .repr_config import (
     repr_value_with_error,
 )
 
+Seed = int | np.random.SeedSequence | np.random.Generator | None
+"""Seed of the draws of the parametric operands, or the generator to draw them from."""
+
+
+# Storage dtype of the new samples that do not set their own. None keeps the dtype of the input.
+_sample_dtype: np.dtype | None = None
+
+
+def _checked_dtype(dtype: DTypeLike) -> np.dtype:
+    ans = np.dtype(dtype)
+    if not np.issubdtype(ans, np.floating):
+        raise ValueError(f"Samples must be stored as floating-point numbers, got {ans}")
+    return ans
+
+
+def set_sample_dtype(dtype: DTypeLike | None = None):
+    """
+    Sets the storage dtype of the samples that do not set their own, e.g. `np.float32` to halve the memory of
+    big samples. The moments and the quantiles are still computed in float64. Memory-mapped samples are kept
+    as they are. None (the default) keeps the dtype of the input.
+    """
+    global _sample_dtype
+    _sample_dtype = None if dtype is None else _checked_dtype(dtype)
+
+
+def _floating(sample: np.ndarray) -> np.ndarray:
+    """The sample itself if it is floating-point (float32 stays float32), else converted to float64."""
+    if np.issubdtype(sample.dtype, np.floating):
+        return sample
+    return sample.astype(np.float64)
+
+
+class ImplSampleValueWithError(
+    IValueWithError_Sample, IValueWithError_LinearTransforms, BaseModel
+):
+    """
+    Class that remembers all the individual values that makes the mean and SE.
+
+    The sample is frozen (read-only) at construction and its count, mean and M2 are computed
+    once, in a single pass, so the statistics do not rescan the sample on every access. A writable array
+    of the caller is copied first, so that changing it later cannot make the cached moments stale.
+
+    The sample can also be a `np.memmap`, e.g. of MCMC draws bigger than RAM (or, with the validation context
+    `pydantic_numpy.ALLOW_FILE_REFERENCES`, the path of a `.npy` file, which gets memory-mapped). All the statistics, including the percentile CIs, are computed in chunks of
+    bounded size, and the serialized form refers to the file instead of inlining the data
+    (see `pydantic_numpy.NDARRAY_MEMMAP`). Memory maps are not copied, so their file must not be changed.
+
+    Arithmetic is done on the draws, elementwise, so derived quantities keep the shape of the distribution.
+    Two samples are combined draw by draw (the draws with the same index are taken as one joint draw, as in
+    MCMC output), constants are broadcast, and the other estimates are represented by as many independent
+    draws from their distribution, drawn from the `seed` of `add`, `sub` and `mul` (the operators draw from
+    fresh entropy). Shifting and scaling float64 samples by constants carries the cached moments over instead
+    of rescanning the result, and adding zero or multiplying by one returns the sample itself.
 
-class ImplSampleValueWithError(IValueWithError_Sample, BaseModel):
-    """Class that remembers all the individual values that makes the mean and SE."""
+    The sample is stored in its own dtype, or in the `dtype` set on the object or by `set_sample_dtype`, e.g.
+    float32 or float16 to save memory. The moments and quantiles are still computed in float64, and a
+    dtype other than float64 is serialized along with the sample, so that the list encoding restores it.
 
+    Each percentile CI selects its order statistics from the sample anew. For samples queried many times
+    (e.g. a report at a dozen levels), opt in with `index_order_statistics()`: a sorted copy of the sample
+    is then built on the first quantile request, and all the later quantiles and CIs are lookups in it.
+    """
+
+    kind_: Literal["sample"] = Field(default="sample", alias="kind")
     sample_: NDArraySerializer = Field(alias="sample")
-    model_config = ConfigDict(arbitrary_types_allowed=True, serialize_by_alias=True)
+    dtype_: str | None = Field(default=None, alias="dtype")
+    model_config = ConfigDict(
+        arbitrary_types_allowed=True, serialize_by_alias=True, defer_build=True
+    )
+    _moments: Moments | None = PrivateAttr(default=None)
+    _index_order_statistics: bool = PrivateAttr(default=False)
+    _sorted: np.ndarray | None = PrivateAttr(default=None)
 
     # def __init__(self, sample: np.ndarray, **kwargs):
     #     super().__init__(sample_=sample, **kwargs)
 
+    @field_validator("sample_", mode="before")
+    @classmethod
+    def copy_writable_sample(cls, sample):
+        if (
+            isinstance(sample, np.ndarray)
+            and sample.flags.writeable
+            and not isinstance(sample, np.memmap)
+        ):
+            return sample.copy()
+        return sample
+
+    @field_validator("dtype_", mode="before")
+    @classmethod
+    def check_dtype(cls, dtype):
+        return None if dtype is None else _checked_dtype(dtype).name
+
+    @model_validator(mode="after")
+    def freeze_sample(self):
+        self._freeze()
+        return self
+
+    @model_serializer(mode="wrap")
+    def _serialize(self, handler):
+        ans = handler(self)
+        if self.dtype_ is None:
+            ans.pop("dtype", None)
+            ans.pop("dtype_", None)
+        return ans
+
+    def _storage_dtype(self) -> np.dtype | None:
+        if self.dtype_ is not None:
+            return np.dtype(self.dtype_)
+        if _sample_dtype is not None and not isinstance(self.sample_, np.memmap):
+            return _sample_dtype
+        return None
+
+    def _freeze(self):
+        dtype = self._storage_dtype()
+        if dtype is not None and self.sample_.dtype != dtype:
+            self.sample_ = self.sample_.astype(dtype)
+            self._moments = None
+        if (
+            self.dtype_ is None
+            and self.sample_.dtype.kind == "f"
+            and self.sample_.dtype != np.float64
+        ):
+            self.dtype_ = self.sample_.dtype.name
+        if self.sample_.flags.writeable:
+            # A read-only view, so the cached moments cannot go stale through our reference.
+            sample = self.sample_.view()
+            sample.flags.writeable = False
+            self.sample_ = sample
+        if self._moments is None:
+            self._moments = sample_moments(self.sample_)
+
+    @classmethod
+    def _from_trusted(
+        cls,
+        sample: np.ndarray,
+        moments: Moments | None = None,
+        dtype: str | None = None,
+    ) -> ImplSampleValueWithError:
+        """
+        Wraps the sample without validation, optionally with its already known moments.
+        :param dtype: Storage dtype of the sample, which it is converted to if needed.
+        """
+        ans = cls.model_construct(sample_=sample, dtype_=dtype)
+        ans._moments = moments
+        ans._freeze()
+        return ans
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        private = state.get("__pydantic_private__")
+        if private and private.get("_sorted") is not None:
+            # The index is rebuilt on demand rather than pickled along with the sample
+            state["__pydantic_private__"] = {**private, "_sorted": None}
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self._freeze()
+
+    @property
+    def moments(self) -> Moments:
+        """Cached count, mean and M2 (sum of squared deviations from the mean) of the sample."""
+        if self._moments is None:
+            self._freeze()
+        assert self._moments is not None
+        return self._moments
+
     @property
     @overrides
     def sample(self) -> np.ndarray:
@@ -33,7 +224,7 @@ class ImplSampleValueWithError(IValueWithError_Sample, BaseModel):
     @property
     @overrides
     def N(self) -> int | float:
-        return len(self.sample)
+        return self.moments[0]
 
     @overrides
     def get_CI_from_SD(self, level: float) -> I_CI:
@@ -42,12 +233,15 @@ class ImplSampleValueWithError(IValueWithError_Sample, BaseModel):
     @property
     @overrides
     def value(self) -> float:
-        return float(np.mean(self.sample))
+        return self.moments[1]
 
     @property
     @overrides
     def SD(self) -> float:
-        return float(np.std(self.sample))
+        count, _, M2 = self.moments
+        if count == 0:
+            return float("nan")
+        return float(np.sqrt(M2 / count))
 
     @property
     @overrides
@@ -78,29 +272,243 @@ class ImplSampleValueWithError(IValueWithError_Sample, BaseModel):
             self.value, self.SE, absolute_precision_digit, config
         )
 
+    def index_order_statistics(self) -> ImplSampleValueWithError:
+        """
+        Opts in to the caching of a sorted copy of the sample, built on the first quantile request, so that
+        the later quantiles and CIs are O(1) lookups. It takes as much memory as the sample (in RAM, even for
+        memory-mapped samples) and is not serialized.
+        :return: self
+        """
+        self._index_order_statistics = True
+        return self
+
+    @property
+    def is_order_statistics_indexed(self) -> bool:
+        """Whether the sorted copy of the sample has been built."""
+        return self._sorted is not None
+
+    def _sorted_sample(self) -> np.ndarray | None:
+        if self._sorted is None and self._index_order_statistics:
+            ans = np.sort(self.sample_)
+            ans.flags.writeable = False
+            self._sorted = ans
+        return self._sorted
+
+    def quantile(self, q: float | np.ndarray) -> np.ndarray:
+        """Quantiles of the sample, as `np.quantile` with the default, linear method."""
+        sorted_sample = self._sorted_sample()
+        if sorted_sample is None:
+            return sample_quantiles(self.sample_, q)
+        return sorted_quantiles(sorted_sample, q)
+
+    def _percentiles(self, percentiles: list[float] | np.ndarray) -> np.ndarray:
+        # Divided as by `sample_percentiles`, so that the bounds do not depend on the index
+        return self.quantile(np.true_divide(percentiles, 100))
+
+    @property
+    def median(self) -> float:
+        return float(self.quantile(0.5))
+
     @property
     @overrides
     def CI95(self) -> CI_95:
-        return CI_95.CreateFromVector(self.sample)
+        lower, upper = self._percentiles([2.5, 97.5]).tolist()
+        return CI_95._from_trusted(lower, upper)
 
     @overrides
     def get_CI(self, level: float) -> I_CI:
-        return CI_any.CreateFromVector(self.sample_, level=level)
+        lower, upper = self._percentiles(
+            [(1 - level) * 50, 100 - (1 - level) * 50]
+        ).tolist()
+        if is_level_95(level):
+            return CI_95._from_trusted(lower, upper)
+        return CI_any._from_trusted(lower, upper, level)
+
+    @overrides
+    def get_CIs(
+        self, levels: Sequence[float] | np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """The percentiles of all the levels are selected together, in a single pass over the sample."""
+        levels = checked_levels(levels)
+        bounds = self._percentiles(
+            np.concatenate([(1 - levels) * 50, 100 - (1 - levels) * 50])
+        )
+        return bounds[: len(levels)], bounds[len(levels) :]
+
+    def compact(
+        self, grid_size: int = DEFAULT_GRID_SIZE
+    ) -> ImplCompactSampleValueWithError:
+        """Fixed-size summary of the sample, with the same moments. See `ImplCompactSampleValueWithError`."""
+        sorted_sample = self._sorted_sample()
+        if sorted_sample is not None and len(sorted_sample):
+            probabilities = quantile_grid(grid_size)
+            return ImplCompactSampleValueWithError._from_trusted(
+                self.moments,
+                probabilities,
+                sorted_quantiles(sorted_sample, probabilities),
+            )
+        return ImplCompactSampleValueWithError.from_sample(
+            self.sample_, grid_size=grid_size, moments=self.moments
+        )
+
+    def bootstrap(
+        self,
+        statistic: Statistic | None = None,
+        n_resamples: int = DEFAULT_RESAMPLES,
+        seed: int | np.random.SeedSequence | None = None,
+        max_workers: int | None = None,
+        chunk_size: int = BOOTSTRAP_CHUNK_SIZE,
+        task_size: int = TASK_SIZE,
+    ) -> BootstrapResult:
+        """Bootstrap SE and CIs of the mean, or of another statistic, of the sample. See `bootstrap.bootstrap`."""
+        return bootstrap(
+            self.sample_,
+            statistic,
+            n_resamples=n_resamples,
+            seed=seed,
+            max_workers=max_workers,
+            chunk_size=chunk_size,
+            task_size=task_size,
+            estimate=self.value if statistic is None or statistic is np.mean else None,
+        )
 
     @overrides
     def student_estimate(self) -> IValueWithError_Estimate:
-        try:
-            return ImplStudentValueWithError(value=self.value, SE=self.SE, N=self.N)
-        except Exception as e:
-            raise ValueError(f"Failed to create student estimate: {e}")
+        SE = self.SE
+        if not SE >= 0:
+            raise ValueError(f"Failed to create student estimate: SE is {SE}")
+        return ImplStudentValueWithError._from_trusted(self.value, SE, self.N)
 
     @property
     def SDEstimate(self) -> ImplNormalValueWithError:
-        return ImplNormalValueWithError(value=self.SD, SE=self.SD / np.sqrt(self.N - 1))
+        SD = self.SD
+        return ImplNormalValueWithError._from_trusted(SD, SD / np.sqrt(self.N - 1))
 
     @property
     def SEEstimate(self) -> ImplNormalValueWithError:
-        return ImplNormalValueWithError(value=self.SE, SE=self.SE / np.sqrt(self.N - 1))
+        SE = self.SE
+        return ImplNormalValueWithError._from_trusted(SE, SE / np.sqrt(self.N - 1))
+
+    def _carries_moments(self, operand: float) -> bool:
+        """
+        Whether the moments can be carried over the affine transform by the operand, rather than recomputed.
+        They are computed in float64, so they would not match a result that is rounded to a narrower dtype.
+        """
+        return bool(np.isfinite(operand)) and (
+            self.dtype_ is None or np.dtype(self.dtype_) == np.float64
+        )
+
+    def _operand(
+        self, other: IValueWithError_Minimal | Number, seed: Seed
+    ) -> tuple[float | np.ndarray, bool]:
+        """
+        The other operand of the arithmetic, as a constant or as draws matching the sample. Parametric
+        estimates are drawn independently of the sample.
+        :return: The operand, and whether it is an array allocated just for this operation, which the result
+            may then overwrite. The sample of another estimate is returned as stored, and must not be.
+        """
+        if isinstance(other, Number):
+            return float(other), False  # type: ignore[arg-type]
+        if isinstance(other, ImplValueWithoutError):
+            return other.value_, False
+        if isinstance(other, ImplSampleValueWithError):
+            if len(other.sample_) != len(self.sample_):
+                raise ValueError(
+                    f"Cannot combine samples of different sizes: {len(self.sample_)} and {len(other.sample_)}"
+                )
+            return _floating(other.sample_), False
+        n = len(self.sample_)
+        if isinstance(other, ImplStudentValueWithError):
+            if not other.N > 1:
+                raise ValueError(f"Cannot draw from Student estimate with N={other.N}")
+            draws = np.random.default_rng(seed).standard_t(other.N - 1, n)
+            draws *= other.SE_
+            draws += other.value_
+            return draws, True
+        if isinstance(other, ImplNormalValueWithError):
+            return np.random.default_rng(seed).normal(other.value_, other.SE_, n), True
+        raise ValueError(
+            f"Unsupported arithmetics between {self.short_description} and {type(other)}"
+        )
+
+    @overrides
+    def __neg__(self) -> ImplSampleValueWithError:
+        count, mean, M2 = self.moments
+        return ImplSampleValueWithError._from_trusted(
+            np.negative(_floating(self.sample_)), (count, -mean, M2), dtype=self.dtype_
+        )
+
+    def add(
+        self, other: IValueWithError_Minimal | Number, seed: Seed = None
+    ) -> ImplSampleValueWithError:
+        """
+        `self + other`, with the draws of a parametric operand made from the seed (or generator), so that
+        the result is reproducible.
+        """
+        operand, fresh = self._operand(other, seed)
+        sample = _floating(self.sample_)
+        if isinstance(operand, float):
+            if operand == 0:
+                return self
+            count, mean, M2 = self.moments
+            moments = (
+                (count, mean + operand, M2) if self._carries_moments(operand) else None
+            )
+            return ImplSampleValueWithError._from_trusted(
+                sample + operand, moments, dtype=self.dtype_
+            )
+        if fresh and operand.dtype == np.result_type(sample, operand):
+            # Draws made just for this operation are overwritten, rather than allocating the result
+            return ImplSampleValueWithError._from_trusted(
+                np.add(operand, sample, out=operand), dtype=self.dtype_
+            )
+        return ImplSampleValueWithError._from_trusted(
+            sample + operand, dtype=self.dtype_
+        )
+
+    def sub(
+        self, other: IValueWithError_Minimal | Number, seed: Seed = None
+    ) -> ImplSampleValueWithError:
+        """`self - other`. See `add`."""
+        return self.add(-other, seed)  # type: ignore[operator]
+
+    def mul(
+        self, other: IValueWithError_Minimal | Number, seed: Seed = None
+    ) -> ImplSampleValueWithError:
+        """`self * other`. See `add`."""
+        operand, fresh = self._operand(other, seed)
+        sample = _floating(self.sample_)
+        if isinstance(operand, float):
+            if operand == 1:
+                return self
+            count, mean, M2 = self.moments
+            moments = (
+                (count, mean * operand, M2 * operand**2)
+                if self._carries_moments(operand)
+                else None
+            )
+            return ImplSampleValueWithError._from_trusted(
+                sample * operand, moments, dtype=self.dtype_
+            )
+        if fresh and operand.dtype == np.result_type(sample, operand):
+            return ImplSampleValueWithError._from_trusted(
+                np.multiply(operand, sample, out=operand), dtype=self.dtype_
+            )
+        return ImplSampleValueWithError._from_trusted(
+            sample * operand, dtype=self.dtype_
+        )
+
+    @overrides
+    def __add__(  # pyright: ignore[reportIncompatibleMethodOverride]
+        self, other: IValueWithError_Minimal | Number
+    ) -> ImplSampleValueWithError:
+        return self.add(other)
+
+    @overrides
+    def __mul__(  # pyright: ignore[reportIncompatibleMethodOverride]
+        self, other: IValueWithError_Minimal | Number
+    ) -> ImplSampleValueWithError:
+        return self.mul(other)
 
     def __str__(self) -> str:
         config = Config()
@@ -1,11 +1,13 @@
 from numbers import Number
+from typing import Sequence
 
 import numpy as np
 from overrides import overrides
-from pydantic import BaseModel, Field, ConfigDict
-from scipy.stats import norm as norm_dist
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import core_schema
 
-from .CI import CI_95, CI_any
+from .CI import CI_95, CI_any, checked_levels, is_level_95
+from .critical_values import critical_value, critical_values
 from .ImplNormalValueWithError import ImplNormalValueWithError
 from .ImplValueWithoutError import ImplValueWithoutError
 from .iface import (
@@ -19,18 +21,53 @@ from .repr_config import (
     suggested_precision_digit_pos_for_SE,
     repr_value_with_error,
 )
+from .slots_model import (
+    SlotsModel,
+    checked_count,
+    checked_float,
+    checked_non_negative,
+)
 
 
 class ImplStudentValueWithError(
-    BaseModel, IValueWithError_Estimate, IValueWithError_LinearTransforms
+    SlotsModel, IValueWithError_Estimate, IValueWithError_LinearTransforms
 ):
-    value_: float = Field(alias="value")
-    SE_: float = Field(ge=0, alias="SE")
-    N_: int | float = Field(ge=0, alias="N")
-    model_config = ConfigDict(serialize_by_alias=True)
-
-    # def __init__(self, value: float, SE: float, N: float, **kwargs):
-    #     super().__init__(value=value, SE=SE, N=N, **kwargs)
+    __slots__ = ("value_", "SE_", "N_")
+    _fields = {"value_": "value", "SE_": "SE", "N_": "N"}
+    kind_ = "student"
+    value_: float
+    SE_: float
+    N_: int | float
+
+    def __init__(self, value: float, SE: float, N: int | float):
+        object.__setattr__(self, "value_", checked_float("value", value))
+        object.__setattr__(self, "SE_", checked_non_negative("SE", SE))
+        object.__setattr__(self, "N_", checked_count("N", N))
+
+    @classmethod
+    def _from_trusted(
+        cls, value: float, SE: float, N: int | float
+    ) -> "ImplStudentValueWithError":
+        """Builds the object from already valid values, without validation."""
+        ans = object.__new__(cls)
+        object.__setattr__(ans, "value_", float(value))
+        object.__setattr__(ans, "SE_", float(SE))
+        object.__setattr__(ans, "N_", N)
+        return ans
+
+    @classmethod
+    def _fields_schema(
+        cls, handler: GetCoreSchemaHandler
+    ) -> dict[str, core_schema.TypedDictField]:
+        return {
+            "value": core_schema.typed_dict_field(core_schema.float_schema()),
+            "SE": core_schema.typed_dict_field(core_schema.float_schema(ge=0)),
+            "N": core_schema.typed_dict_field(
+                core_schema.union_schema(
+                    [core_schema.int_schema(ge=0), core_schema.float_schema(ge=0)]
+                )
+            ),
+        }
 
     @property
     @overrides
@@ -59,23 +96,26 @@ class ImplStudentValueWithError(
         )
 
     def _get_CI(self, level: float, SE: float) -> I_CI:
-        if np.isclose(level, 0.95):
-            return CI_95(
-                self.value_ - 1.959963984540054 * SE,
-                self.value_ + 1.959963984540054 * SE,
-            )
+        if is_level_95(level):
+            t = critical_value(0.95, df=self.N_ - 1)
+            return CI_95._from_trusted(self.value_ - t * SE, self.value_ + t * SE)
         else:
-            t = float(norm_dist.ppf(1 - (1 - level) / 2))
-            return CI_any(
-                lower=self.value_ - t * SE,
-                upper=self.value_ + t * SE,
-                level=level,
+            t = critical_value(level, df=self.N_ - 1)
+            return CI_any._from_trusted(
+                self.value_ - t * SE, self.value_ + t * SE, level
             )
 
     @overrides
     def get_CI(self, level: float) -> I_CI:
         return self._get_CI(level=level, SE=self.SE_)
 
+    @overrides
+    def get_CIs(
+        self, levels: Sequence[float] | np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        half_width = critical_values(checked_levels(levels), self.N_ - 1) * self.SE_
+        return self.value_ - half_width, self.value_ + half_width
+
     @overrides
     def get_CI_from_SD(self, level: float) -> I_CI:
         return self._get_CI(level=level, SE=self.SD)
@@ -83,10 +123,7 @@ class ImplStudentValueWithError(
     @property
     @overrides
     def CI95(self) -> I_CI:
-        return CI_95(
-            lower=self.value_ - 1.959963984540054 * self.SE_,
-            upper=self.value_ + 1.959963984540054 * self.SE_,
-        )
+        return self._get_CI(level=0.95, SE=self.SE_)
 
     @overrides
     def pretty_repr(
@@ -107,21 +144,21 @@ class ImplStudentValueWithError(
 
     @overrides
     def __neg__(self) -> IValueWithError_LinearTransforms:
-        return ImplStudentValueWithError(value=-self.value_, SE=self.SE_, N=self.N_)
+        return ImplStudentValueWithError._from_trusted(-self.value_, self.SE_, self.N_)
 
     @overrides
     def __add__(  # pyright: ignore[reportIncompatibleMethodOverride]
         self, other: IValueWithError_Minimal | Number
     ) -> IValueWithError_LinearTransforms:
         if isinstance(other, Number):
-            return ImplStudentValueWithError(
-                value=self.value_ + float(other),  # type: ignore[reportArgumentType]
-                SE=self.SE_,
-                N=self.N_,  # type: ignore[reportArgumentType]
+            return ImplStudentValueWithError._from_trusted(
+                self.value_ + float(other),  # type: ignore[reportArgumentType]
+                self.SE_,
+                self.N_,
             )
         elif isinstance(other, ImplValueWithoutError):
-            return ImplStudentValueWithError(
-                value=self.value_ + other.value_, SE=self.SE_, N=self.N_
+            return ImplStudentValueWithError._from_trusted(
+                self.value_ + other.value_, self.SE_, self.N_
             )
         else:
             raise ValueError(f"Unsupported type for addition: {type(other)}")
@@ -131,25 +168,28 @@ class ImplStudentValueWithError(
         self, other: IValueWithError_Minimal | Number
     ) -> IValueWithError_LinearTransforms:
         if isinstance(other, Number):
-            return ImplStudentValueWithError(
-                value=self.value_ * float(other),  # type: ignore[reportArgumentType]
-                SE=self.SE_,
-                N=self.N_,  # type: ignore[reportArgumentType]
+            return ImplStudentValueWithError._from_trusted(
+                self.value_ * float(other),  # type: ignore[reportArgumentType]
+                self.SE_,
+                self.N_,
             )
         elif isinstance(other, ImplValueWithoutError):
-            return ImplStudentValueWithError(
-                value=self.value_ * other.value_, SE=self.SE_, N=self.N_
+            return ImplStudentValueWithError._from_trusted(
+                self.value_ * other.value_, self.SE_, self.N_
             )
         else:
             raise ValueError(f"Unsupported type for multiplication: {type(other)}")
 
     @property
     def SDEstimate(self) -> ImplNormalValueWithError:
-        return ImplNormalValueWithError(value=self.SD, SE=self.SD / np.sqrt(self.N - 1))
+        SD = self.SD
+        return ImplNormalValueWithError._from_trusted(SD, SD / np.sqrt(self.N_ - 1))
 
     @property
     def SEEstimate(self) -> ImplNormalValueWithError:
-        return ImplNormalValueWithError(value=self.SE, SE=self.SE / np.sqrt(self.N - 1))
+        return ImplNormalValueWithError._from_trusted(
+            self.SE_, self.SE_ / np.sqrt(self.N_ - 1)
+        )
 
     def __str__(self) -> str:
         config = Config()
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from overrides import overrides
-from pydantic import BaseModel, Field, ConfigDict
 from numbers import Number
 
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import core_schema
+
 from .iface import (
     IValueWithError_Minimal,
     IValueWithError_LinearTransforms,
@@ -14,18 +16,34 @@ from .repr_config import (
     round_to_string,
     suggested_precision_digit_pos,
 )
+from .slots_model import SlotsModel, checked_float
 
 
 class ImplValueWithoutError(
-    BaseModel, IValueWithError_Minimal, IValueWithError_LinearTransforms
+    SlotsModel, IValueWithError_Minimal, IValueWithError_LinearTransforms
 ):
     """Value without error, that still implements the IValueWithError interface."""
 
-    value_: float = Field(alias="value")
-    model_config = ConfigDict(serialize_by_alias=True)
+    __slots__ = ("value_",)
+    _fields = {"value_": "value"}
+    kind_ = "no_error"
+    value_: float
+
+    def __init__(self, value: float):
+        object.__setattr__(self, "value_", checked_float("value", value))
+
+    @classmethod
+    def _from_trusted(cls, value: float) -> ImplValueWithoutError:
+        """Builds the object from an already valid value, without validation."""
+        ans = object.__new__(cls)
+        object.__setattr__(ans, "value_", float(value))
+        return ans
 
-    # def __init__(self, value: float, **kwargs):
-    #     super().__init__(value=value, **kwargs)
+    @classmethod
+    def _fields_schema(
+        cls, handler: GetCoreSchemaHandler
+    ) -> dict[str, core_schema.TypedDictField]:
+        return {"value": core_schema.typed_dict_field(core_schema.float_schema())}
 
     @property
     @overrides
@@ -56,16 +74,16 @@ class ImplValueWithoutError(
 
     @overrides
     def __neg__(self) -> ImplValueWithoutError:
-        return ImplValueWithoutError(value=-self.value_)
+        return ImplValueWithoutError._from_trusted(-self.value_)
 
     @overrides
     def __add__(  # pyright: ignore[reportIncompatibleMethodOverride]
         self, other: IValueWithError_Minimal | Number
     ) -> IValueWithError_LinearTransforms:
         if isinstance(other, Number):
-            return ImplValueWithoutError(value=self.value_ + float(other))  # type: ignore[reportArgumentType]
+            return ImplValueWithoutError._from_trusted(self.value_ + float(other))  # type: ignore[reportArgumentType]
         elif isinstance(other, ImplValueWithoutError):
-            return ImplValueWithoutError(value=self.value_ + other.value_)
+            return ImplValueWithoutError._from_trusted(self.value_ + other.value_)
         elif isinstance(other, IValueWithError_SE):
             if not isinstance(other, IValueWithError_LinearTransforms):
                 raise ValueError(
@@ -80,9 +98,9 @@ class ImplValueWithoutError(
         self, other: IValueWithError_Minimal | Number
     ) -> IValueWithError_LinearTransforms:
         if isinstance(other, Number):
-            return ImplValueWithoutError(value=self.value_ * float(other))  # type: ignore[reportArgumentType]
+            return ImplValueWithoutError._from_trusted(self.value_ * float(other))  # type: ignore[reportArgumentType]
         elif isinstance(other, ImplValueWithoutError):
-            return ImplValueWithoutError(value=self.value_ * other.value_)
+            return ImplValueWithoutError._from_trusted(self.value_ * other.value_)
         elif isinstance(other, IValueWithError_SE):
             if not isinstance(other, IValueWithError_LinearTransforms):
                 raise ValueError(
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+
+from .CI import CI_95, CI_any, is_level_95
+from .iface import I_CI
+from .moments import iter_chunks
+
+
+class QuantileSketch:
+    """
+    Mergeable, bounded-memory quantile sketch (a merging t-digest).
+
+    The sketch keeps a sorted list of weighted centroids. Incoming values are buffered and periodically
+    merged with the centroids in one vectorized pass: centroids whose cumulative ranks fall in the same unit
+    interval of the logit scale function are fused. The scale function is steep near 0 and 1, so the tails
+    (which matter for the confidence intervals) are kept with much better relative accuracy than the median.
+    The size of the sketch is about `compression / 2` centroids (a few KB with the default settings),
+    regardless of the number of values consumed.
+    """
+
+    def __init__(self, compression: float = 500, buffer_size: int = 1 << 14):
+        """
+        :param compression: The accuracy parameter. Larger value gives more accurate quantiles and a bigger sketch.
+        :param buffer_size: Number of values collected before they are merged into the centroids.
+        """
+        if compression <= 0:
+            raise ValueError("compression must be positive")
+        self.compression = float(compression)
+        self.buffer_size = buffer_size
+        self._means = np.empty(0)
+        self._weights = np.empty(0)
+        self._buffer: list[np.ndarray] = []
+        self._buffered = 0
+        self._min = np.inf
+        self._max = -np.inf
+
+    @property
+    def N(self) -> int:
+        return int(np.sum(self._weights)) + self._buffered
+
+    @property
+    def nbytes(self) -> int:
+        """Memory taken by the centroids, after all the buffered values are merged."""
+        self._flush()
+        return self._means.nbytes + self._weights.nbytes
+
+    def update(
+        self,
+        values: float | np.ndarray | Iterable[float],
+        max_samples: int | None = None,
+    ) -> QuantileSketch:
+        """
+        Adds a single value, a numpy array or any iterable of values (consumed in numpy chunks).
+        :return: self, to allow chaining.
+        """
+        if isinstance(values, np.ndarray):
+            chunk = np.array(values, dtype=np.float64).ravel()
+            if max_samples is not None:
+                chunk = chunk[:max_samples]
+            if len(chunk) > 0:
+                self._min = min(self._min, float(np.min(chunk)))
+                self._max = max(self._max, float(np.max(chunk)))
+                self._buffer.append(chunk)
+                self._buffered += len(chunk)
+                if self._buffered >= self.buffer_size:
+                    self._flush()
+        elif isinstance(values, Iterable):
+            for chunk in iter_chunks(values, max_samples):
+                self.update(chunk)
+        else:
+            self.update(np.asarray([values], dtype=np.float64))
+        return self
+
+    def merge(self, other: QuantileSketch) -> QuantileSketch:
+        """
+        Merges the other sketch (built on a disjoint part of the data) into this one.
+        :return: self, to allow chaining.
+        """
+        other._flush()
+        if len(other._means) > 0:
+            self._flush()
+            self._min = min(self._min, other._min)
+            self._max = max(self._max, other._max)
+            self._compress(
+                np.concatenate([self._means, other._means]),
+                np.concatenate([self._weights, other._weights]),
+            )
+        return self
+
+    def _flush(self):
+        if self._buffered == 0:
+            return
+        values = np.concatenate(self._buffer)
+        self._buffer = []
+        self._buffered = 0
+        self._compress(
+            np.concatenate([self._means, values]),
+            np.concatenate([self._weights, np.ones(len(values))]),
+        )
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray):
+        order = np.argsort(means, kind="stable")
+        means = means[order]
+        weights = weights[order]
+        cumulative = np.cumsum(weights)
+        total = cumulative[-1]
+        q_mid = (cumulative - weights / 2) / total
+        # Logit scale function: maps the quantile to the index of the centroid it belongs to.
+        normalizer = 4 * np.log(max(total / self.compression, 1.0)) + 24
+        cluster = np.floor(
+            self.compression / normalizer * np.log(q_mid / (1 - q_mid))
+        ).astype(np.int64)
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(cluster)) + 1])
+        new_weights = np.add.reduceat(weights, starts)
+        self._means = np.add.reduceat(means * weights, starts) / new_weights
+        self._weights = new_weights
+
+    def quantile(self, q: float | np.ndarray) -> float | np.ndarray:
+        """
+        Approximate quantiles of all the values consumed so far. Same convention as `np.quantile`.
+        """
+        self._flush()
+        q = np.asarray(q, dtype=np.float64)
+        if len(self._means) == 0:
+            raise ValueError("Cannot compute quantiles of an empty sketch")
+        if np.any((q < 0) | (q > 1)):
+            raise ValueError("Quantiles must be in the range [0, 1]")
+        if np.all(self._weights == 1):
+            # Nothing was merged yet, so the centroids are the exact values.
+            ans = np.quantile(self._means, q)
+        else:
+            total = np.sum(self._weights)
+            centers = np.cumsum(self._weights) - self._weights / 2
+            ans = np.interp(
+                q * total,
+                np.concatenate([[0.0], centers, [total]]),
+                np.concatenate([[self._min], self._means, [self._max]]),
+            )
+        if ans.ndim == 0:
+            return float(ans)
+        return ans
+
+    def get_CI(self, level: float) -> I_CI:
+        if not 0 < level < 1:
+            raise ValueError(f"CI level must be between 0 and 1, got {level}")
+        lower, upper = self.quantile(np.asarray([(1 - level) / 2, 1 - (1 - level) / 2]))  # type: ignore[misc]
+        if is_level_95(level):
+            return CI_95._from_trusted(lower, upper)
+        return CI_any._from_trusted(lower, upper, level)
+
+    @property
+    def CI95(self) -> CI_95:
+        ans = self.get_CI(0.95)
+        assert isinstance(ans, CI_95)
+        return ans
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
+
+from .ImplStudentValueWithError import ImplStudentValueWithError
+from .moments import (
+    Moments,
+    combine_moments,
+    iter_chunks,
+    merge_moments,
+    sample_moments,
+)
+
+
+class RunningValueWithError(BaseModel):
+    """
+    Streaming accumulator of the mean and SE that never keeps the values in memory.
+
+    Values can be added one by one or in whole numpy chunks. Chunks are reduced with numpy and merged
+    with the numerically stable update of Chan et al. (Welford's update for single values), so the
+    result does not degrade on data with a large offset. Accumulators built on disjoint parts of the
+    data (e.g. by different workers) can be merged, and a snapshot can be taken at any time.
+    """
+
+    count_: int = Field(default=0, ge=0, alias="N")
+    mean_: float = Field(default=0.0, alias="mean")
+    M2_: float = Field(default=0.0, ge=0, alias="M2")
+    model_config = ConfigDict(serialize_by_alias=True, defer_build=True)
+
+    @property
+    def moments(self) -> Moments:
+        return self.count_, self.mean_, self.M2_
+
+    def _set_moments(self, moments: Moments):
+        self.count_, self.mean_, self.M2_ = moments
+
+    @property
+    def N(self) -> int:
+        return self.count_
+
+    @property
+    def value(self) -> float:
+        if self.count_ == 0:
+            return float("nan")
+        return self.mean_
+
+    @property
+    def SD(self) -> float:
+        if self.count_ == 0:
+            return float("nan")
+        return float(np.sqrt(self.M2_ / self.count_))
+
+    @property
+    def SE(self) -> float:
+        if self.count_ == 0:
+            return float("nan")
+        return float(np.sqrt(self.M2_) / self.count_)
+
+    def add(
+        self, values: float | np.ndarray | Iterable[float]
+    ) -> RunningValueWithError:
+        """
+        Adds a single value, a numpy array or any iterable of values (consumed in numpy chunks).
+        :return: self, to allow chaining.
+        """
+        if isinstance(values, np.ndarray):
+            if values.size > 0:
+                self._set_moments(merge_moments(self.moments, sample_moments(values)))
+        elif isinstance(values, Iterable):
+            self.add_stream(values)
+        else:
+            # Welford's update
+            x = float(values)
+            self.count_ += 1
+            delta = x - self.mean_
+            self.mean_ += delta / self.count_
+            self.M2_ += delta * (x - self.mean_)
+        return self
+
+    def add_stream(
+        self, values: Iterable[float], max_samples: int | None = None
+    ) -> RunningValueWithError:
+        """
+        Consumes the iterable in chunks, so that the per-value Python overhead is limited to reading it.
+        :param max_samples: Stop after that many values. Otherwise, we iterate until the iterable is exhausted.
+        :return: self, to allow chaining.
+        """
+        for chunk in iter_chunks(values, max_samples):
+            self.add(chunk)
+        return self
+
+    def merge(self, other: RunningValueWithError) -> RunningValueWithError:
+        """
+        Merges the other accumulator (built on a disjoint part of the data) into this one.
+        :return: self, to allow chaining.
+        """
+        self._set_moments(merge_moments(self.moments, other.moments))
+        return self
+
+    @staticmethod
+    def combine(
+        accumulators: Iterable[RunningValueWithError],
+    ) -> RunningValueWithError:
+        """Merges many accumulators at once."""
+        moments = np.asarray([acc.moments for acc in accumulators], dtype=np.float64)
+        ans = RunningValueWithError()
+        if len(moments) > 0:
+            ans._set_moments(
+                combine_moments(moments[:, 0], moments[:, 1], moments[:, 2])
+            )
+        return ans
+
+    def snapshot(self) -> ImplStudentValueWithError:
+        """The estimate of the mean of all the values added so far."""
+        if self.count_ == 0:
+            raise ValueError("Cannot create ValueWithError from empty accumulator")
+        return ImplStudentValueWithError._from_trusted(self.mean_, self.SE, self.count_)
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 from numbers import Number
-from typing import Union, Optional
+from functools import cache
+from typing import Annotated, Any, Sequence, Union, Optional, get_args
 
 import numpy as np
-from pydantic import BaseModel
+from pydantic import Discriminator, GetCoreSchemaHandler, Tag, TypeAdapter
+from pydantic_core import core_schema
 
+from .ImplCompactSampleValueWithError import ImplCompactSampleValueWithError
 from .ImplNormalValueWithError import ImplNormalValueWithError
 from .ImplSampleValueWithError import ImplSampleValueWithError
 from .ImplStudentValueWithError import ImplStudentValueWithError
@@ -18,18 +21,93 @@ from .iface import (
     IValueWithError_LinearTransforms,
 )
 from .repr_config import ValueWithErrorRepresentationConfig
+from .slots_model import SlotsModel
 
 UnionOfAllValueWithErrorImpls = Union[
     ImplSampleValueWithError,
+    ImplCompactSampleValueWithError,
     ImplValueWithoutError,
     ImplNormalValueWithError,
     ImplStudentValueWithError,
 ]
 
 
-class ValueWithError(BaseModel, IValueWithError_LinearTransforms):
+def impl_kind(obj: Any) -> str | None:
+    """
+    Discriminator of the implementations: their "kind" tag. Untagged (legacy) payloads are told apart by
+    their keys, which is what the undiscriminated union used to decide on.
+    """
+    if not isinstance(obj, dict):
+        return getattr(obj, "kind_", None)
+    kind = obj.get("kind")
+    if kind is not None:
+        return kind
+    if "sample" in obj:
+        return "sample"
+    if "quantiles" in obj:
+        return "compact_sample"
+    if "N" in obj:
+        return "student"
+    if "SE" in obj:
+        return "normal"
+    if "value" in obj:
+        return "no_error"
+    return None
+
+
+# The union for validation: dispatched on the tag instead of trying the implementations one by one
+TaggedValueWithErrorImpl = Annotated[
+    Union[
+        Annotated[ImplSampleValueWithError, Tag("sample")],
+        Annotated[ImplCompactSampleValueWithError, Tag("compact_sample")],
+        Annotated[ImplValueWithoutError, Tag("no_error")],
+        Annotated[ImplNormalValueWithError, Tag("normal")],
+        Annotated[ImplStudentValueWithError, Tag("student")],
+    ],
+    Discriminator(impl_kind),
+]
+
+# Implementations backed by a sample (or its summary)
+SampleImpls = (ImplSampleValueWithError, ImplCompactSampleValueWithError)
+
+_COMPACT_ARITHMETICS_ERROR = (
+    "Cannot do arithmetics on a sample summary, which does not keep the draws. "
+    "Use the full sample, or convert it first to student error with .student_estimate()"
+)
+
+
+@cache
+def _impl_adapter() -> TypeAdapter:
+    return TypeAdapter(TaggedValueWithErrorImpl)
+
+
+class ValueWithError(SlotsModel, IValueWithError_LinearTransforms):
+    __slots__ = ("obj",)
+    _fields = {"obj": "obj"}
     obj: UnionOfAllValueWithErrorImpls
 
+    def __init__(self, obj: UnionOfAllValueWithErrorImpls | dict[str, Any]):
+        if not isinstance(obj, get_args(UnionOfAllValueWithErrorImpls)):
+            obj = _impl_adapter().validate_python(obj)
+        object.__setattr__(self, "obj", obj)
+
+    @classmethod
+    def _from_trusted(cls, obj: UnionOfAllValueWithErrorImpls) -> ValueWithError:
+        """Wraps an already valid implementation object, without the smart-union validation."""
+        ans = object.__new__(cls)
+        object.__setattr__(ans, "obj", obj)
+        return ans
+
+    @classmethod
+    def _fields_schema(
+        cls, handler: GetCoreSchemaHandler
+    ) -> dict[str, core_schema.TypedDictField]:
+        return {
+            "obj": core_schema.typed_dict_field(
+                handler.generate_schema(TaggedValueWithErrorImpl)
+            )
+        }
+
     def suggested_precision_digit_pos(
         self, config: ValueWithErrorRepresentationConfig
     ) -> int | None:
@@ -68,6 +146,14 @@ class ValueWithError(BaseModel, IValueWithError_LinearTransforms):
             return self.obj.get_CI(level)
         return None
 
+    def get_CIs(
+        self, levels: Sequence[float] | np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray] | None:
+        """Lower and upper bounds of the CIs at many levels at once. See `IValueWithError_SE.get_CIs`."""
+        if isinstance(self.obj, IValueWithError_SE):
+            return self.obj.get_CIs(levels)
+        return None
+
     @property
     def SD(self) -> float | None:
         if isinstance(self.obj, IValueWithError_Estimate):
@@ -92,10 +178,10 @@ class ValueWithError(BaseModel, IValueWithError_LinearTransforms):
         return None
 
     def student_estimate(self) -> ValueWithError | None:
-        if isinstance(self.obj, IValueWithError_Sample):
+        if isinstance(self.obj, SampleImpls):
             se_obj = self.obj.student_estimate()
             assert isinstance(se_obj, ImplStudentValueWithError)
-            return ValueWithError(obj=se_obj)
+            return ValueWithError._from_trusted(se_obj)
         if isinstance(self.obj, IValueWithError_Estimate):
             return self
         return None
@@ -104,67 +190,58 @@ class ValueWithError(BaseModel, IValueWithError_LinearTransforms):
     def SDEstimate(self) -> Optional[ValueWithError]:
         if isinstance(self.obj, (ImplValueWithoutError, ImplNormalValueWithError)):
             return None
-        assert isinstance(
-            self.obj, (ImplStudentValueWithError, ImplSampleValueWithError)
-        )
+        assert isinstance(self.obj, (ImplStudentValueWithError, *SampleImpls))
         obj = self.obj.SDEstimate
-        return ValueWithError(obj=obj)
+        return ValueWithError._from_trusted(obj)
 
     @property
     def SEEstimate(self) -> Optional[ValueWithError]:
         if isinstance(self.obj, ImplValueWithoutError):
             return None
         if isinstance(self.obj, ImplNormalValueWithError):
-            obj = ImplValueWithoutError(value=self.obj.SE)
+            obj = ImplValueWithoutError._from_trusted(self.obj.SE)
         else:
-            assert isinstance(
-                self.obj, (ImplStudentValueWithError, ImplSampleValueWithError)
-            )
+            assert isinstance(self.obj, (ImplStudentValueWithError, *SampleImpls))
             obj = self.obj.SEEstimate
-        return ValueWithError(obj=obj)
+        return ValueWithError._from_trusted(obj)
 
     def __neg__(self) -> IValueWithError_LinearTransforms:
-        if isinstance(self.obj, ImplSampleValueWithError):
-            raise ValueError(
-                "Cannot to arythmetics on sample error. Convert it first to student error with .student_estimate()"
-            )
-        return ValueWithError(obj=-self.obj)  # type: ignore[return-value]
+        if isinstance(self.obj, ImplCompactSampleValueWithError):
+            raise ValueError(_COMPACT_ARITHMETICS_ERROR)
+        return ValueWithError._from_trusted(-self.obj)  # type: ignore[return-value]
 
     def __add__(
         self, other: IValueWithError_LinearTransforms | Number
     ) -> IValueWithError_LinearTransforms:
         if isinstance(other, ValueWithError):
-            if isinstance(self.obj, ImplSampleValueWithError) or isinstance(
-                other.obj, ImplSampleValueWithError
+            if isinstance(self.obj, ImplCompactSampleValueWithError) or isinstance(
+                other.obj, ImplCompactSampleValueWithError
             ):
-                raise ValueError(
-                    "Cannot to arithmetics on sample error. Convert it first to student error with .student_estimate()"
-                )
-            return ValueWithError(obj=self.obj + other.obj)  # type: ignore[return-value]
+                raise ValueError(_COMPACT_ARITHMETICS_ERROR)
+            if isinstance(other.obj, ImplSampleValueWithError):
+                # The sample broadcasts the other operand over its draws
+                return ValueWithError._from_trusted(other.obj + self.obj)  # type: ignore[return-value]
+            return ValueWithError._from_trusted(self.obj + other.obj)  # type: ignore[return-value]
         else:
-            if isinstance(self.obj, ImplSampleValueWithError):
-                raise ValueError(
-                    "Cannot to arithmetics on sample error. Convert it first to student error with .student_estimate()"
-                )
-            return ValueWithError(obj=self.obj + other)  # type: ignore[return-value]
+            if isinstance(self.obj, ImplCompactSampleValueWithError):
+                raise ValueError(_COMPACT_ARITHMETICS_ERROR)
+            return ValueWithError._from_trusted(self.obj + other)  # type: ignore[return-value]
 
     def __mul__(
         self, other: IValueWithError_LinearTransforms | Number
     ) -> IValueWithError_LinearTransforms:
         if isinstance(other, ValueWithError):
-            if isinstance(self.obj, ImplSampleValueWithError) or isinstance(
-                other.obj, ImplSampleValueWithError
+            if isinstance(self.obj, ImplCompactSampleValueWithError) or isinstance(
+                other.obj, ImplCompactSampleValueWithError
             ):
-                raise ValueError(
-                    "Cannot to arithmetics on sample error. Convert it first to student error with .student_estimate()"
-                )
-            return ValueWithError(obj=self.obj * other.obj)  # type: ignore[return-value]
+                raise ValueError(_COMPACT_ARITHMETICS_ERROR)
+            if isinstance(other.obj, ImplSampleValueWithError):
+                return ValueWithError._from_trusted(other.obj * self.obj)  # type: ignore[return-value]
+            return ValueWithError._from_trusted(self.obj * other.obj)  # type: ignore[return-value]
         else:
-            if isinstance(self.obj, ImplSampleValueWithError):
-                raise ValueError(
-                    "Cannot to arithmetics on sample error. Convert it first to student error with .student_estimate()"
-                )
-            return ValueWithError(obj=self.obj * other)  # type: ignore[return-value]
+            if isinstance(self.obj, ImplCompactSampleValueWithError):
+                raise ValueError(_COMPACT_ARITHMETICS_ERROR)
+            return ValueWithError._from_trusted(self.obj * other)  # type: ignore[return-value]
 
     @property
     def short_description(self) -> str:
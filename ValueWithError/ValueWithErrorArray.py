@@ -0,0 +1,476 @@
+from __future__ import annotations
+
+import os
+from functools import cache
+from numbers import Number
+from typing import Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+from pydantic import TypeAdapter
+from typing_extensions import NotRequired, TypedDict
+
+from .ImplNormalValueWithError import ImplNormalValueWithError
+from .ImplStudentValueWithError import ImplStudentValueWithError
+from .ImplValueWithoutError import ImplValueWithoutError
+from .CI import checked_levels, is_level_95
+from .critical_values import critical_values
+from .iface import IValueWithError_LinearTransforms
+from .repr_config import (
+    ValueWithErrorRepresentationConfig as Config,
+    default_table_repr_config,
+    repr_table,
+)
+from .ValueWithError import ValueWithError
+from .VectorOfValuesWithError import VectorOfValuesWithError
+
+KIND_NO_ERROR = 0
+KIND_NORMAL = 1
+KIND_STUDENT = 2
+
+KIND_NAMES = ("no_error", "normal", "student")
+
+# Structured dtype of the records of estimates, one record per element. Packed, as stored in `.npy` files.
+RECORD_DTYPE = np.dtype(
+    [("value", np.float64), ("SE", np.float64), ("N", np.float64), ("kind", np.int8)]
+)
+
+
+class ColumnarJSON(TypedDict):
+    """
+    Columnar JSON layout of a vector of estimates: one list per column. SE, N and kind are optional, and
+    inferred as in the `ValueWithErrorArray` constructor when missing. NaN (e.g. the SE of a value without
+    error) is written as null and infinities as the strings "Infinity" and "-Infinity", so that the payload
+    is standard JSON.
+    """
+
+    value: list[Optional[float]]
+    SE: NotRequired[list[Optional[float]]]
+    N: NotRequired[list[Optional[float]]]
+    kind: NotRequired[list[int]]
+
+
+@cache
+def _columnar_adapter() -> TypeAdapter:
+    return TypeAdapter(ColumnarJSON)
+
+
+@cache
+def _columnar_serializer() -> TypeAdapter:
+    # A plain dict, as the columns with infinities mix floats and strings
+    return TypeAdapter(dict[str, list])
+
+
+def _json_column(x: np.ndarray) -> list:
+    """The column as a list for standard JSON: null for NaN, and strings for the infinities."""
+    column = x.tolist()
+    non_finite = ~np.isfinite(x)
+    if non_finite.any():
+        for i in np.flatnonzero(non_finite):
+            column[i] = (
+                None if np.isnan(x[i]) else "Infinity" if x[i] > 0 else "-Infinity"
+            )
+    return column
+
+
+ScalarImpl = (
+    ImplValueWithoutError | ImplNormalValueWithError | ImplStudentValueWithError
+)
+
+
+class ValueWithErrorArray(IValueWithError_LinearTransforms):
+    """
+    Columnar counterpart of VectorOfValuesWithError.
+
+    Stores value, SE, N and kind of each element in parallel numpy arrays, so that arithmetic and CIs
+    are computed for the whole array at once. Elements follow exactly the same rules as the scalar
+    ImplValueWithoutError, ImplNormalValueWithError and ImplStudentValueWithError classes.
+    SE is NaN for elements without error, N is NaN for elements that are not Student estimates.
+    """
+
+    # Let numpy defer to our reflected operators, i.e. `ndarray + ValueWithErrorArray`.
+    __array_ufunc__ = None
+
+    def __init__(
+        self,
+        value: np.ndarray | list[float],
+        SE: np.ndarray | list[float] | None = None,
+        N: np.ndarray | list[float] | None = None,
+        kind: np.ndarray | list[int] | None = None,
+    ):
+        value = np.asarray(value, dtype=np.float64)
+        if value.ndim != 1:
+            raise ValueError(f"Expected a 1-dimensional array, got shape {value.shape}")
+        if SE is None:
+            SE = np.full(value.shape, np.nan)
+        if N is None:
+            N = np.full(value.shape, np.nan)
+        SE = np.asarray(SE, dtype=np.float64)
+        N = np.asarray(N, dtype=np.float64)
+        if kind is None:
+            kind = np.where(
+                np.isnan(SE),
+                KIND_NO_ERROR,
+                np.where(np.isnan(N), KIND_NORMAL, KIND_STUDENT),
+            )
+        kind = np.asarray(kind, dtype=np.int8)
+        if not (value.shape == SE.shape == N.shape == kind.shape):
+            raise ValueError(
+                f"Shapes of value {value.shape}, SE {SE.shape}, N {N.shape} and kind {kind.shape} differ"
+            )
+        if np.any((kind < KIND_NO_ERROR) | (kind > KIND_STUDENT)):
+            raise ValueError("Unknown kind code")
+        has_SE = kind != KIND_NO_ERROR
+        if not np.all(SE[has_SE] >= 0):
+            raise ValueError("SE must be non-negative for elements with error")
+        if not np.all(N[kind == KIND_STUDENT] >= 0):
+            raise ValueError("N must be non-negative for Student elements")
+
+        self._value = value
+        self._SE = np.where(has_SE, SE, np.nan)
+        self._N = np.where(kind == KIND_STUDENT, N, np.nan)
+        self._kind = kind
+
+    @classmethod
+    def _from_trusted(
+        cls, value: np.ndarray, SE: np.ndarray, N: np.ndarray, kind: np.ndarray
+    ) -> ValueWithErrorArray:
+        """Builds the array from columns that are already known to be consistent."""
+        ans = cls.__new__(cls)
+        ans._value = value
+        ans._SE = SE
+        ans._N = N
+        ans._kind = kind
+        return ans
+
+    @classmethod
+    def from_items(
+        cls, items: list[ScalarImpl | ValueWithError | float]
+    ) -> ValueWithErrorArray:
+        n = len(items)
+        value = np.empty(n)
+        SE = np.full(n, np.nan)
+        N = np.full(n, np.nan)
+        kind = np.zeros(n, dtype=np.int8)
+        for i, item in enumerate(items):
+            if isinstance(item, ValueWithError):
+                item = item.obj  # type: ignore[assignment]
+            if isinstance(item, Number):
+                value[i] = float(item)  # type: ignore[arg-type]
+            elif isinstance(item, ImplValueWithoutError):
+                value[i] = item.value_
+            elif isinstance(item, ImplNormalValueWithError):
+                value[i] = item.value_
+                SE[i] = item.SE_
+                kind[i] = KIND_NORMAL
+            elif isinstance(item, ImplStudentValueWithError):
+                value[i] = item.value_
+                SE[i] = item.SE_
+                N[i] = item.N_
+                kind[i] = KIND_STUDENT
+            else:
+                raise ValueError(
+                    f"Cannot store {type(item)} in a ValueWithErrorArray. Convert it first with .student_estimate()"
+                )
+        return cls._from_trusted(value, SE, N, kind)
+
+    @classmethod
+    def from_vector(cls, vector: VectorOfValuesWithError) -> ValueWithErrorArray:
+        return cls.from_items(vector.items)  # type: ignore[arg-type]
+
+    @classmethod
+    def from_records(cls, records: np.ndarray) -> ValueWithErrorArray:
+        """
+        Wraps a structured array with the fields value, SE, N and kind (see `RECORD_DTYPE`), e.g. one loaded
+        from `.npy`. If the records are consistent and of the dtypes of `RECORD_DTYPE`, the columns are views
+        of the fields, so no data is copied (and the records must not be modified afterwards).
+        """
+        records = np.asarray(records)
+        if records.dtype.names is None or not set(RECORD_DTYPE.names).issubset(  # type: ignore[arg-type]
+            records.dtype.names
+        ):
+            raise ValueError(
+                f"Expected a structured array with the fields {RECORD_DTYPE.names}, got {records.dtype}"
+            )
+        records = records.ravel()
+        value, SE, N, kind = (records[name] for name in RECORD_DTYPE.names)  # type: ignore[union-attr]
+        if records.dtype.fields is not None and all(
+            records.dtype.fields[name][0] == RECORD_DTYPE.fields[name][0]  # type: ignore[index]
+            for name in RECORD_DTYPE.names  # type: ignore[union-attr]
+        ):
+            has_SE = kind != KIND_NO_ERROR
+            student = kind == KIND_STUDENT
+            if (
+                np.all((kind >= KIND_NO_ERROR) & (kind <= KIND_STUDENT))
+                and np.all(np.where(has_SE, SE >= 0, np.isnan(SE)))
+                and np.all(np.where(student, N >= 0, np.isnan(N)))
+            ):
+                return cls._from_trusted(value, SE, N, kind)
+        # Inconsistent or differently typed records are normalized into new columns
+        return cls(value, SE, N, kind)
+
+    def to_records(self) -> np.ndarray:
+        """The elements as a structured array of `RECORD_DTYPE`, which can be sliced, sorted and masked with numpy."""
+        ans = np.empty(len(self), dtype=RECORD_DTYPE)
+        ans["value"] = self._value
+        ans["SE"] = self._SE
+        ans["N"] = self._N
+        ans["kind"] = self._kind
+        return ans
+
+    def save(self, path: str | os.PathLike):
+        """Writes the records to a `.npy` file."""
+        np.save(path, self.to_records())
+
+    @classmethod
+    def load(
+        cls, path: str | os.PathLike, mmap_mode: str | None = None
+    ) -> ValueWithErrorArray:
+        """
+        Reads the records written by `save`.
+        :param mmap_mode: E.g. "r" to memory-map the file, so that the columns are views of the mapped records.
+        """
+        return cls.from_records(np.load(path, mmap_mode=mmap_mode))  # type: ignore[arg-type]
+
+    def to_columnar_json(self) -> bytes:
+        """The array as JSON columns `{"value": [...], "SE": [...], "N": [...], "kind": [...]}`."""
+        return _columnar_serializer().dump_json(
+            {
+                "value": _json_column(self._value),
+                "SE": _json_column(self._SE),
+                "N": _json_column(self._N),
+                "kind": self._kind.tolist(),
+            }
+        )
+
+    @classmethod
+    def from_columnar_json(cls, data: str | bytes) -> ValueWithErrorArray:
+        """
+        Parses the JSON columns written by `to_columnar_json`. The whole payload is validated at once, and each
+        column is converted to a numpy array in one step, without an object per element.
+        """
+        columns = _columnar_adapter().validate_json(data)
+        value, SE, N = (
+            None
+            if columns.get(name) is None
+            else np.array(columns[name], dtype=np.float64)  # type: ignore[misc]
+            for name in ("value", "SE", "N")
+        )
+        kind = columns.get("kind")
+        return cls(
+            value, SE, N, None if kind is None else np.array(kind, dtype=np.int8)
+        )  # type: ignore[arg-type]
+
+    def to_items(self) -> list[ScalarImpl]:
+        return [self._item(i) for i in range(len(self))]
+
+    def to_vector(self) -> VectorOfValuesWithError:
+        # The items are valid by construction, so they are not validated again one by one
+        return VectorOfValuesWithError.model_construct(items=self.to_items())
+
+    def _item(self, index: int) -> ScalarImpl:
+        kind = self._kind[index]
+        value = float(self._value[index])
+        if kind == KIND_NO_ERROR:
+            return ImplValueWithoutError._from_trusted(value)
+        if kind == KIND_NORMAL:
+            return ImplNormalValueWithError._from_trusted(value, self._SE[index])
+        N = float(self._N[index])
+        return ImplStudentValueWithError._from_trusted(
+            value, self._SE[index], int(N) if N.is_integer() else N
+        )
+
+    @property
+    def value(self) -> np.ndarray:
+        return self._value
+
+    @property
+    def SE(self) -> np.ndarray:
+        return self._SE
+
+    @property
+    def N(self) -> np.ndarray:
+        return self._N
+
+    @property
+    def kind(self) -> np.ndarray:
+        return self._kind
+
+    @property
+    def SD(self) -> np.ndarray:
+        """SD of the Student elements. NaN for the elements that do not carry the sample size."""
+        return self._SE * np.sqrt(self._N)
+
+    def get_CI(self, level: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        :return: Tuple of lower and upper bounds. Both are NaN for the elements without error.
+        """
+        if not 0 < level < 1:
+            raise ValueError(f"CI level must be between 0 and 1, got {level}")
+        if is_level_95(level):
+            level = 0.95
+        # N is NaN for the normal elements, which selects the normal distribution
+        half_width = critical_values(level, self._N - 1) * self._SE
+        return self._value - half_width, self._value + half_width
+
+    @property
+    def CI95(self) -> tuple[np.ndarray, np.ndarray]:
+        return self.get_CI(0.95)
+
+    def get_CIs(
+        self, levels: Sequence[float] | np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        CIs of all the elements at many levels at once: the critical values are computed once per level and
+        distinct N, and gathered for the elements.
+        :return: Tuple of lower and upper bounds, of shape (number of elements, number of levels).
+            Both are NaN for the elements without error.
+        """
+        levels = checked_levels(levels)
+        # NaN N (the normal elements) are all distinct for np.unique, so they are mapped to inf first.
+        dfs, inverse = np.unique(
+            np.where(np.isnan(self._N), np.inf, self._N - 1), return_inverse=True
+        )
+        critical = critical_values(levels[None, :], dfs[:, None])
+        half_width = critical[inverse.reshape(-1)] * self._SE[:, None]
+        return self._value[:, None] - half_width, self._value[:, None] + half_width
+
+    def table_repr(
+        self,
+        config: Config | None = None,
+        absolute_precision_digit: int | None = None,
+    ) -> list[str]:
+        """The same as VectorOfValuesWithError.table_repr, but formatted for the whole array at once."""
+        if config is None:
+            config = default_table_repr_config()
+        errors = self._SE
+        if config.prefer_sd:
+            errors = np.where(self._kind == KIND_STUDENT, self.SD, self._SE)
+        return repr_table(self._value, errors, config, absolute_precision_digit)
+
+    def __len__(self) -> int:
+        return len(self._value)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return self._item(int(index))
+        return ValueWithErrorArray._from_trusted(
+            np.atleast_1d(self._value[index]),
+            np.atleast_1d(self._SE[index]),
+            np.atleast_1d(self._N[index]),
+            np.atleast_1d(self._kind[index]),
+        )
+
+    def __iter__(self) -> Iterator[ScalarImpl]:
+        for i in range(len(self)):
+            yield self._item(i)
+
+    def __repr__(self) -> str:
+        return f"ValueWithErrorArray(value={self._value!r}, SE={self._SE!r}, N={self._N!r}, kind={self._kind!r})"
+
+    def _coerce(self, other) -> ValueWithErrorArray:
+        if isinstance(other, ValueWithErrorArray):
+            return other
+        if isinstance(other, Number):
+            # noinspection PyTypeChecker
+            value = np.full(self._value.shape, float(other))  # type: ignore[arg-type]
+            return ValueWithErrorArray._from_trusted(
+                value,
+                np.full(value.shape, np.nan),
+                np.full(value.shape, np.nan),
+                np.zeros(value.shape, dtype=np.int8),
+            )
+        if isinstance(other, np.ndarray):
+            value = np.broadcast_to(
+                np.asarray(other, dtype=np.float64), self._value.shape
+            )
+            return ValueWithErrorArray._from_trusted(
+                value,
+                np.full(value.shape, np.nan),
+                np.full(value.shape, np.nan),
+                np.zeros(value.shape, dtype=np.int8),
+            )
+        if isinstance(
+            other,
+            (
+                ValueWithError,
+                ImplValueWithoutError,
+                ImplNormalValueWithError,
+                ImplStudentValueWithError,
+            ),
+        ):
+            one = ValueWithErrorArray.from_items([other])
+            return ValueWithErrorArray._from_trusted(
+                np.broadcast_to(one._value, self._value.shape),
+                np.broadcast_to(one._SE, self._value.shape),
+                np.broadcast_to(one._N, self._value.shape),
+                np.broadcast_to(one._kind, self._value.shape),
+            )
+        raise ValueError(f"Unsupported operand type: {type(other)}")
+
+    def __neg__(self) -> ValueWithErrorArray:
+        return ValueWithErrorArray._from_trusted(
+            -self._value, self._SE, self._N, self._kind
+        )
+
+    def _combine_kinds(self, other: ValueWithErrorArray, operation: str):
+        """
+        Common logic of addition and multiplication: an element without error adopts the kind, SE and N of
+        the other operand. Returns the resulting columns of SE, N and kind and the mask of elements where
+        both operands carry an error.
+        """
+        if len(other) != len(self):
+            raise ValueError(
+                f"Cannot {operation} arrays of different lengths: {len(self)} and {len(other)}"
+            )
+        self_bare = self._kind == KIND_NO_ERROR
+        kind = np.where(self_bare, other._kind, self._kind).astype(np.int8)
+        SE = np.where(self_bare, other._SE, self._SE)
+        N = np.where(self_bare, other._N, self._N)
+        both_errored = ~self_bare & (other._kind != KIND_NO_ERROR)
+        return SE, N, kind, both_errored
+
+    def __add__(self, other) -> ValueWithErrorArray:  # pyright: ignore[reportIncompatibleMethodOverride]
+        other = self._coerce(other)
+        SE, N, kind, both_errored = self._combine_kinds(other, "add")
+        if np.any(both_errored):
+            both_normal = (self._kind == KIND_NORMAL) & (other._kind == KIND_NORMAL)
+            if np.any(both_errored & ~both_normal):
+                raise ValueError(
+                    "Unsupported addition: only two normal estimates can be added together"
+                )
+            # A little controversial, as this implies that the errors are independent
+            SE = np.where(both_normal, np.sqrt(self._SE**2 + other._SE**2), SE)
+        return ValueWithErrorArray._from_trusted(
+            self._value + other._value, SE, N, kind
+        )
+
+    def __mul__(self, other) -> ValueWithErrorArray:  # pyright: ignore[reportIncompatibleMethodOverride]
+        """
+        Elementwise product. Multiplying an element with an error by a constant c scales its SE by |c|, as
+        `propagate(np.multiply, self, other)` and `CorrelatedValuesWithError` do. The scalar estimates keep
+        the SE instead.
+        """
+        other = self._coerce(other)
+        SE, N, kind, both_errored = self._combine_kinds(other, "multiply")
+        if np.any(both_errored):
+            raise ValueError(
+                "Unsupported multiplication between two values that both carry an error"
+            )
+        # The constant of each element is the operand without error
+        constant = np.where(self._kind == KIND_NO_ERROR, self._value, other._value)
+        return ValueWithErrorArray._from_trusted(
+            self._value * other._value, SE * np.abs(constant), N, kind
+        )
+
+
+def to_records(
+    items: ValueWithErrorArray
+    | VectorOfValuesWithError
+    | Iterable[ScalarImpl | ValueWithError | float],
+) -> np.ndarray:
+    """Any collection of estimates (without samples) as a structured array of `RECORD_DTYPE`."""
+    if isinstance(items, ValueWithErrorArray):
+        return items.to_records()
+    if isinstance(items, VectorOfValuesWithError):
+        items = items.items  # type: ignore[assignment]
+    return ValueWithErrorArray.from_items(list(items)).to_records()  # type: ignore[arg-type]
@@ -1,16 +1,44 @@
 from numbers import Number
-from typing import Iterator
+from typing import Iterator, Sequence
 
-from pydantic import BaseModel
+import numpy as np
+from pydantic import BaseModel, ConfigDict
 
+from .CI import checked_levels
+from .ImplNormalValueWithError import ImplNormalValueWithError
+from .ImplStudentValueWithError import ImplStudentValueWithError
 from .ImplValueWithoutError import ImplValueWithoutError
-from .ValueWithError import UnionOfAllValueWithErrorImpls
-from .constructors import make_ValueWithError
-from .iface import IValueWithError_Minimal
+from .ValueWithError import (
+    TaggedValueWithErrorImpl,
+    UnionOfAllValueWithErrorImpls,
+    ValueWithError,
+)
+from .iface import IValueWithError_Estimate, IValueWithError_SE
 from .repr_config import (
     ValueWithErrorRepresentationConfig as Config,
-    suggested_precision_digit_pos,
+    default_table_repr_config,
+    repr_table,
 )
+from .table_renderer import TableRenderer
+
+
+def values_and_errors(items: Sequence, config: Config) -> tuple[np.ndarray, np.ndarray]:
+    """The values and the errors that are displayed (NaN if there is no error), as numpy arrays."""
+    values = np.empty(len(items))
+    errors = np.full(len(items), np.nan)
+    for i, item in enumerate(items):
+        if isinstance(item, ValueWithError):
+            item = item.obj
+        if isinstance(item, Number):
+            # noinspection PyTypeChecker
+            values[i] = float(item)  # pyright: ignore[reportArgumentType]
+            continue
+        values[i] = item.value
+        if config.prefer_sd and isinstance(item, IValueWithError_Estimate):
+            errors[i] = item.SD
+        elif isinstance(item, IValueWithError_SE):
+            errors[i] = item.SE
+    return values, errors
 
 
 class VectorOfValuesWithError(BaseModel):
@@ -18,12 +46,11 @@ class VectorOfValuesWithError(BaseModel):
     The main point of this class is to represent the values in a coherent manner, i.e. with shared precision and representation.
     """
 
-    items: list[UnionOfAllValueWithErrorImpls]
+    items: list[TaggedValueWithErrorImpl]
+    model_config = ConfigDict(defer_build=True)
 
     def __init__(self, items: list[UnionOfAllValueWithErrorImpls | float]):
-        # Ensure all items are of the correct type
-        for item in items:
-            assert isinstance(item, (float, UnionOfAllValueWithErrorImpls))
+        # Other items (e.g. the dicts of the serialized form) are checked by the validation of the field
         items = [  # type: ignore[reportArgumentType]
             ImplValueWithoutError(value=item) if isinstance(item, float) else item
             for item in items
@@ -36,42 +63,78 @@ class VectorOfValuesWithError(BaseModel):
         absolute_precision_digit: int | None = None,
     ) -> list[str]:
         if config is None:
-            config = Config(
-                pad_raw_value_with_zeros=True,
-                significant_digit_bare=2,
-                detect_integers=False,
-            )
-        if absolute_precision_digit is None:
-            out_precisions: list[int] = []
-            for i, item in enumerate(self.items):
-                if isinstance(item, Number):
-                    # noinspection PyTypeChecker
-                    item = float(item)  # pyright: ignore[reportArgumentType]
-                    precision = suggested_precision_digit_pos(item, config, False)
-                    if precision is not None:
-                        out_precisions.append(precision)
-                    continue
-                assert isinstance(item, IValueWithError_Minimal)
-                precision = item.suggested_precision_digit_pos(config)
-                if precision is not None:
-                    out_precisions.append(precision)
-            if len(out_precisions) == 0:
-                out_precisions = [0]
-            # We need to gather the precisions - probably find the some lower centile of it, and use it throughout
-            out_precisions.sort()
-            quantile = 0.8
-            absolute_precision_digit = out_precisions[
-                int(len(out_precisions) * quantile)
-            ]
-
-        ans: list[str] = [""] * len(self.items)
+            config = default_table_repr_config()
+        values, errors = values_and_errors(self.items, config)
+        return repr_table(values, errors, config, absolute_precision_digit)
+
+    def table_renderer(
+        self,
+        config: Config | None = None,
+        absolute_precision_digit: int | None = None,
+    ) -> TableRenderer:
+        """Incremental renderer of the table, to which more rows can be appended. See TableRenderer."""
+        renderer = TableRenderer(config, absolute_precision_digit)
+        renderer.extend(self.items)
+        return renderer
+
+    def get_CIs(
+        self, levels: Sequence[float] | np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        CIs of all the items at many levels at once. The normal and Student items are computed together,
+        as by `ValueWithErrorArray.get_CIs`, and the percentiles of each sample in a single pass over it.
+        :return: Tuple of lower and upper bounds, of shape (number of items, number of levels).
+            Both are NaN for the items without error.
+        """
+        from .ValueWithErrorArray import ValueWithErrorArray
+
+        levels = checked_levels(levels)
+        parametric = [
+            not isinstance(item, IValueWithError_SE)
+            or isinstance(item, (ImplNormalValueWithError, ImplStudentValueWithError))
+            for item in self.items
+        ]
+        parametric_items = [item for item, p in zip(self.items, parametric) if p]
+        lower, upper = ValueWithErrorArray.from_items(parametric_items).get_CIs(levels)  # type: ignore[arg-type]
+        if all(parametric):
+            return lower, upper
+        ans_lower = np.empty((len(self.items), len(levels)))
+        ans_upper = np.empty_like(ans_lower)
+        ans_lower[parametric], ans_upper[parametric] = lower, upper
         for i, item in enumerate(self.items):
-            if isinstance(item, Number):
-                # noinspection PyTypeChecker
-                item = make_ValueWithError(item)  # pyright: ignore[reportArgumentType]
-            assert isinstance(item, IValueWithError_Minimal)
-            ans[i] = item.pretty_repr(config, absolute_precision_digit)
-        return ans
+            if not parametric[i]:
+                ans_lower[i], ans_upper[i] = item.get_CIs(levels)  # type: ignore[union-attr]
+        return ans_lower, ans_upper
+
+    def to_records(self) -> np.ndarray:
+        """
+        The items as a structured array with the fields value, SE, N and kind. See `ValueWithErrorArray.to_records`.
+        """
+        # Imported here, as the array module builds on this one.
+        from .ValueWithErrorArray import ValueWithErrorArray
+
+        return ValueWithErrorArray.from_items(self.items).to_records()  # type: ignore[arg-type]
+
+    @classmethod
+    def from_records(cls, records: np.ndarray) -> "VectorOfValuesWithError":
+        from .ValueWithErrorArray import ValueWithErrorArray
+
+        return ValueWithErrorArray.from_records(records).to_vector()
+
+    def to_columnar_json(self) -> bytes:
+        """
+        The items as JSON columns, smaller and much faster to parse than the list of items of `model_dump_json`.
+        See `ValueWithErrorArray.to_columnar_json`.
+        """
+        from .ValueWithErrorArray import ValueWithErrorArray
+
+        return ValueWithErrorArray.from_items(self.items).to_columnar_json()  # type: ignore[arg-type]
+
+    @classmethod
+    def from_columnar_json(cls, data: str | bytes) -> "VectorOfValuesWithError":
+        from .ValueWithErrorArray import ValueWithErrorArray
+
+        return ValueWithErrorArray.from_columnar_json(data).to_vector()
 
     def __len__(self) -> int:
         return len(self.items)
@@ -1,20 +1,93 @@
-from .repr_config import ValueWithErrorRepresentationConfig, absolute_rounding_digit
-from .constructors import make_ValueWithError, make_ValueWithError_from_vector
-from .iface import (
-    IValueWithError_Sample,
-    IValueWithError_SE,
-    IValueWithError_Minimal,
-    IValueWithError_Estimate,
-    IValueWithError_LinearTransforms,
-    I_CI,
-)
-from .ValueWithError import ValueWithError
-from .VectorOfValuesWithError import VectorOfValuesWithError
-from .CI import CI_95, CI_any
+"""
+The public names are loaded lazily (PEP 562), so that `import ValueWithError` costs next to nothing and
+numpy, pydantic and the models are imported only when the first of them is used.
+"""
 
+from __future__ import annotations
+
+import importlib
+import sys
+import types
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .repr_config import ValueWithErrorRepresentationConfig, absolute_rounding_digit
+    from .constructors import (
+        make_ValueWithError,
+        make_ValueWithError_from_vector,
+        make_ValueWithError_from_generator,
+        value_with_error,
+        from_samples,
+        from_frequencies,
+        from_stream,
+        from_sample_files,
+    )
+    from .iface import (
+        IValueWithError_Sample,
+        IValueWithError_SE,
+        IValueWithError_Minimal,
+        IValueWithError_Estimate,
+        IValueWithError_LinearTransforms,
+        I_CI,
+    )
+    from .ValueWithError import ValueWithError
+    from .VectorOfValuesWithError import VectorOfValuesWithError
+    from .ValueWithErrorArray import RECORD_DTYPE, ValueWithErrorArray, to_records
+    from .CorrelatedValuesWithError import CorrelatedValuesWithError
+    from .RunningValueWithError import RunningValueWithError
+    from .QuantileSketch import QuantileSketch
+    from .table_renderer import TableRenderer
+    from .propagation import propagate, register_derivatives
+    from .ImplSampleValueWithError import set_sample_dtype
+    from .bootstrap import BootstrapResult, bootstrap
+    from .CI import CI_95, CI_any
+
+# Public name -> submodule that defines it
+_LAZY_NAMES = {
+    "make_ValueWithError": "constructors",
+    "make_ValueWithError_from_vector": "constructors",
+    "make_ValueWithError_from_generator": "constructors",
+    "value_with_error": "constructors",
+    "from_samples": "constructors",
+    "from_frequencies": "constructors",
+    "from_stream": "constructors",
+    "from_sample_files": "constructors",
+    "IValueWithError_Sample": "iface",
+    "IValueWithError_SE": "iface",
+    "IValueWithError_Minimal": "iface",
+    "IValueWithError_Estimate": "iface",
+    "IValueWithError_LinearTransforms": "iface",
+    "I_CI": "iface",
+    "ValueWithErrorRepresentationConfig": "repr_config",
+    "absolute_rounding_digit": "repr_config",
+    "CI_95": "CI",
+    "CI_any": "CI",
+    "ValueWithError": "ValueWithError",
+    "VectorOfValuesWithError": "VectorOfValuesWithError",
+    "ValueWithErrorArray": "ValueWithErrorArray",
+    "RECORD_DTYPE": "ValueWithErrorArray",
+    "to_records": "ValueWithErrorArray",
+    "CorrelatedValuesWithError": "CorrelatedValuesWithError",
+    "RunningValueWithError": "RunningValueWithError",
+    "QuantileSketch": "QuantileSketch",
+    "TableRenderer": "table_renderer",
+    "propagate": "propagation",
+    "register_derivatives": "propagation",
+    "set_sample_dtype": "ImplSampleValueWithError",
+    "bootstrap": "bootstrap",
+    "BootstrapResult": "bootstrap",
+}
+
+# A literal list, so that the imports of the TYPE_CHECKING block count as re-exports
 __all__ = [
     "make_ValueWithError",
     "make_ValueWithError_from_vector",
+    "make_ValueWithError_from_generator",
+    "value_with_error",
+    "from_samples",
+    "from_frequencies",
+    "from_stream",
+    "from_sample_files",
     "IValueWithError_Sample",
     "IValueWithError_SE",
     "IValueWithError_Minimal",
@@ -27,4 +100,50 @@ __all__ = [
     "CI_any",
     "ValueWithError",
     "VectorOfValuesWithError",
+    "ValueWithErrorArray",
+    "RECORD_DTYPE",
+    "to_records",
+    "CorrelatedValuesWithError",
+    "RunningValueWithError",
+    "QuantileSketch",
+    "TableRenderer",
+    "propagate",
+    "register_derivatives",
+    "set_sample_dtype",
+    "bootstrap",
+    "BootstrapResult",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{_LAZY_NAMES[name]}", __name__)
+    value = getattr(module, name)
+    # Cached, so that the next lookup does not go through __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+class _LazyModule(types.ModuleType):
+    """
+    Some submodules are named after the class they define (e.g. `ValueWithError.ValueWithError`).
+    The import system stores each imported submodule as an attribute of the package, which would shadow
+    the class with the module. Such assignments are ignored, so that the name keeps resolving to the class.
+    """
+
+    def __setattr__(self, name: str, value: Any):
+        if (
+            isinstance(value, types.ModuleType)
+            and _LAZY_NAMES.get(name) == name
+            and value.__name__ == f"{__name__}.{name}"
+        ):
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _LazyModule
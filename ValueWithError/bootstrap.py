@@ -0,0 +1,262 @@
+"""
+Bootstrap SE and CIs of a statistic of a sample (by default, of its mean).
+
+The resamples are drawn as whole blocks of indices with a single vectorized call, and gathered and reduced
+in chunks of bounded size (`chunk_size` resampled elements at once), so that memory stays bounded whatever
+the number of resamples. Samples bigger than a chunk are resampled piecewise for the mean.
+
+The resamples are split into tasks of about `parallel.TASK_SIZE` elements, each with its own seed spawned
+from the user's seed, and the tasks are spread over a process pool. The seeds do not depend on the number
+of workers, so the same seed gives the same replicates in-process and in parallel. Memory-mapped samples
+are sent to the workers as a reference to their file rather than pickled.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Literal
+
+import numpy as np
+
+from .CI import CI_any
+from .critical_values import normal_quantile
+from .moments import CHUNK_SIZE, sample_moments
+from .parallel import TASK_SIZE
+from .pydantic_numpy import memmap_reference, open_memmap_reference
+
+Statistic = Callable[..., np.ndarray]
+"""Statistic computed along an axis, as the numpy reductions: `statistic(x, axis=-1)`, e.g. `np.median`."""
+
+DEFAULT_RESAMPLES = 10_000
+
+# Number of resampled elements drawn and gathered at once: 32 MB of indices and as much of the values.
+BOOTSTRAP_CHUNK_SIZE = 1 << 22
+
+# Number of the groups of the grouped jackknife that estimates the BCa acceleration of user statistics
+JACKKNIFE_GROUPS = 100
+
+BootstrapMethod = Literal["percentile", "bca"]
+
+
+def _is_mean(statistic: Statistic | None) -> bool:
+    return statistic is None or statistic is np.mean
+
+
+def _normal_cdf(x: float) -> float:
+    return 0.5 * math.erfc(-x / math.sqrt(2))
+
+
+def resample_block(
+    x: np.ndarray,
+    statistic: Statistic | None,
+    n_resamples: int,
+    seed: np.random.SeedSequence | int | None,
+    chunk_size: int = BOOTSTRAP_CHUNK_SIZE,
+) -> np.ndarray:
+    """Replicates of the statistic on `n_resamples` resamples of x drawn from the seed."""
+    rng = np.random.default_rng(seed)
+    n = len(x)
+    ans = np.empty(n_resamples)
+    per_chunk = max(1, chunk_size // n)
+    for start in range(0, n_resamples, per_chunk):
+        if _is_mean(statistic) and n > chunk_size:
+            # A single resample does not fit in a chunk, so its sum is accumulated piece by piece.
+            total = 0.0
+            for piece in range(0, n, chunk_size):
+                indices = rng.integers(0, n, min(chunk_size, n - piece))
+                total += float(np.take(x, indices).sum(dtype=np.float64))
+            ans[start] = total / n
+            continue
+        k = min(per_chunk, n_resamples - start)
+        draws = np.take(x, rng.integers(0, n, (k, n)))
+        if _is_mean(statistic):
+            ans[start : start + k] = draws.mean(axis=-1, dtype=np.float64)
+        else:
+            assert statistic is not None
+            ans[start : start + k] = statistic(draws, axis=-1)
+    return ans
+
+
+# Sample and statistic of the worker process, set once by the pool initializer rather than sent with every task
+_worker_state: tuple[np.ndarray, Statistic | None] | None = None
+
+
+def _init_worker(sample: np.ndarray | dict[str, Any], statistic: Statistic | None):
+    global _worker_state
+    if isinstance(sample, dict):
+        sample = open_memmap_reference(sample)
+    _worker_state = sample, statistic
+
+
+def _worker_block(task: tuple[int, np.random.SeedSequence, int]) -> np.ndarray:
+    assert _worker_state is not None
+    n_resamples, seed, chunk_size = task
+    x, statistic = _worker_state
+    return resample_block(x, statistic, n_resamples, seed, chunk_size)
+
+
+def mean_acceleration(x: np.ndarray, chunk_size: int = CHUNK_SIZE) -> float:
+    """
+    BCa acceleration of the mean, from the jackknife in closed form: the jackknife means deviate from their
+    mean by (x_i - mean) / (n - 1), so the acceleration is `Σd³ / (6 (Σd²)^1.5)` of the deviations d.
+    """
+    _, mean, _ = sample_moments(x)
+    sum2 = sum3 = 0.0
+    for start in range(0, len(x), chunk_size):
+        d = np.asarray(x[start : start + chunk_size], dtype=np.float64) - mean
+        d2 = d * d
+        sum2 += float(d2.sum())
+        sum3 += float(np.dot(d2, d))
+    if not sum2 > 0:
+        return 0.0
+    return sum3 / (6 * sum2**1.5)
+
+
+def jackknife_acceleration(
+    x: np.ndarray, statistic: Statistic, groups: int = JACKKNIFE_GROUPS
+) -> float:
+    """BCa acceleration of a statistic, from the grouped (delete-a-group) jackknife."""
+    x = np.asarray(x)
+    bounds = np.linspace(0, len(x), min(groups, len(x)) + 1).astype(np.int64)
+    replicates = np.asarray(
+        [
+            statistic(np.concatenate([x[:start], x[stop:]]), axis=-1)
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        ],
+        dtype=np.float64,
+    )
+    d = replicates.mean() - replicates
+    sum2 = float(np.dot(d, d))
+    if not sum2 > 0:
+        return 0.0
+    return float(np.dot(d * d, d)) / (6 * sum2**1.5)
+
+
+class BootstrapResult:
+    """Bootstrap replicates of a statistic, with the SE and the CIs they give."""
+
+    def __init__(self, estimate: float, replicates: np.ndarray, acceleration: float):
+        """
+        :param estimate: The statistic of the original sample.
+        :param replicates: The statistic of each resample.
+        :param acceleration: The BCa acceleration (the skewness correction) of the statistic.
+        """
+        self.estimate = estimate
+        self.replicates = replicates
+        self.acceleration = acceleration
+
+    def __len__(self) -> int:
+        return len(self.replicates)
+
+    @property
+    def SE(self) -> float:
+        return float(np.std(self.replicates, ddof=1))
+
+    @property
+    def bias(self) -> float:
+        return float(np.mean(self.replicates)) - self.estimate
+
+    def _bca_percentiles(self, level: float) -> list[float]:
+        replicates = self.replicates
+        below = np.count_nonzero(replicates < self.estimate)
+        ties = np.count_nonzero(replicates == self.estimate)
+        z0 = normal_quantile((below + ties / 2) / len(replicates))
+        ans = []
+        for p in ((1 - level) / 2, (1 + level) / 2):
+            z = z0 + normal_quantile(p)
+            ans.append(100 * _normal_cdf(z0 + z / (1 - self.acceleration * z)))
+        if not all(0 <= p <= 100 for p in ans):
+            raise ValueError(
+                "The BCa interval is undefined, as the estimate lies outside of the replicates. "
+                "Use the percentile method"
+            )
+        return ans
+
+    def get_CI(
+        self, level: float = 0.95, method: BootstrapMethod = "percentile"
+    ) -> CI_any:
+        """
+        :param method: "percentile" for the percentiles of the replicates, or "bca" for the bias-corrected
+            and accelerated ones, which are second-order accurate for skewed statistics.
+        """
+        if not 0 < level < 1:
+            raise ValueError(f"CI level must be between 0 and 1, got {level}")
+        if method == "percentile":
+            percentiles = [(1 - level) * 50, 100 - (1 - level) * 50]
+        elif method == "bca":
+            percentiles = self._bca_percentiles(level)
+        else:
+            raise ValueError(f"Unknown bootstrap CI method {method!r}")
+        lower, upper = np.percentile(self.replicates, percentiles).tolist()
+        return CI_any._from_trusted(lower, upper, level)
+
+    @property
+    def CI95(self) -> CI_any:
+        return self.get_CI(0.95)
+
+    def __repr__(self) -> str:
+        return f"BootstrapResult(estimate={self.estimate!r}, SE={self.SE!r}, n_resamples={len(self)})"
+
+
+def bootstrap(
+    sample: np.ndarray,
+    statistic: Statistic | None = None,
+    n_resamples: int = DEFAULT_RESAMPLES,
+    seed: int | np.random.SeedSequence | None = None,
+    max_workers: int | None = None,
+    chunk_size: int = BOOTSTRAP_CHUNK_SIZE,
+    task_size: int = TASK_SIZE,
+    estimate: float | None = None,
+) -> BootstrapResult:
+    """
+    Bootstraps the statistic of the sample.
+
+    :param sample: 1-dimensional array, possibly memory-mapped.
+    :param statistic: Vectorized statistic, called as `statistic(x, axis=-1)` on a block of resamples.
+        Defaults to the mean. With a process pool, it must be picklable (e.g. not a lambda).
+    :param seed: Seed of the resamples. The same seed gives the same replicates for any `max_workers`.
+    :param max_workers: Number of worker processes. Defaults to the number of CPUs. With 1 the work is done in-process.
+    :param chunk_size: Number of resampled elements drawn and gathered at once.
+    :param task_size: Number of resampled elements of a single task of the process pool. Each task has its own
+        seed, so the replicates depend on it.
+    :param estimate: Already known statistic of the whole sample, to save a pass over it.
+    """
+    sample = np.ravel(sample)
+    n = len(sample)
+    if n == 0:
+        raise ValueError("Cannot bootstrap an empty sample")
+    if n_resamples < 2:
+        raise ValueError(f"Expected at least 2 resamples, got {n_resamples}")
+
+    per_task = max(1, task_size // n)
+    sizes = [
+        min(per_task, n_resamples - start) for start in range(0, n_resamples, per_task)
+    ]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(size, task_seed, chunk_size) for size, task_seed in zip(sizes, seeds)]
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(tasks))
+    if max_workers <= 1:
+        blocks = [resample_block(sample, statistic, *task) for task in tasks]
+    else:
+        reference = memmap_reference(sample) if isinstance(sample, np.memmap) else None
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(sample if reference is None else reference, statistic),
+        ) as executor:
+            blocks = list(executor.map(_worker_block, tasks))
+
+    if _is_mean(statistic):
+        if estimate is None:
+            estimate = sample_moments(sample)[1]
+        acceleration = mean_acceleration(sample)
+    else:
+        assert statistic is not None
+        if estimate is None:
+            estimate = float(statistic(np.asarray(sample), axis=-1))
+        acceleration = jackknife_acceleration(sample, statistic)
+    return BootstrapResult(float(estimate), np.concatenate(blocks), acceleration)
@@ -1,12 +1,19 @@
-from typing import Iterator
+from pathlib import Path
+from typing import Iterator, Sequence
 
 import numpy as np
 
+from .ImplCompactSampleValueWithError import (
+    DEFAULT_GRID_SIZE,
+    ImplCompactSampleValueWithError,
+)
 from .ImplNormalValueWithError import ImplNormalValueWithError
 from .ImplSampleValueWithError import ImplSampleValueWithError
 from .ImplStudentValueWithError import ImplStudentValueWithError
 from .ImplValueWithoutError import ImplValueWithoutError
+from .RunningValueWithError import RunningValueWithError
 from .ValueWithError import ValueWithError
+from .parallel import open_shard, parallel_moments
 
 
 def make_ValueWithError(
@@ -34,28 +41,20 @@ def make_ValueWithError_from_generator(
 ) -> ValueWithError:
     """
     Creates a ValueWithError from a generator using the inline method.
-    :param generator: A generator that returns a float on each iteration.
+    :param generator: A generator that returns a float on each iteration, or a numpy array.
     :param N: The number of iterations to run the generator. Otherwise, we iterate until the generator stops.
     :return: the ValueWithError
     """
-    sum = 0.0
-    sumsq = 0.0
-    count = 0
-    for value in generator:
-        sum += value
-        sumsq += value * value
-        count += 1
-        if N is not None and count >= N:
-            break
-
-    if count == 0:
+    accumulator = RunningValueWithError()
+    if isinstance(generator, np.ndarray):
+        accumulator.add(generator if N is None else generator[:N])
+    else:
+        accumulator.add_stream(generator, max_samples=N)
+
+    if accumulator.N == 0:
         raise ValueError("Cannot create ValueWithError from empty generator")
 
-    mean = sum / count
-    SD = np.sqrt(sumsq / count - mean * mean)
-    ans = make_ValueWithError(mean=float(mean), SE=float(SD) / np.sqrt(count), N=count)
-    assert isinstance(ans, ImplSampleValueWithError)
-    return ValueWithError(obj=ans)
+    return ValueWithError._from_trusted(accumulator.snapshot())
 
 
 def fromJSON(json: dict) -> ValueWithError:
@@ -103,17 +102,53 @@ def value_with_error(
     return make_ValueWithError(mean=value, SE=error, N=n_samples)
 
 
-def from_samples(samples: np.ndarray) -> ValueWithError:
+def from_samples(
+    samples: np.ndarray,
+    grid_size: int | None = None,
+    index_order_statistics: bool = False,
+) -> ValueWithError:
     """
     Creates a ValueWithError object from a vector of observations.
 
     Args:
         samples: Array of measurements or samples
+        grid_size: If given, keeps only a fixed-size summary of the samples (exact moments and quantiles
+            on a grid of about that many points) instead of the samples themselves.
+        index_order_statistics: Keep a sorted copy of the samples once a quantile is requested, for the
+            samples whose CIs are queried many times. See `ImplSampleValueWithError.index_order_statistics`.
 
     Returns:
         ValueWithError object with mean, SE and CIs calculated from samples
     """
-    return make_ValueWithError_from_vector(samples)
+    if grid_size is not None:
+        return ValueWithError._from_trusted(
+            ImplCompactSampleValueWithError.from_sample(samples, grid_size=grid_size)
+        )
+    ans = make_ValueWithError_from_vector(samples)
+    if index_order_statistics:
+        ans.obj.index_order_statistics()  # type: ignore[union-attr]
+    return ans
+
+
+def from_frequencies(
+    values: np.ndarray, counts: np.ndarray, grid_size: int = DEFAULT_GRID_SIZE
+) -> ValueWithError:
+    """
+    Creates a ValueWithError object from a frequency table of observations, without expanding it.
+
+    Args:
+        values: Distinct observed values
+        counts: Number of observations of each value
+        grid_size: Number of the evenly spaced cells of the kept quantile grid. See from_samples.
+
+    Returns:
+        ValueWithError object with the same mean, SE and CIs as from `np.repeat(values, counts)`
+    """
+    return ValueWithError._from_trusted(
+        ImplCompactSampleValueWithError.from_frequencies(
+            values, counts, grid_size=grid_size
+        )
+    )
 
 
 def from_stream(
@@ -131,3 +166,45 @@ def from_stream(
         ValueWithError object
     """
     return make_ValueWithError_from_generator(generator, max_samples)
+
+
+def from_sample_files(
+    paths: str | Path | Sequence[str | Path],
+    dtype: np.dtype | str | None = None,
+    max_workers: int | None = None,
+    memory_map_sample: bool = False,
+) -> ValueWithError:
+    """
+    Parallel counterpart of from_samples for data stored on disk, possibly split into shards.
+
+    The files are memory-mapped and cut into chunks, whose moments are computed in a process pool
+    and reduced into a single estimate, so neither the whole data set nor a single shard has to fit in RAM.
+
+    Args:
+        paths: A single file or a list of shards. `.npy` files or raw binary files.
+        dtype: dtype of the raw binary files. Not needed for `.npy` files.
+        max_workers: Number of worker processes. Defaults to the number of CPUs.
+        memory_map_sample: If True, returns a sample-backed object over a memory-mapped view of the file
+            (only for a single file) instead of the Student estimate of the mean.
+
+    Returns:
+        ValueWithError object
+    """
+    if isinstance(paths, (str, Path)):
+        paths = [paths]
+    moments = parallel_moments(paths, dtype=dtype, max_workers=max_workers)
+    if moments[0] == 0:
+        raise ValueError("Cannot create ValueWithError from empty files")
+    if memory_map_sample:
+        if len(paths) != 1:
+            raise ValueError(
+                "Memory-mapped sample can only be built over a single file"
+            )
+        sample = open_shard(paths[0], dtype).reshape(-1)
+        return ValueWithError._from_trusted(
+            ImplSampleValueWithError._from_trusted(sample, moments=moments)
+        )
+    count, mean, M2 = moments
+    return ValueWithError._from_trusted(
+        ImplStudentValueWithError._from_trusted(mean, np.sqrt(M2) / count, count)
+    )
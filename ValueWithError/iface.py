@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from typing import Sequence
 
 import numpy as np
 from numbers import Number
@@ -8,11 +9,14 @@ from numbers import Number
 from .repr_config import (
     ValueWithErrorRepresentationConfig,
     default_value_with_error_repr_config,
+    level_txt,
     suggested_precision_digit_pos_for_CI,
 )
 
 
 class I_CI(ABC):
+    __slots__ = ()
+
     @property
     @abstractmethod
     def level(self) -> float: ...
@@ -39,9 +43,7 @@ class I_CI(ABC):
 
     @property
     def level_txt(self) -> str:
-        if 1 - self.level < 0.01:
-            return f"{round(self.level * 1000) / 10}"
-        return f"{round(self.level * 100)}"
+        return level_txt(self.level)
 
     @property
     def width(self) -> float:
@@ -64,6 +66,8 @@ class I_CI(ABC):
 class IValueWithError_Minimal(ABC):
     """Minimal interface for getting uniform treatment of various ValueWithError backing types"""
 
+    __slots__ = ()
+
     @abstractmethod
     def suggested_precision_digit_pos(
         self, config: ValueWithErrorRepresentationConfig
@@ -92,6 +96,8 @@ class IValueWithError_Minimal(ABC):
 class IValueWithError_SE(IValueWithError_Minimal):
     """Builds on IValueWithError_Minimal to add CI and SE"""
 
+    __slots__ = ()
+
     @property
     @abstractmethod
     def SE(self) -> float: ...
@@ -103,10 +109,25 @@ class IValueWithError_SE(IValueWithError_Minimal):
     @abstractmethod
     def get_CI(self, level: float) -> I_CI: ...
 
+    def get_CIs(
+        self, levels: Sequence[float] | np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        CIs at many levels at once, without a CI object per level.
+        :return: Tuple of the arrays of the lower and upper bounds, one element per level.
+        """
+        cis = [self.get_CI(level) for level in np.asarray(levels).tolist()]
+        return (
+            np.asarray([ci.lower for ci in cis], dtype=np.float64),
+            np.asarray([ci.upper for ci in cis], dtype=np.float64),
+        )
+
 
 class IValueWithError_Estimate(IValueWithError_SE):
     """Builds on IValueWithError_SE to add information about the sample size"""
 
+    __slots__ = ()
+
     @property
     @abstractmethod
     def SD(self) -> float: ...
@@ -122,6 +143,8 @@ class IValueWithError_Estimate(IValueWithError_SE):
 class IValueWithError_Sample(IValueWithError_Estimate):
     """Builds on IValueWithError_Estimate to add information derivable from actual sample vector"""
 
+    __slots__ = ()
+
     @property
     @abstractmethod
     def sample(self) -> np.ndarray: ...
@@ -131,6 +154,8 @@ class IValueWithError_Sample(IValueWithError_Estimate):
 
 
 class IValueWithError_LinearTransforms(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def __neg__(self) -> IValueWithError_LinearTransforms: ...
 
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import itertools
+from typing import Iterable, Iterator
+
+import numpy as np
+
+# Number of elements processed at once. Small enough for the temporaries to stay in the CPU cache,
+# big enough for the per-chunk Python overhead to be negligible.
+CHUNK_SIZE = 1 << 16
+
+Moments = tuple[int, float, float]
+"""Sufficient statistics of a sample: count, mean and M2 (the sum of squared deviations from the mean)."""
+
+
+def sample_moments(x: np.ndarray, chunk_size: int = CHUNK_SIZE) -> Moments:
+    """
+    Computes count, mean and M2 of the sample in a single pass over the memory.
+
+    Each chunk is reduced to its own mean and M2 while it sits in the cache, and the chunk results are
+    combined with the pairwise formula of Chan et al., which does not suffer from the catastrophic
+    cancellation of the naive `sumsq/count - mean²` approach. Accumulation is always done in float64.
+    """
+    x = np.ravel(x)
+    n = len(x)
+    if n == 0:
+        return 0, float("nan"), float("nan")
+    n_chunks = (n + chunk_size - 1) // chunk_size
+    counts = np.empty(n_chunks)
+    means = np.empty(n_chunks)
+    m2s = np.empty(n_chunks)
+    for i in range(n_chunks):
+        chunk = np.asarray(x[i * chunk_size : (i + 1) * chunk_size], dtype=np.float64)
+        counts[i] = len(chunk)
+        means[i] = chunk.mean()
+        deviations = chunk - means[i]
+        m2s[i] = np.dot(deviations, deviations)
+    return combine_moments(counts, means, m2s)
+
+
+def combine_moments(counts: np.ndarray, means: np.ndarray, m2s: np.ndarray) -> Moments:
+    """Combines the moments of disjoint parts of a sample into the moments of the whole sample."""
+    count = float(np.sum(counts))
+    if count == 0:
+        return 0, float("nan"), float("nan")
+    nonempty = counts > 0
+    counts, means, m2s = counts[nonempty], means[nonempty], m2s[nonempty]
+    mean = float(np.dot(counts, means) / count)
+    M2 = float(np.sum(m2s) + np.dot(counts, (means - mean) ** 2))
+    return int(count), mean, M2
+
+
+def frequency_moments(values: np.ndarray, counts: np.ndarray) -> Moments:
+    """Moments of the sample given as a frequency table, i.e. `np.repeat(values, counts)`, without expanding it."""
+    values = np.asarray(values, dtype=np.float64).ravel()
+    counts = np.asarray(counts, dtype=np.float64).ravel()
+    count = float(np.sum(counts))
+    if count == 0:
+        return 0, float("nan"), float("nan")
+    nonempty = counts > 0
+    values, counts = values[nonempty], counts[nonempty]
+    mean = float(np.dot(counts, values) / count)
+    M2 = float(np.dot(counts, (values - mean) ** 2))
+    return int(count), mean, M2
+
+
+def merge_moments(a: Moments, b: Moments) -> Moments:
+    """Merges the moments of two disjoint samples."""
+    return combine_moments(
+        np.asarray([a[0], b[0]], dtype=np.float64),
+        np.asarray([a[1], b[1]], dtype=np.float64),
+        np.asarray([a[2], b[2]], dtype=np.float64),
+    )
+
+
+def iter_chunks(
+    values: Iterable[float],
+    max_samples: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[np.ndarray]:
+    """
+    Reads the iterable into float64 numpy chunks, so that the per-value Python overhead is limited to reading it.
+    :param max_samples: Stop after that many values. Otherwise, we iterate until the iterable is exhausted.
+    """
+    iterator = iter(values)
+    remaining = max_samples
+    while remaining is None or remaining > 0:
+        size = chunk_size if remaining is None else min(chunk_size, remaining)
+        chunk = np.fromiter(itertools.islice(iterator, size), dtype=np.float64)
+        if len(chunk) == 0:
+            return
+        yield chunk
+        if remaining is not None:
+            remaining -= len(chunk)
+        if len(chunk) < size:
+            return
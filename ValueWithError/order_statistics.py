@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import numpy as np
+
+from .moments import CHUNK_SIZE
+
+# Number of histogram bins used to narrow down the range of an order statistic in a single pass.
+HISTOGRAM_BINS = 1 << 14
+
+# Samples (or the candidate ranges within them) up to this size are processed in memory.
+IN_MEMORY_SIZE = 1 << 22
+
+
+def _chunks(x: np.ndarray, chunk_size: int):
+    for start in range(0, len(x), chunk_size):
+        yield np.asarray(x[start : start + chunk_size], dtype=np.float64)
+
+
+def _edges(lo: float, hi: float) -> np.ndarray:
+    """Evenly spaced edges of the histogram bins, without overflow on ranges wider than the largest float."""
+    t = np.linspace(0, 1, HISTOGRAM_BINS + 1)
+    edges = lo * (1 - t) + hi * t
+    edges[0], edges[-1] = lo, hi
+    return np.maximum.accumulate(edges)
+
+
+def _bin_indices(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """
+    Same as `np.searchsorted(edges, values, side="right") - 1` clipped to the valid bins, for evenly spaced
+    edges: the index is computed arithmetically and then corrected for the rounding at the bin edges.
+    """
+    n_bins = len(edges) - 1
+    lo, hi = edges[0], edges[-1]
+    with np.errstate(over="ignore", divide="ignore"):
+        width = hi - lo
+        scale = n_bins / width
+    if not (np.isfinite(width) and np.isfinite(scale) and np.all(np.diff(edges) > 0)):
+        # Degenerate ranges, too narrow or too wide for the arithmetic
+        ans = np.searchsorted(edges, values, side="right") - 1
+        return np.clip(ans, 0, n_bins - 1)
+    ans = ((values - lo) * scale).astype(np.intp)
+    np.clip(ans, 0, n_bins - 1, out=ans)
+    while True:
+        too_high = values < edges[ans]
+        if not too_high.any():
+            break
+        ans -= too_high
+    while True:
+        too_low = (values >= edges[ans + 1]) & (ans < n_bins - 1)
+        if not too_low.any():
+            break
+        ans += too_low
+    return ans
+
+
+def select(
+    x: np.ndarray,
+    ranks: list[int],
+    chunk_size: int = CHUNK_SIZE,
+    in_memory_size: int = IN_MEMORY_SIZE,
+) -> dict[int, float]:
+    """
+    Exact order statistics (0-based ranks in the sorted sample) of a sample that need not fit in memory.
+
+    Each pass over the sample histograms the current range of candidates of the requested ranks and
+    narrows it down to the single bin that contains the rank. Once few enough candidates are left, they are
+    collected and the rank is selected in memory. Usually 2-3 passes are enough. The sample must not contain NaN.
+    """
+    x = np.ravel(x)
+    lo, hi = np.inf, -np.inf
+    n_minus_inf = n_plus_inf = 0
+    for chunk in _chunks(x, chunk_size):
+        finite = chunk[np.isfinite(chunk)]
+        n_minus_inf += int(np.count_nonzero(chunk == -np.inf))
+        n_plus_inf += len(chunk) - len(finite) - int(np.count_nonzero(chunk == -np.inf))
+        if len(finite):
+            lo = min(lo, float(finite.min()))
+            hi = max(hi, float(finite.max()))
+    n_finite = len(x) - n_minus_inf - n_plus_inf
+    ans: dict[int, float] = {}
+    finite_ranks = []
+    for rank in sorted(set(ranks)):
+        if rank < n_minus_inf:
+            ans[rank] = -np.inf
+        elif rank >= n_minus_inf + n_finite:
+            ans[rank] = np.inf
+        else:
+            finite_ranks.append(rank)
+    # All the ranks that share the current range of candidates: (lo, hi, values below lo, values within)
+    ranges: dict[tuple[float, float, int, int], list[int]] = {}
+    if finite_ranks:
+        ranges[(lo, hi, n_minus_inf, n_finite)] = finite_ranks
+    while ranges:
+        histograms = {
+            key: np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+            for key in ranges
+            if key[3] > in_memory_size
+        }
+        edges = {key: _edges(key[0], key[1]) for key in histograms}
+        collected: dict[tuple, list[np.ndarray]] = {
+            key: [] for key in ranges if key not in histograms
+        }
+        for chunk in _chunks(x, chunk_size):
+            for key in ranges:
+                candidates = chunk[(chunk >= key[0]) & (chunk <= key[1])]
+                if key in histograms:
+                    histograms[key] += np.bincount(
+                        _bin_indices(candidates, edges[key]), minlength=HISTOGRAM_BINS
+                    )
+                else:
+                    collected[key].append(candidates)
+        next_ranges: dict[tuple[float, float, int, int], list[int]] = {}
+        for key, key_ranks in ranges.items():
+            lo, hi, below, _ = key
+            if key in collected:
+                candidates = np.concatenate(collected[key])
+                ks = [rank - below for rank in key_ranks]
+                candidates.partition(ks)
+                for rank, k in zip(key_ranks, ks):
+                    ans[rank] = float(candidates[k])
+                continue
+            cumulative = np.cumsum(histograms[key])
+            for rank in key_ranks:
+                j = int(np.searchsorted(cumulative, rank - below, side="right"))
+                new_lo = float(edges[key][j])
+                new_hi = hi
+                if j < HISTOGRAM_BINS - 1:
+                    new_hi = float(np.nextafter(edges[key][j + 1], -np.inf))
+                if new_lo == new_hi:
+                    ans[rank] = new_lo
+                    continue
+                count = int(histograms[key][j])
+                if (new_lo, new_hi) == (lo, hi):
+                    # No progress (can only happen on a range of a few representable numbers)
+                    count = 0
+                new_key = (
+                    new_lo,
+                    new_hi,
+                    below + (int(cumulative[j - 1]) if j > 0 else 0),
+                    count,
+                )
+                next_ranges.setdefault(new_key, []).append(rank)
+        ranges = next_ranges
+    return ans
+
+
+def sample_quantiles(
+    x: np.ndarray,
+    q: float | np.ndarray,
+    chunk_size: int = CHUNK_SIZE,
+    in_memory_size: int = IN_MEMORY_SIZE,
+) -> np.ndarray:
+    """
+    Same as `np.quantile(x, q)` (with the default, linear method) of the sample in float64, but reads the
+    sample in chunks, so that it works in bounded memory on memory-mapped samples bigger than RAM.
+    """
+    q = np.asarray(q, dtype=np.float64)
+    if np.any((q < 0) | (q > 1)):
+        raise ValueError("Quantiles must be in the range [0, 1]")
+    x = np.ravel(x)
+    n = len(x)
+    if n <= in_memory_size:
+        x = np.asarray(x)
+        if x.dtype == np.float64 or n == 0:
+            return np.quantile(x, q)
+        # Samples stored in less precision (e.g. float32) are selected in their own dtype, without a float64
+        # copy, and only the selected order statistics are interpolated in float64.
+        x = np.array(x)
+        if np.isnan(x).any():
+            return np.full(q.shape, np.nan)
+        virtual = (n - 1) * q
+        previous = np.floor(virtual).astype(np.int64)
+        following = np.minimum(previous + 1, n - 1)
+        x.partition(np.unique(np.concatenate([previous.ravel(), following.ravel()])))
+        return _lerp(
+            x[previous].astype(np.float64),
+            x[following].astype(np.float64),
+            virtual - previous,
+        )
+    for chunk in _chunks(x, chunk_size):
+        if np.isnan(chunk).any():
+            return np.full(q.shape, np.nan)
+    virtual = (n - 1) * q
+    previous = np.floor(virtual).astype(np.int64)
+    following = np.minimum(previous + 1, n - 1)
+    values = select(
+        x,
+        previous.ravel().tolist() + following.ravel().tolist(),
+        chunk_size=chunk_size,
+        in_memory_size=in_memory_size,
+    )
+    a = np.vectorize(values.__getitem__, otypes=[np.float64])(previous)
+    b = np.vectorize(values.__getitem__, otypes=[np.float64])(following)
+    return _lerp(a, b, virtual - previous)
+
+
+def sorted_quantiles(sorted_x: np.ndarray, q: float | np.ndarray) -> np.ndarray:
+    """
+    Same as `np.quantile(x, q)` of the sample x sorted as `sorted_x` (NaN last, as by `np.sort`), but each
+    quantile is a lookup of the two neighbouring order statistics rather than a selection.
+    """
+    q = np.asarray(q, dtype=np.float64)
+    if np.any((q < 0) | (q > 1)):
+        raise ValueError("Quantiles must be in the range [0, 1]")
+    n = len(sorted_x)
+    if np.isnan(sorted_x[-1]):
+        return np.full(q.shape, np.nan)
+    virtual = (n - 1) * q
+    previous = np.floor(virtual).astype(np.int64)
+    following = np.minimum(previous + 1, n - 1)
+    # Interpolated in float64 whatever the storage dtype of the sample
+    return _lerp(
+        sorted_x[previous].astype(np.float64),
+        sorted_x[following].astype(np.float64),
+        virtual - previous,
+    )
+
+
+def _lerp(a: np.ndarray, b: np.ndarray, gamma: np.ndarray) -> np.ndarray:
+    """Linear interpolation between the neighbouring order statistics, exactly as numpy does it."""
+    with np.errstate(invalid="ignore"):
+        diff = b - a
+        return np.where(gamma >= 0.5, b - diff * (1 - gamma), a + diff * gamma)
+
+
+def frequency_quantiles(
+    values: np.ndarray, counts: np.ndarray, q: float | np.ndarray
+) -> np.ndarray:
+    """
+    Same as `np.quantile(np.repeat(values, counts), q)`, but without expanding the frequency table,
+    so it costs O(len(values)) memory whatever the total count.
+    """
+    q = np.asarray(q, dtype=np.float64)
+    if np.any((q < 0) | (q > 1)):
+        raise ValueError("Quantiles must be in the range [0, 1]")
+    values = np.asarray(values, dtype=np.float64).ravel()
+    counts = np.asarray(counts).ravel()
+    if values.shape != counts.shape:
+        raise ValueError("values and counts must have the same length")
+    if np.any(counts < 0):
+        raise ValueError("counts must be non-negative")
+    nonempty = counts > 0
+    values, counts = values[nonempty], counts[nonempty].astype(np.int64)
+    if len(values) == 0:
+        raise ValueError("Cannot compute quantiles of an empty frequency table")
+    if np.isnan(values).any():
+        return np.full(q.shape, np.nan)
+    order = np.argsort(values, kind="stable")
+    values = values[order]
+    # Rank of the last copy of each value in the expanded sample
+    last_rank = np.cumsum(counts[order]) - 1
+    n = int(last_rank[-1]) + 1
+    virtual = (n - 1) * q
+    previous = np.floor(virtual).astype(np.int64)
+    following = np.minimum(previous + 1, n - 1)
+    a = values[np.searchsorted(last_rank, previous)]
+    b = values[np.searchsorted(last_rank, following)]
+    return _lerp(a, b, virtual - previous)
+
+
+def sample_percentiles(
+    x: np.ndarray, percentiles: float | np.ndarray, **kwargs
+) -> np.ndarray:
+    """Same as `np.percentile(x, percentiles)`. See `sample_quantiles`."""
+    return sample_quantiles(x, np.true_divide(percentiles, 100), **kwargs)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple, Sequence
+
+import numpy as np
+
+from .moments import Moments, combine_moments, sample_moments
+
+# Number of elements handled by a single task of the process pool.
+TASK_SIZE = 1 << 24
+
+
+class ShardSlice(NamedTuple):
+    """Description of a contiguous part of an on-disk array, cheap to send to a worker process."""
+
+    path: str
+    dtype: str
+    offset: int  # In bytes, from the beginning of the file
+    start: int  # In elements, relative to the offset
+    stop: int
+
+
+def open_shard(
+    path: str | Path, dtype: np.dtype | str | None = None, mode: str = "r"
+) -> np.memmap:
+    """
+    Memory-maps a single shard. `.npy` files carry their own dtype, so `dtype` is only used for raw binary files.
+    """
+    path = Path(path)
+    if path.suffix == ".npy":
+        return np.load(path, mmap_mode=mode)  # type: ignore[arg-type]
+    if dtype is None:
+        raise ValueError(f"dtype must be given for the raw binary shard {path}")
+    return np.memmap(path, dtype=dtype, mode=mode)  # type: ignore[arg-type]
+
+
+def plan_slices(
+    paths: Sequence[str | Path],
+    dtype: np.dtype | str | None = None,
+    task_size: int = TASK_SIZE,
+) -> list[ShardSlice]:
+    """Splits all the shards into slices of at most `task_size` elements."""
+    ans: list[ShardSlice] = []
+    for path in paths:
+        shard = open_shard(path, dtype)
+        offset = shard.offset if isinstance(shard, np.memmap) else 0
+        n = shard.size
+        for start in range(0, n, task_size):
+            ans.append(
+                ShardSlice(
+                    path=str(path),
+                    dtype=shard.dtype.str,
+                    offset=offset,
+                    start=start,
+                    stop=min(start + task_size, n),
+                )
+            )
+        del shard
+    return ans
+
+
+def slice_moments(task: ShardSlice) -> Moments:
+    """Worker function: moments of a single slice, read through a memory map."""
+    itemsize = np.dtype(task.dtype).itemsize
+    data = np.memmap(
+        task.path,
+        dtype=task.dtype,
+        mode="r",
+        offset=task.offset + task.start * itemsize,
+        shape=(task.stop - task.start,),
+    )
+    return sample_moments(data)
+
+
+def parallel_moments(
+    paths: Sequence[str | Path],
+    dtype: np.dtype | str | None = None,
+    max_workers: int | None = None,
+    task_size: int = TASK_SIZE,
+) -> Moments:
+    """
+    Computes count, mean and M2 of the concatenation of all the shards, using a process pool.
+    :param max_workers: Number of worker processes. Defaults to the number of CPUs. With 1 the work is done in-process.
+    """
+    tasks = plan_slices(paths, dtype=dtype, task_size=task_size)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(tasks))
+    if max_workers <= 1:
+        partial = [slice_moments(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            partial = list(executor.map(slice_moments, tasks))
+    if len(partial) == 0:
+        return 0, float("nan"), float("nan")
+    moments = np.asarray(partial, dtype=np.float64)
+    return combine_moments(moments[:, 0], moments[:, 1], moments[:, 2])
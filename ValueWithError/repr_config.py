@@ -1,8 +1,9 @@
 import warnings
 from math import log, ceil, isinf, isnan
+from typing import Sequence
 
 import numpy as np
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ValueWithErrorRepresentationConfig(BaseModel):
@@ -32,6 +33,7 @@ class ValueWithErrorRepresentationConfig(BaseModel):
         default=1e16,
         description="Threshold for considering a value as infinity. Values larger than this will be represented as '∞'.",
     )
+    model_config = ConfigDict(defer_build=True)
 
     # __init__ is redundant, but needed to get PyCharm completion (as of May 2025)
     def __init__(
@@ -63,6 +65,15 @@ def default_value_with_error_repr_config() -> ValueWithErrorRepresentationConfig
     return ValueWithErrorRepresentationConfig()
 
 
+def default_table_repr_config() -> ValueWithErrorRepresentationConfig:
+    """The config of the tables, whose values are aligned by padding them to the shared precision."""
+    return ValueWithErrorRepresentationConfig(
+        pad_raw_value_with_zeros=True,
+        significant_digit_bare=2,
+        detect_integers=False,
+    )
+
+
 def absolute_rounding_digit(
     signif_digit_position: int,
     value_is_SE_or_SD: bool,
@@ -139,7 +150,7 @@ def round_to_string(
     add_minus = "–" if value < 0 else ""
     if pad_with_zeroes:
         return add_minus + format(rvalue, "." + str(absolute_digit_pos) + "f")
-    return add_minus + str(round(value, absolute_digit_pos))
+    return add_minus + str(rvalue)
 
 
 def suggested_precision_digit_pos_for_SE(
@@ -251,3 +262,286 @@ def CI_repr(
     )
 
     return f"({round_lower_txt}, {round_upper_txt})"
+
+
+def level_txt(level: float) -> str:
+    if 1 - level < 0.01:
+        return f"{round(level * 1000) / 10}"
+    return f"{round(level * 100)}"
+
+
+# Vectorized counterparts of the functions above. They give exactly the same strings as the scalar
+# versions, but all the decisions (digit positions, integer detection, inf/NaN handling, padding)
+# are computed for the whole array at once. Only the final conversion to text is done per element,
+# with a single format specification per group of elements that share the digit position.
+# Positions that the scalar functions report as None are NaN in the arrays.
+
+
+def digit_positions(values: np.ndarray) -> np.ndarray:
+    """Vectorized digit_position."""
+    values = np.asarray(values, dtype=np.float64)
+    ans = np.zeros(values.shape, dtype=np.int64)
+    ok = np.isfinite(values) & ~np.isclose(values, 0)
+    absolute = np.abs(values[ok])
+    # The same formula as math.log(x, 10), so that the exact powers of 10 are rounded the same way.
+    with np.errstate(divide="ignore"):
+        logs = np.log(absolute) / np.log(10.0)
+    near_integer = np.abs(logs - np.round(logs)) < 1e-9
+    if np.any(near_integer):
+        logs[near_integer] = [log(x, 10) for x in absolute[near_integer].tolist()]
+    ans[ok] = np.ceil(-logs)
+    return ans
+
+
+def suggested_precision_digit_pos_array(
+    values: np.ndarray,
+    config: ValueWithErrorRepresentationConfig,
+    value_is_SE_or_SD: bool,
+) -> np.ndarray:
+    """Vectorized suggested_precision_digit_pos."""
+    values = np.asarray(values, dtype=np.float64)
+    ans = (
+        digit_positions(values)
+        + (
+            config.significant_digit_se
+            if value_is_SE_or_SD
+            else config.significant_digit_bare
+        )
+        - 1
+    ).astype(np.float64)
+    ans[np.abs(values) > config.inf_threshold] = np.nan
+    return ans
+
+
+def _valid_errors(errors: np.ndarray | None, shape: tuple[int, ...]) -> np.ndarray:
+    """Mask of the errors that are shown, i.e. not missing, NaN, infinite or zero."""
+    if errors is None:
+        return np.zeros(shape, dtype=bool)
+    return np.isfinite(errors) & ~np.isclose(errors, 0)
+
+
+def suggested_precision_digit_pos_for_SE_array(
+    means: np.ndarray,
+    SEs: np.ndarray | None,
+    config: ValueWithErrorRepresentationConfig,
+) -> np.ndarray:
+    """Vectorized suggested_precision_digit_pos_for_SE. Missing SEs are given as NaN."""
+    means = np.asarray(means, dtype=np.float64)
+    has_SE = _valid_errors(SEs, means.shape)
+    ans = suggested_precision_digit_pos_array(means, config, False)
+    if np.any(has_SE):
+        ans[has_SE] = (
+            digit_positions(np.asarray(SEs)[has_SE]) + config.significant_digit_se - 1
+        )
+    return ans
+
+
+def suggested_precision_digit_pos_for_CI_array(
+    lowers: np.ndarray, uppers: np.ndarray, config: ValueWithErrorRepresentationConfig
+) -> np.ndarray:
+    """Vectorized suggested_precision_digit_pos_for_CI."""
+    lowers = np.asarray(lowers, dtype=np.float64)
+    uppers = np.asarray(uppers, dtype=np.float64)
+    with np.errstate(invalid="ignore"):
+        widths = uppers - lowers
+    ans = (digit_positions(widths) + config.significant_digit_se - 1).astype(np.float64)
+    degenerate = ~np.isfinite(widths) | np.isclose(widths, 0)
+    if np.any(degenerate):
+        candidates = np.stack(
+            [
+                suggested_precision_digit_pos_array(lowers[degenerate], config, False),
+                suggested_precision_digit_pos_array(uppers[degenerate], config, False),
+            ]
+        )
+        candidates[~np.isfinite(np.stack([lowers[degenerate], uppers[degenerate]]))] = (
+            np.nan
+        )
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            best = np.nanmax(candidates, axis=0)
+        ans[degenerate] = np.where(np.isnan(best), 0, best)
+    return ans
+
+
+def _format_group(values: np.ndarray, spec: str) -> list[str]:
+    return [format(x, spec) for x in values.tolist()]
+
+
+def round_to_strings(
+    values: np.ndarray,
+    absolute_digit_pos: int | np.ndarray,
+    pad_with_zeroes: bool | np.ndarray,
+    detect_integers: bool | np.ndarray,
+    inf_threshold: float,
+) -> list[str]:
+    """
+    Vectorized round_to_string. All the parameters except inf_threshold can be given per element.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    shape = values.shape
+    positions = np.broadcast_to(np.asarray(absolute_digit_pos, dtype=np.int64), shape)
+    pad = np.broadcast_to(np.asarray(pad_with_zeroes, dtype=bool), shape)
+    detect = np.broadcast_to(np.asarray(detect_integers, dtype=bool), shape)
+    ans = np.empty(shape, dtype=object)
+
+    with np.errstate(invalid="ignore"):
+        infinite = np.isinf(values) | (np.abs(values) > inf_threshold)
+    ans[infinite & (values > 0)] = "∞"
+    ans[infinite & ~(values > 0)] = "–∞"
+    todo = ~infinite
+    nan = todo & np.isnan(values)
+    ans[nan] = "NaN"
+    todo &= ~nan
+
+    # Rounding to the left of the decimal point. Python's round gives the exact half-to-even rounding.
+    integer_rounding = todo & (positions <= 0)
+    for position in np.unique(positions[integer_rounding]).tolist():
+        mask = integer_rounding & (positions == position)
+        ans[mask] = [str(int(round(x, position))) for x in values[mask].tolist()]
+    todo &= ~integer_rounding
+
+    minus = np.where(values < 0, "–", "")
+    absolute = np.abs(values)
+    integers = todo & detect & np.isclose(values, np.rint(values))
+    if np.any(integers):
+        ans[integers] = [
+            sign + str(x)
+            for sign, x in zip(
+                minus[integers].tolist(),
+                np.rint(absolute[integers]).astype(np.int64).tolist(),
+            )
+        ]
+    todo &= ~integers
+
+    # str() of a float switches to the scientific notation or drops digits outside this range,
+    # so those rare cases are left to the scalar formula.
+    with np.errstate(divide="ignore"):
+        int_digits = np.maximum(np.floor(np.log10(absolute)) + 1, 1)
+    exotic = todo & ~pad & ((absolute < 1e-4) | (int_digits + positions > 15))
+    for i in np.flatnonzero(exotic).tolist():
+        ans[i] = minus[i] + str(round(float(absolute[i]), int(positions[i])))
+    todo &= ~exotic
+
+    for position in np.unique(positions[todo]).tolist():
+        spec = "." + str(position) + "f"
+        for padded in (True, False):
+            mask = todo & (positions == position) & (pad == padded)
+            if not np.any(mask):
+                continue
+            texts = _format_group(absolute[mask], spec)
+            if not padded:
+                # The shortest representation, as str() gives, but at least one digit after the decimal point.
+                texts = [text.rstrip("0") for text in texts]
+                texts = [text + "0" if text.endswith(".") else text for text in texts]
+            ans[mask] = [sign + text for sign, text in zip(minus[mask].tolist(), texts)]
+    return ans.tolist()
+
+
+def repr_values_with_errors(
+    means: np.ndarray | Sequence[float],
+    SEs: np.ndarray | Sequence[float] | None,
+    config: ValueWithErrorRepresentationConfig,
+    absolute_digit_pos: int | np.ndarray | None = None,
+) -> list[str]:
+    """
+    Vectorized repr_value_with_error. Missing SEs are given as NaN.
+    :param absolute_digit_pos: Shared or per-element precision. If None, each element gets its own suggested precision.
+    """
+    means = np.asarray(means, dtype=np.float64)
+    if SEs is not None:
+        SEs = np.asarray(SEs, dtype=np.float64)
+    if absolute_digit_pos is None:
+        positions = suggested_precision_digit_pos_for_SE_array(means, SEs, config)
+        absolute_digit_pos = np.where(
+            np.isnan(positions), config.significant_digit_bare - 1, positions
+        ).astype(np.int64)
+    has_SE = _valid_errors(SEs, means.shape)
+
+    ans = np.asarray(
+        round_to_strings(
+            means,
+            absolute_digit_pos,
+            config.pad_raw_value_with_zeros | has_SE,
+            config.detect_integers & ~has_SE,
+            config.inf_threshold,
+        ),
+        dtype=object,
+    )
+    show_SE = has_SE & ~np.isnan(means) & ~np.isinf(means)
+    if (
+        SEs is not None
+        and config.show_se
+        and not config.show_ci_as_plusminus
+        and np.any(show_SE)
+    ):
+        positions = np.broadcast_to(np.asarray(absolute_digit_pos), means.shape)
+        SE_texts = round_to_strings(
+            SEs[show_SE], positions[show_SE], True, False, config.inf_threshold
+        )
+        ans[show_SE] = [
+            f"{value} ± {SE}" for value, SE in zip(ans[show_SE].tolist(), SE_texts)
+        ]
+    return ans.tolist()
+
+
+def CI_reprs(
+    lowers: np.ndarray | Sequence[float],
+    uppers: np.ndarray | Sequence[float],
+    config: ValueWithErrorRepresentationConfig,
+    absolute_digit_pos: int | np.ndarray | None = None,
+    level: float | None = None,
+) -> list[str]:
+    """
+    Vectorized CI_repr.
+    :param absolute_digit_pos: Shared or per-element precision. If None, each CI gets its own suggested precision.
+    :param level: If given, each CI is prefixed with its level, as in the CI classes' pretty_repr.
+    """
+    lowers = np.asarray(lowers, dtype=np.float64)
+    uppers = np.asarray(uppers, dtype=np.float64)
+    if absolute_digit_pos is None:
+        absolute_digit_pos = suggested_precision_digit_pos_for_CI_array(
+            lowers, uppers, config
+        ).astype(np.int64)
+    lower_texts = round_to_strings(
+        lowers,
+        absolute_digit_pos,
+        config.pad_raw_value_with_zeros,
+        False,
+        config.inf_threshold,
+    )
+    upper_texts = round_to_strings(
+        uppers,
+        absolute_digit_pos,
+        config.pad_raw_value_with_zeros,
+        False,
+        config.inf_threshold,
+    )
+    prefix = "" if level is None else f"CI_{level_txt(level)}%: "
+    return [
+        f"{prefix}({lower}, {upper})" for lower, upper in zip(lower_texts, upper_texts)
+    ]
+
+
+def shared_precision_digit_pos(precisions: np.ndarray, quantile: float = 0.8) -> int:
+    """
+    The precision used throughout a table: a quantile of the suggested precisions of its elements.
+    NaN precisions (i.e. the elements with no suggestion) are ignored.
+    """
+    precisions = np.sort(precisions[~np.isnan(precisions)])
+    if len(precisions) == 0:
+        return 0
+    return int(precisions[int(len(precisions) * quantile)])
+
+
+def repr_table(
+    values: np.ndarray,
+    errors: np.ndarray,
+    config: ValueWithErrorRepresentationConfig,
+    absolute_precision_digit: int | None = None,
+) -> list[str]:
+    """Formats the values with errors (NaN for missing) with a shared precision."""
+    if absolute_precision_digit is None:
+        absolute_precision_digit = shared_precision_digit_pos(
+            suggested_precision_digit_pos_for_SE_array(values, errors, config)
+        )
+    return repr_values_with_errors(values, errors, config, absolute_precision_digit)
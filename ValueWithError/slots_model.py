@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from functools import cache
+from numbers import Integral
+from typing import Any, ClassVar, TypeVar
+
+from pydantic import GetCoreSchemaHandler, TypeAdapter
+from pydantic_core import CoreSchema, core_schema
+
+S = TypeVar("S", bound="SlotsModel")
+
+
+@cache
+def _type_adapter(cls: type) -> TypeAdapter:
+    return TypeAdapter(cls)
+
+
+class SlotsModel:
+    """
+    Base of the immutable scalar types, which are plain `__slots__` objects rather than pydantic models.
+
+    A pydantic model carries a `__dict__`, a set of the fields set and the other per-instance bookkeeping,
+    so it takes several times the memory of the few floats it holds. These objects take only their slots.
+    Pydantic sees them through `__get_pydantic_core_schema__`, so they validate and serialize exactly as
+    the models did (also as fields of other models), and the `model_*` methods of pydantic models are
+    provided through a cached `TypeAdapter`.
+
+    Subclasses list their fields in `_fields` (attribute name -> serialized name), describe them in
+    `_fields_schema`, and provide `_from_trusted` that takes the field values in the same order. Subclasses
+    that set `kind_` are serialized with it as the "kind" tag, which is optional on input.
+    """
+
+    __slots__ = ()
+    _fields: ClassVar[dict[str, str]] = {}
+    # Tag of the type in the serialized form (the "kind" key), which discriminates the unions of the types
+    kind_: ClassVar[str | None] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # A missing override would otherwise only fail at the first validation or construction.
+        if cls._fields:
+            for name in ("_fields_schema", "_from_trusted"):
+                if getattr(cls, name).__func__ is getattr(SlotsModel, name).__func__:
+                    raise TypeError(f"{cls.__name__} with fields must define {name}")
+
+    @classmethod
+    def _fields_schema(
+        cls, handler: GetCoreSchemaHandler
+    ) -> dict[str, core_schema.TypedDictField]:
+        """Schemas of the fields, keyed by their serialized names."""
+        raise NotImplementedError
+
+    @classmethod
+    def _from_trusted(cls: type[S], *values: Any) -> S:
+        raise NotImplementedError
+
+    @classmethod
+    def _from_fields(cls: type[S], fields: dict[str, Any]) -> S:
+        return cls._from_trusted(*(fields[alias] for alias in cls._fields.values()))
+
+    def _to_fields(self) -> dict[str, Any]:
+        ans = {} if self.kind_ is None else {"kind": self.kind_}
+        for name, alias in self._fields.items():
+            ans[alias] = getattr(self, name)
+        return ans
+
+    def _values(self) -> tuple:
+        return tuple(getattr(self, name) for name in self._fields)
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source: Any, handler: GetCoreSchemaHandler
+    ) -> CoreSchema:
+        fields = cls._fields_schema(handler)
+        if cls.kind_ is not None:
+            fields = {
+                "kind": core_schema.typed_dict_field(
+                    core_schema.literal_schema([cls.kind_]), required=False
+                ),
+                **fields,
+            }
+        fields_schema = core_schema.typed_dict_schema(fields)
+        from_fields = core_schema.no_info_after_validator_function(
+            cls._from_fields, fields_schema
+        )
+        return core_schema.json_or_python_schema(
+            json_schema=from_fields,
+            python_schema=core_schema.union_schema(
+                [core_schema.is_instance_schema(cls), from_fields]
+            ),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                cls._to_fields, return_schema=fields_schema
+            ),
+        )
+
+    @classmethod
+    def model_validate(cls: type[S], obj: Any, **kwargs) -> S:
+        return _type_adapter(cls).validate_python(obj, **kwargs)
+
+    @classmethod
+    def model_validate_json(cls: type[S], json_data: str | bytes, **kwargs) -> S:
+        return _type_adapter(cls).validate_json(json_data, **kwargs)
+
+    def model_dump(self, **kwargs) -> dict[str, Any]:
+        return _type_adapter(type(self)).dump_python(self, **kwargs)
+
+    def model_dump_json(self, **kwargs) -> str:
+        return _type_adapter(type(self)).dump_json(self, **kwargs).decode()
+
+    def model_copy(
+        self: S, update: dict[str, Any] | None = None, deep: bool = False
+    ) -> S:
+        """The objects are immutable, so a copy is only needed to change some fields."""
+        if not update:
+            return self
+        fields = {name: getattr(self, name) for name in self._fields}
+        fields.update(update)
+        return type(self)._from_trusted(*fields.values())
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __copy__(self: S) -> S:
+        return self
+
+    def __deepcopy__(self: S, memo: dict) -> S:
+        return self
+
+    def __reduce__(self):
+        return type(self)._from_trusted, self._values()
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._values() == other._values()  # type: ignore[attr-defined]
+
+    def __hash__(self) -> int:
+        return hash(self._values())
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({fields})"
+
+
+def checked_float(name: str, value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"{name} must be a number, got {value!r}") from e
+
+
+def checked_non_negative(name: str, value: Any) -> float:
+    ans = checked_float(name, value)
+    if not ans >= 0:
+        raise ValueError(f"{name} must be non-negative, got {value!r}")
+    return ans
+
+
+def checked_count(name: str, value: Any) -> int | float:
+    """Non-negative count, kept as int if given as an integer."""
+    if isinstance(value, Integral) and not isinstance(value, bool):
+        if value < 0:
+            raise ValueError(f"{name} must be non-negative, got {value!r}")
+        return int(value)
+    return checked_non_negative(name, value)
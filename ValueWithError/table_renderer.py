@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import bisect
+from collections import Counter
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+
+from .repr_config import (
+    ValueWithErrorRepresentationConfig as Config,
+    default_table_repr_config,
+    repr_values_with_errors,
+    suggested_precision_digit_pos_for_SE_array,
+)
+
+# Number of rows rendered at once when the rows are iterated lazily.
+RENDER_BLOCK_SIZE = 1024
+
+
+class _PrecisionCounts:
+    """
+    Order-statistic multiset of the suggested precisions of the rows. The precisions are digit positions,
+    i.e. a few dozen distinct small integers at most, so they are kept as a histogram with its sorted keys,
+    and the k-th smallest is found without sorting all the rows.
+    """
+
+    def __init__(self):
+        self._counts: Counter[int] = Counter()
+        self._keys: list[int] = []
+        self.total = 0
+
+    def add(self, precisions: np.ndarray):
+        keys, counts = np.unique(precisions[~np.isnan(precisions)], return_counts=True)
+        for key, count in zip(keys.astype(np.int64).tolist(), counts.tolist()):
+            if key not in self._counts:
+                bisect.insort(self._keys, key)
+            self._counts[key] += count
+            self.total += count
+
+    def kth(self, k: int) -> int:
+        for key in self._keys:
+            k -= self._counts[key]
+            if k < 0:
+                return key
+        raise IndexError(k)
+
+
+class TableRenderer:
+    """
+    Text rows of a growing table of values with errors, formatted with a shared precision, as in
+    `VectorOfValuesWithError.table_repr`.
+
+    Rows are appended incrementally, and the shared precision (a quantile of the suggested precisions of
+    the rows) is updated from an order-statistic structure rather than recomputed from all the rows.
+    Rows are rendered lazily, when iterated, and the rendered text is cached with the precision it was
+    rendered with. When the shared precision changes, only the rows that were rendered with the old one are
+    stale, and they are re-rendered on the next access. `updates` yields just the rows that changed since its
+    last call, for the views that patch the displayed table instead of redrawing it.
+    """
+
+    def __init__(
+        self,
+        config: Config | None = None,
+        absolute_precision_digit: int | None = None,
+        quantile: float = 0.8,
+    ):
+        """
+        :param config: Representation config. Defaults to the one of `VectorOfValuesWithError.table_repr`.
+        :param absolute_precision_digit: Fixed shared precision. If None, it follows the rows.
+        :param quantile: Quantile of the suggested precisions of the rows that is used as the shared precision.
+        """
+        self.config = default_table_repr_config() if config is None else config
+        self.quantile = quantile
+        self._fixed_precision = absolute_precision_digit
+        self._counts = _PrecisionCounts()
+        self._values = np.empty(0)
+        self._errors = np.empty(0)
+        self._size = 0
+        self._texts: list[str | None] = []
+        # Precision each row was rendered with, and the one it was last reported by `updates` with
+        self._rendered_with = np.empty(0, dtype=np.int64)
+        self._reported_with = np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _reserve(self, size: int):
+        if size <= len(self._values):
+            return
+        capacity = max(size, 2 * len(self._values), 16)
+        self._values = np.resize(self._values, capacity)
+        self._errors = np.resize(self._errors, capacity)
+        # No precision is a digit position this far off, so the new rows count as not rendered.
+        unset = np.iinfo(np.int64).min
+        for name in ("_rendered_with", "_reported_with"):
+            grown = np.full(capacity, unset, dtype=np.int64)
+            grown[: self._size] = getattr(self, name)[: self._size]
+            setattr(self, name, grown)
+
+    def extend_values(
+        self,
+        values: Sequence[float] | np.ndarray,
+        errors: Sequence[float] | np.ndarray | None = None,
+    ):
+        """Appends rows given as values and errors (NaN for the values without error)."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if errors is None:
+            errors = np.full(len(values), np.nan)
+        errors = np.asarray(errors, dtype=np.float64).ravel()
+        if errors.shape != values.shape:
+            raise ValueError("values and errors must have the same length")
+        start, stop = self._size, self._size + len(values)
+        self._reserve(stop)
+        self._values[start:stop] = values
+        self._errors[start:stop] = errors
+        self._texts.extend([None] * len(values))
+        self._size = stop
+        if self._fixed_precision is None:
+            self._counts.add(
+                suggested_precision_digit_pos_for_SE_array(values, errors, self.config)
+            )
+
+    def extend(self, items: Iterable):
+        """Appends rows given as ValueWithError objects (or their implementations) or plain numbers."""
+        # Imported here, as the vector module imports all the models, which the renderer does not need.
+        from .VectorOfValuesWithError import values_and_errors
+
+        values, errors = values_and_errors(list(items), self.config)
+        self.extend_values(values, errors)
+
+    def append(self, item):
+        self.extend([item])
+
+    @property
+    def precision(self) -> int:
+        """The shared precision (absolute digit position) the rows are currently rendered with."""
+        if self._fixed_precision is not None:
+            return self._fixed_precision
+        counts = self._counts
+        if counts.total == 0:
+            return 0
+        return counts.kth(int(counts.total * self.quantile))
+
+    def _render(self, indices: np.ndarray, precision: int):
+        """Renders the rows among the indices that were not rendered with the precision yet."""
+        stale = indices[self._rendered_with[indices] != precision]
+        if len(stale) == 0:
+            return
+        texts = repr_values_with_errors(
+            self._values[stale], self._errors[stale], self.config, precision
+        )
+        for i, text in zip(stale.tolist(), texts):
+            self._texts[i] = text
+        self._rendered_with[stale] = precision
+
+    def rows(self, start: int = 0, stop: int | None = None) -> Iterator[str]:
+        """
+        Lazily yields the rows of the range, rendering them block by block as they are consumed.
+        By default, the range is all the rows present when the iteration starts.
+        """
+        stop = self._size if stop is None else min(stop, self._size)
+        for block_start in range(start, stop, RENDER_BLOCK_SIZE):
+            block_stop = min(block_start + RENDER_BLOCK_SIZE, stop)
+            self._render(np.arange(block_start, block_stop), self.precision)
+            yield from self._texts[block_start:block_stop]  # type: ignore[misc]
+
+    def __iter__(self) -> Iterator[str]:
+        return self.rows()
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        self._render(np.asarray([index]), self.precision)
+        return self._texts[index]  # type: ignore[return-value]
+
+    def render(self) -> list[str]:
+        """All the rows, the same as `VectorOfValuesWithError.table_repr` of the same items."""
+        return list(self.rows())
+
+    def updates(self) -> Iterator[tuple[int, str]]:
+        """
+        Yields (index, text) of the rows that are new or changed since the previous call: the appended rows
+        and, if the shared precision has changed, all the rows reported with the previous one.
+        """
+        precision = self.precision
+        changed = np.flatnonzero(self._reported_with[: self._size] != precision)
+        for block_start in range(0, len(changed), RENDER_BLOCK_SIZE):
+            block = changed[block_start : block_start + RENDER_BLOCK_SIZE]
+            self._render(block, precision)
+            for i in block.tolist():
+                text = self._texts[i]
+                self._reported_with[i] = precision
+                yield i, text  # type: ignore[misc]
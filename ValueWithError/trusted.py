@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+
+M = TypeVar("M", bound=BaseModel)
+
+_object_setattr = object.__setattr__
+
+
+def construct_trusted(cls: type[M], fields: dict[str, Any]) -> M:
+    """
+    Builds the model from field values that are already valid, bypassing pydantic validation.
+
+    Used for the results computed by the library itself, which are valid by construction; external input
+    is always validated. It is leaner than `model_construct`, which resolves aliases and defaults in Python
+    and ends up slower than the validation itself.
+    :param fields: Values of all the fields, keyed by the field names (not the aliases).
+    """
+    ans = cls.__new__(cls)
+    _object_setattr(ans, "__dict__", fields)
+    _object_setattr(ans, "__pydantic_fields_set__", set(fields))
+    _object_setattr(ans, "__pydantic_extra__", None)
+    _object_setattr(ans, "__pydantic_private__", None)
+    return ans
@@ -0,0 +1,43 @@
+"""
+Import-time benchmark. Each scenario runs in a fresh interpreter, so that nothing is cached in `sys.modules`.
+
+    python benchmarks/bench_import.py [--repeat 7]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+SCENARIOS = {
+    "python (baseline)": "pass",
+    "import ValueWithError": "import ValueWithError",
+    "first normal CI": "import ValueWithError as V; V.make_ValueWithError(1.0, 0.1).get_CI(0.9)",
+    "first Student CI": "import ValueWithError as V; V.make_ValueWithError(1.0, 0.1, N=5).get_CI(0.9)",
+    "everything (eager)": "from ValueWithError import *; import scipy.stats",
+}
+
+
+def time_scenario(code: str, repeat: int) -> float:
+    """Median wall time of the whole interpreter run, in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+    for name, code in SCENARIOS.items():
+        print(f"{name:<24} {time_scenario(code, args.repeat) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""
+The benchmarked operations. Each case is a factory that prepares the data (not timed) and returns
+the zero-argument callable that is timed.
+"""
+
+from __future__ import annotations
+
+from typing import Callable
+
+import numpy as np
+from pydantic import TypeAdapter
+
+from ValueWithError import (
+    TableRenderer,
+    ValueWithError,
+    ValueWithErrorArray,
+    ValueWithErrorRepresentationConfig,
+    VectorOfValuesWithError,
+    bootstrap,
+    from_samples,
+    make_ValueWithError,
+    propagate,
+)
+from ValueWithError.ImplSampleValueWithError import ImplSampleValueWithError
+from ValueWithError.pydantic_numpy import NDARRAY_ENCODING
+
+CASES: dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+def case(name: str):
+    def register(factory: Callable[[], Callable[[], object]]):
+        CASES[name] = factory
+        return factory
+
+    return register
+
+
+def _random(size: int) -> np.ndarray:
+    return np.random.default_rng(123).normal(100, 5, size)
+
+
+def _estimates() -> dict[str, ValueWithError]:
+    return {
+        "value": make_ValueWithError(100.0),
+        "normal": make_ValueWithError(100.0, 1.5),
+        "student": make_ValueWithError(100.0, 1.5, 30),
+    }
+
+
+# Construction
+
+for _kind, _args in {
+    "value": (100.0,),
+    "normal": (100.0, 1.5),
+    "student": (100.0, 1.5, 30),
+}.items():
+    case(f"construct/make_ValueWithError/{_kind}")(
+        lambda args=_args: lambda: make_ValueWithError(*args)
+    )
+
+for _size in (1_000, 100_000, 1_000_000):
+
+    @case(f"construct/from_samples/{_size}")
+    def _(size=_size):
+        sample = _random(size)
+        return lambda: from_samples(sample)
+
+
+for _dtype in ("float64", "float32"):
+
+    @case(f"construct/sample_and_CI95/{_dtype}/1000000")
+    def _(dtype=_dtype):
+        sample = _random(1_000_000)
+        return lambda: ImplSampleValueWithError(sample=sample, dtype=dtype).CI95
+
+
+# Arithmetic
+
+
+for _kind in ("value", "normal", "student"):
+
+    @case(f"arithmetic/chain_100/{_kind}")
+    def _(kind=_kind):
+        x = _estimates()[kind]
+        offset = make_ValueWithError(1.0) if kind == "student" else x
+
+        def chain():
+            y = x
+            for _ in range(100):
+                y = -(y * 1.01 + offset)
+            return y
+
+        return chain
+
+
+@case("arithmetic/sample_affine_and_normal/1000000")
+def _():
+    x = from_samples(_random(1_000_000))
+    normal = make_ValueWithError(1.0, 0.1)
+    return lambda: -(x * 2 + 1) * normal
+
+
+@case("arithmetic/bootstrap_mean/200_of_100000")
+def _():
+    x = _random(100_000)
+    return lambda: bootstrap(x, n_resamples=200, seed=1, max_workers=1)
+
+
+for _derivative in ("analytic", "numeric"):
+
+    @case(f"arithmetic/propagate_ratio/{_derivative}/1000000")
+    def _(derivative=_derivative):
+        rng = np.random.default_rng(123)
+        x, y = (
+            ValueWithErrorArray(
+                value=rng.uniform(1, 10, 1_000_000), SE=rng.uniform(0, 1, 1_000_000)
+            )
+            for _ in range(2)
+        )
+        func = np.divide if derivative == "analytic" else (lambda u, v: u / v)
+        return lambda: propagate(func, x, y)
+
+
+# Confidence intervals
+
+for _kind in ("normal", "student"):
+    for _level in (0.95, 0.9, 0.99, 0.9123):
+
+        @case(f"ci/get_CI/{_kind}/{_level}")
+        def _(kind=_kind, level=_level):
+            x = _estimates()[kind]
+            return lambda: x.get_CI(level)
+
+
+for _level in (0.95, 0.9123):
+
+    @case(f"ci/get_CI/sample_100000/{_level}")
+    def _(level=_level):
+        x = from_samples(_random(100_000))
+        return lambda: x.get_CI(level)
+
+
+_LEVELS = np.linspace(0.5, 0.99, 20)
+
+for _method in ("get_CI", "get_CIs"):
+
+    @case(f"ci/{_method}/sample_100000/20_levels")
+    def _(method=_method):
+        x = from_samples(_random(100_000))
+        if method == "get_CI":
+            return lambda: [x.get_CI(level) for level in _LEVELS]
+        return lambda: x.get_CIs(_LEVELS)
+
+
+for _index in ("selected", "indexed"):
+
+    @case(f"ci/get_CI/sample_100000/12_levels/{_index}")
+    def _(index=_index):
+        x = from_samples(_random(100_000), index_order_statistics=index == "indexed")
+        levels = np.linspace(0.5, 0.99, 12)
+        return lambda: [x.get_CI(level) for level in levels]
+
+
+@case("ci/get_CIs/array_100000/20_levels")
+def _():
+    rng = np.random.default_rng(123)
+    x = ValueWithErrorArray(
+        value=rng.normal(size=100_000),
+        SE=rng.uniform(0, 1, 100_000),
+        N=rng.integers(2, 50, 100_000).astype(np.float64),
+    )
+    return lambda: x.get_CIs(_LEVELS)
+
+
+# Text representation
+
+for _kind in ("value", "normal", "student"):
+
+    @case(f"repr/pretty_repr/{_kind}")
+    def _(kind=_kind):
+        x = _estimates()[kind]
+        config = ValueWithErrorRepresentationConfig()
+        return lambda: x.pretty_repr(config)
+
+
+for _size in (100, 10_000):
+
+    @case(f"repr/table_repr/{_size}")
+    def _(size=_size):
+        rng = np.random.default_rng(123)
+        values = rng.normal(100, 50, size)
+        SEs = rng.lognormal(0, 2, size)
+        vector = VectorOfValuesWithError(
+            [make_ValueWithError(v, se).obj for v, se in zip(values, SEs)]  # type: ignore[misc]
+        )
+        return vector.table_repr
+
+
+@case("repr/table_renderer/append_to_10000")
+def _():
+    rng = np.random.default_rng(123)
+    values = rng.normal(100, 50, 10_000)
+    SEs = rng.lognormal(0, 2, 10_000)
+    renderer = TableRenderer()
+    renderer.extend_values(values, SEs)
+    list(renderer.updates())
+
+    def append():
+        renderer.extend_values([rng.normal(100, 50)], [rng.lognormal(0, 2)])
+        return list(renderer.updates())
+
+    return append
+
+
+# Serialization
+
+for _size in (1_000, 100_000):
+    for _encoding in ("list", "base64"):
+
+        @case(f"json/sample_round_trip/{_encoding}/{_size}")
+        def _(size=_size, encoding=_encoding):
+            x = from_samples(_random(size))
+            context = {NDARRAY_ENCODING: encoding}
+            return lambda: ValueWithError.model_validate_json(
+                x.model_dump_json(context=context)
+            )
+
+
+for _layout in ("items", "columnar"):
+
+    @case(f"json/vector_round_trip/{_layout}/100000")
+    def _(layout=_layout):
+        rng = np.random.default_rng(123)
+        vector = ValueWithErrorArray(
+            value=rng.normal(100, 50, 100_000), SE=rng.lognormal(0, 2, 100_000)
+        ).to_vector()
+        if layout == "items":
+            return lambda: VectorOfValuesWithError.model_validate_json(
+                vector.model_dump_json()
+            )
+        return lambda: VectorOfValuesWithError.from_columnar_json(
+            vector.to_columnar_json()
+        )
+
+
+for _tagging in ("tagged", "legacy"):
+
+    @case(f"json/estimates_load/{_tagging}/100000")
+    def _(tagging=_tagging):
+        adapter = TypeAdapter(list[ValueWithError])
+        estimates = [make_ValueWithError(float(i), 0.5, 10) for i in range(100_000)]
+        data = adapter.dump_json(estimates)
+        if tagging == "legacy":
+            data = data.replace(b'"kind":"student",', b"")
+        return lambda: adapter.validate_json(data)
@@ -0,0 +1,127 @@
+"""
+Runs the benchmark suite and reports the time per call and the peak memory allocated by a single call.
+
+    python -m benchmarks.run [-k construct] [--save baseline.json] [--compare baseline.json]
+
+With `--compare`, cases that got slower than the baseline by more than the threshold are flagged,
+and the exit status is 1 if there are any.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from .cases import CASES
+
+
+def measure_time(func: Callable[[], object], repeat: int, min_time: float) -> float:
+    """The best time per call, in seconds, out of `repeat` runs of at least `min_time` each."""
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    number = max(number, int(number * min_time / max(elapsed, 1e-9)), 1)
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def measure_peak_memory(func: Callable[[], object]) -> int:
+    """Peak of the memory allocated through Python (numpy included) during a single call, in bytes."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:7.2f} {unit}"
+    return f"{seconds / 1e-9:7.1f} ns"
+
+
+def format_memory(size: float) -> str:
+    for unit, scale in (("MB", 1 << 20), ("KB", 1 << 10)):
+        if size >= scale:
+            return f"{size / scale:7.1f} {unit}"
+    return f"{size:7.0f} B"
+
+
+def run(
+    selected: list[str],
+    repeat: int,
+    min_time: float,
+    baseline: dict | None,
+    threshold: float,
+) -> tuple[dict, list[str]]:
+    results = {}
+    regressions = []
+    width = max(len(name) for name in selected)
+    for name in selected:
+        func = CASES[name]()
+        func()  # warm-up: lazy imports, schema building, caches
+        result = {
+            "time": measure_time(func, repeat, min_time),
+            "peak_memory": measure_peak_memory(func),
+        }
+        results[name] = result
+        line = f"{name:<{width}}  {format_time(result['time'])}  {format_memory(result['peak_memory'])}"
+        if baseline is not None and name in baseline:
+            ratio = result["time"] / baseline[name]["time"]
+            line += f"  {ratio:6.2f}x"
+            if ratio > 1 + threshold:
+                line += "  SLOWER"
+                regressions.append(name)
+        print(line, flush=True)
+    return results, regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "-k", "--filter", default="", help="Run only the cases containing this text"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.05,
+        help="Minimal duration of a single run, in seconds",
+    )
+    parser.add_argument("--save", type=Path, help="Store the results as a baseline")
+    parser.add_argument("--compare", type=Path, help="Compare with a stored baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Relative slowdown flagged by --compare",
+    )
+    args = parser.parse_args()
+
+    selected = [name for name in CASES if args.filter in name]
+    if not selected:
+        print(f"No benchmark matches {args.filter!r}", file=sys.stderr)
+        return 2
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    results, regressions = run(
+        selected, args.repeat, args.min_time, baseline, args.threshold
+    )
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2))
+    if regressions:
+        print(
+            f"\n{len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold:.0%}:"
+        )
+        for name in regressions:
+            print(f"  {name}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
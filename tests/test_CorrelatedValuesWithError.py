@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from ValueWithError import (
+    CorrelatedValuesWithError,
+    ValueWithError,
+    ValueWithErrorArray,
+)
+
+
+def make_covariance(n, bandwidth=None, seed=21):
+    rng = np.random.default_rng(seed)
+    L = rng.normal(size=(n, n))
+    covariance = L @ L.T
+    if bandwidth is not None:
+        covariance = np.triu(np.tril(covariance, bandwidth), -bandwidth)
+    return rng.normal(size=n), covariance
+
+
+def to_bands(covariance, bandwidth):
+    n = len(covariance)
+    bands = np.zeros((bandwidth + 1, n))
+    for k in range(bandwidth + 1):
+        bands[k, : n - k] = np.diag(covariance, k)
+    return bands
+
+
+@pytest.mark.parametrize("banded", [False, True])
+def test_linear_transforms(banded):
+    value, covariance = make_covariance(30, bandwidth=2 if banded else None)
+    if banded:
+        x = CorrelatedValuesWithError.from_bands(value, to_bands(covariance, 2))
+        assert x.bandwidth == 2
+    else:
+        x = CorrelatedValuesWithError(value, covariance)
+    assert np.allclose(x.covariance, covariance)
+
+    A = np.random.default_rng(1).normal(size=(4, 30))
+    y = A @ x
+    assert isinstance(y, CorrelatedValuesWithError)
+    assert np.allclose(y.value, A @ value)
+    assert np.allclose(y.covariance, A @ covariance @ A.T)
+
+    w = A[0]
+    total = w @ x
+    assert isinstance(total, ValueWithError)
+    assert total.value == pytest.approx(w @ value)
+    assert total.SE == pytest.approx(np.sqrt(w @ covariance @ w))
+    assert x.sum().SE == pytest.approx(np.sqrt(covariance.sum()))
+    assert (x[3] - x[4]).value == pytest.approx(value[3] - value[4])
+    contrast = x.contrast(np.eye(30)[3] - np.eye(30)[4])
+    assert contrast.SE == pytest.approx(
+        np.sqrt(covariance[3, 3] + covariance[4, 4] - 2 * covariance[3, 4])
+    )
+
+    d = np.linspace(-2, 2, 30)
+    assert np.allclose((x * d).covariance, np.outer(d, d) * covariance)
+    assert np.allclose((2 * x + 1).covariance, 4 * covariance)
+    # The same scaling as the columnar array
+    assert np.allclose((2 * x).to_array().SE, (2 * x.to_array()).SE)
+    assert np.allclose((-x).value, -value)
+    assert np.allclose((x + x).covariance, 2 * covariance)
+
+
+def test_indexing():
+    value, covariance = make_covariance(10, bandwidth=1)
+    x = CorrelatedValuesWithError.from_bands(value, to_bands(covariance, 1))
+    item = x[2]
+    assert isinstance(item, ValueWithError)
+    assert item.value == value[2]
+    assert item.SE == pytest.approx(np.sqrt(covariance[2, 2]))
+    assert x[-1].value == value[-1]
+
+    part = x[3:7]
+    assert part.bandwidth == 1
+    assert np.allclose(part.covariance, covariance[3:7, 3:7])
+    picked = x[[0, 5, 9]]
+    assert np.allclose(picked.covariance, covariance[np.ix_([0, 5, 9], [0, 5, 9])])
+    assert [str(item) for item in x.to_array()] == [str(item) for item in x]
+
+
+def test_independent_and_sampled():
+    array = ValueWithErrorArray(value=[1.0, 2.0, 3.0], SE=[0.1, np.nan, 0.3])
+    x = CorrelatedValuesWithError.from_array(array)
+    assert x.sum().SE == pytest.approx(np.hypot(0.1, 0.3))
+
+    rng = np.random.default_rng(3)
+    draws = rng.multivariate_normal([0, 1], [[1, 0.9], [0.9, 1]], size=100_000)
+    x = CorrelatedValuesWithError.from_samples(draws)
+    assert x.correlation[0, 1] == pytest.approx(0.9, abs=0.01)
+    # The difference of strongly correlated estimates is much more precise than the independence implies
+    difference = x.contrast([1, -1])
+    assert difference.SE == pytest.approx(np.sqrt(0.2 / len(draws)), rel=0.02)
+
+
+def test_validation():
+    with pytest.raises(ValueError):
+        CorrelatedValuesWithError([1.0, 2.0], [[1.0, 0.5], [0.4, 1.0]])
+    with pytest.raises(ValueError):
+        CorrelatedValuesWithError([1.0, 2.0], [[-1.0, 0.0], [0.0, 1.0]])
+    with pytest.raises(ValueError):
+        CorrelatedValuesWithError.from_bands([1.0, 2.0], [[1.0, 1.0, 1.0]])
+    with pytest.raises(ValueError):
+        np.ones((2, 3)) @ CorrelatedValuesWithError([1.0, 2.0], np.eye(2))
+
+
+def test_bands_wider_than_the_vector():
+    value, covariance = make_covariance(3)
+    bands = np.vstack([to_bands(covariance, 2), np.full((3, 3), 99.0)])
+    x = CorrelatedValuesWithError.from_bands(value, bands)
+    assert x.bandwidth == 2
+    assert np.allclose(x.covariance, covariance)
+    assert np.allclose((x * 2).covariance, 4 * covariance)
+    assert np.allclose(
+        (x * np.arange(3.0)).covariance, covariance * np.outer([0, 1, 2], [0, 1, 2])
+    )
@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from ValueWithError import ValueWithError, from_frequencies, from_samples
+from ValueWithError.ImplCompactSampleValueWithError import (
+    ImplCompactSampleValueWithError,
+)
+from ValueWithError.ImplSampleValueWithError import ImplSampleValueWithError
+from ValueWithError.pydantic_numpy import NDARRAY_ENCODING
+
+
+def test_same_estimates_as_full_sample():
+    rng = np.random.default_rng(3)
+    full = ImplSampleValueWithError(sample=rng.lognormal(0, 1, 200_000))
+    compact = full.compact()
+
+    assert compact.N == full.N
+    assert compact.value == full.value
+    assert compact.SD == full.SD
+    assert compact.SE == full.SE
+    assert compact.student_estimate() == full.student_estimate()
+    # The CIs of the common levels are kept exactly
+    assert compact.CI95.lower == full.CI95.lower
+    assert compact.CI95.upper == full.CI95.upper
+    for level in [0.5, 0.9, 0.99]:
+        assert compact.get_CI(level).lower == full.get_CI(level).lower
+        assert compact.get_CI(level).upper == full.get_CI(level).upper
+        assert compact.CI_error_bound(level) == 0
+
+
+@pytest.mark.parametrize("level", [0.1234, 0.77, 0.9123, 0.9999])
+def test_CI_error_is_bounded(level):
+    rng = np.random.default_rng(4)
+    sample = rng.standard_cauchy(50_000)
+    compact = ImplCompactSampleValueWithError.from_sample(sample, grid_size=16)
+    expected = ImplSampleValueWithError(sample=sample).get_CI(level)
+    ans = compact.get_CI(level)
+    bound = compact.CI_error_bound(level)
+    assert bound > 0
+    assert abs(ans.lower - expected.lower) <= bound
+    assert abs(ans.upper - expected.upper) <= bound
+
+
+def test_from_frequencies():
+    rng = np.random.default_rng(5)
+    values = rng.normal(size=50)
+    counts = rng.integers(0, 1000, size=50)
+    expanded = np.repeat(values, counts)
+
+    ans = from_frequencies(values, counts)
+    full = ImplSampleValueWithError(sample=expanded)
+    assert ans.N == len(expanded)
+    assert ans.value == pytest.approx(full.value, rel=1e-13)
+    assert ans.SD == pytest.approx(full.SD, rel=1e-13)
+    assert ans.CI95.lower == full.CI95.lower
+    assert ans.get_CI(0.99).upper == full.get_CI(0.99).upper
+    assert np.array_equal(
+        ans.obj.quantiles_, np.quantile(expanded, ans.obj.probabilities_)
+    )
+
+    with pytest.raises(ValueError):
+        from_frequencies([1.0, 2.0], [0, 0])
+    with pytest.raises(ValueError):
+        from_frequencies([1.0, 2.0], [1, -1])
+    # Both the moments and the quantiles use the same whole counts
+    from_floats = from_frequencies(values, counts.astype(float))
+    assert (from_floats.N, from_floats.value, from_floats.SD) == (
+        ans.N,
+        ans.value,
+        ans.SD,
+    )
+    assert np.array_equal(from_floats.obj.quantiles_, ans.obj.quantiles_)
+    for fractional in ([1, 2.5], [1, np.nan], [1, np.inf]):
+        with pytest.raises(ValueError):
+            from_frequencies([1.0, 2.0], fractional)
+
+
+@pytest.mark.parametrize("encoding", ["list", "zlib"])
+def test_round_trip_is_compact(encoding):
+    sample = np.random.default_rng(6).normal(10, 2, 1_000_000)
+    ans = from_samples(sample, grid_size=64)
+    assert isinstance(ans.obj, ImplCompactSampleValueWithError)
+
+    json = ans.model_dump_json(context={NDARRAY_ENCODING: encoding})
+    assert len(json) < 5000
+    restored = ValueWithError.model_validate_json(json)
+    assert isinstance(restored.obj, ImplCompactSampleValueWithError)
+    assert str(restored) == str(ans)
+    assert restored.CI95.lower == ans.CI95.lower
+
+
+def test_validation():
+    with pytest.raises(ValueError):
+        ImplCompactSampleValueWithError.model_validate(
+            {"N": 10, "value": 0, "M2": 1, "probabilities": [0, 1], "quantiles": [1, 0]}
+        )
+    with pytest.raises(ValueError):
+        ImplCompactSampleValueWithError.model_validate(
+            {
+                "N": 10,
+                "value": 0,
+                "M2": 1,
+                "probabilities": [0, 0.5],
+                "quantiles": [0, 1],
+            }
+        )
+    with pytest.raises(ValueError):
+        from_samples(np.arange(10.0), grid_size=4) + 1
@@ -0,0 +1,289 @@
+import pickle
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from ValueWithError import (
+    CI_95,
+    from_samples,
+    make_ValueWithError,
+    make_ValueWithError_from_vector,
+    set_sample_dtype,
+)
+from ValueWithError.ImplSampleValueWithError import ImplSampleValueWithError
+from ValueWithError.moments import sample_moments
+from ValueWithError.pydantic_numpy import (
+    NDARRAY_ENCODING,
+    decode_ndarray,
+    encode_ndarray,
+)
+
+
+def test_cached_moments():
+    np.random.seed(123)
+    vec = np.random.normal(123456, 10, 1000)
+    obj = ImplSampleValueWithError(sample=vec)
+
+    assert obj.N == 1000
+    assert obj.value == pytest.approx(np.mean(vec), rel=1e-15)
+    assert obj.SD == pytest.approx(np.std(vec), rel=1e-12)
+    assert obj.SE == pytest.approx(np.std(vec) / np.sqrt(1000), rel=1e-12)
+
+    assert not obj.sample.flags.writeable
+    with pytest.raises(ValueError):
+        obj.sample[0] = 0.0
+
+
+def test_caller_cannot_change_the_sample():
+    x = np.array([1.0, 2.0, 3.0])
+    v = make_ValueWithError_from_vector(x)
+    x[:] = 100
+    assert v.value == 2.0
+    assert np.array_equal(v.sample, [1.0, 2.0, 3.0])  # type: ignore[arg-type]
+
+    frozen = np.array([1.0, 2.0, 3.0])
+    frozen.flags.writeable = False
+    assert make_ValueWithError_from_vector(frozen).sample is frozen
+
+
+def test_arithmetics_leave_the_other_sample_alone():
+    a, b = np.array([1.0, 2.0, 3.0]), np.array([10.0, 20.0, 30.0])
+    a.flags.writeable = b.flags.writeable = False
+    x, y = from_samples(a), from_samples(b)
+    assert np.array_equal((x + y).sample, [11.0, 22.0, 33.0])  # type: ignore[union-attr]
+    assert np.array_equal((x - y).sample, [-9.0, -18.0, -27.0])  # type: ignore[union-attr]
+    assert np.array_equal((x * y).sample, [10.0, 40.0, 90.0])  # type: ignore[union-attr]
+    assert np.array_equal(y.sample, [10.0, 20.0, 30.0])  # type: ignore[union-attr]
+    assert y.value == 20.0
+
+
+def test_chunked_moments_are_stable():
+    np.random.seed(123)
+    vec = np.random.normal(1e9, 1, 100_000)
+    count, mean, M2 = sample_moments(vec, chunk_size=1000)
+    assert count == 100_000
+    assert mean == pytest.approx(np.mean(vec), rel=1e-15)
+    assert M2 == pytest.approx(np.sum((vec - np.mean(vec)) ** 2), rel=1e-9)
+
+
+def test_moments_survive_serialization():
+    obj = ImplSampleValueWithError(sample=np.asarray([1.0, 2.0, 3.0, 4.0]))
+
+    restored = pickle.loads(pickle.dumps(obj))
+    assert restored.moments == obj.moments
+    assert not restored.sample.flags.writeable
+
+    restored = ImplSampleValueWithError.model_validate_json(obj.model_dump_json())
+    assert restored.moments == obj.moments
+    assert not restored.sample.flags.writeable
+
+    assert obj.model_copy().moments == obj.moments
+
+
+@pytest.mark.parametrize("encoding", ["list", "base64", "zlib"])
+def test_array_encodings(encoding):
+    np.random.seed(123)
+    obj = ImplSampleValueWithError(sample=np.random.normal(0, 1, 1000))
+
+    json = obj.model_dump_json(context={NDARRAY_ENCODING: encoding})
+    restored = ImplSampleValueWithError.model_validate_json(json)
+    assert np.array_equal(restored.sample, obj.sample)
+    assert restored.sample.dtype == obj.sample.dtype
+    assert restored.moments == obj.moments
+    assert not restored.sample.flags.writeable
+
+    restored = ImplSampleValueWithError.model_validate(
+        obj.model_dump(context={NDARRAY_ENCODING: encoding})
+    )
+    assert np.array_equal(restored.sample, obj.sample)
+
+
+def test_binary_encoding_keeps_dtype_and_shape():
+    sample = np.arange(12, dtype=np.float32).reshape(3, 4)
+    encoded = encode_ndarray(sample, compress=True)
+    assert encoded["dtype"] == "<f4"
+    decoded = decode_ndarray(encoded)
+    assert decoded.dtype == np.float32
+    assert np.array_equal(decoded, sample)
+
+    with pytest.raises(ValueError):
+        decode_ndarray(encoded | {"compression": "lzma"})
+
+    # The declared dtype and shape bound the decoded buffer, which must match them exactly
+    bomb = encode_ndarray(np.zeros(10_000_000, dtype=np.uint8), compress=True)
+    for invalid in [
+        bomb | {"shape": [10]},
+        encoded | {"shape": [4, 4]},
+        encoded | {"shape": [-3, -4]},
+        encoded | {"dtype": "<f8"},
+        encoded | {"dtype": "not a dtype"},
+        encode_ndarray(sample) | {"shape": [2]},
+    ]:
+        with pytest.raises(ValueError):
+            decode_ndarray(invalid)
+    with pytest.raises(ValidationError):
+        ImplSampleValueWithError.model_validate({"sample": encoded | {"shape": [5]}})
+
+
+def test_sample_dtype_policy():
+    x = np.random.default_rng(123).normal(1e4, 1, 10_001)
+    obj = ImplSampleValueWithError(sample=x, dtype=np.float32)
+    assert obj.sample.dtype == np.float32
+    stored = obj.sample.astype(np.float64)
+    assert obj.value == pytest.approx(np.mean(stored), rel=1e-15)
+    assert obj.SD == pytest.approx(np.std(stored), rel=1e-9)
+    assert obj.get_CI(0.9).lower == np.quantile(stored, 0.05)
+    assert (obj + make_ValueWithError(1.0, 0.1).obj).sample.dtype == np.float32  # type: ignore[operator]
+    # The moments of the result are those of its rounded sample, not carried over in float64
+    shifted = obj * 3.1 + 0.7
+    assert shifted.moments == sample_moments(shifted.sample)  # type: ignore[union-attr]
+    assert shifted.moments != (
+        obj.moments[0],
+        obj.value * 3.1 + 0.7,
+        obj.moments[2] * 3.1**2,
+    )  # type: ignore[union-attr]
+
+    for encoding in ["list", "base64"]:
+        json = obj.model_dump_json(context={NDARRAY_ENCODING: encoding})
+        restored = ImplSampleValueWithError.model_validate_json(json)
+        assert restored.sample.dtype == np.float32
+        assert restored.moments == obj.moments
+    assert "dtype" not in ImplSampleValueWithError(sample=x).model_dump()
+    with pytest.raises(ValueError):
+        ImplSampleValueWithError(sample=x, dtype="int32")
+
+    set_sample_dtype("float16")
+    try:
+        assert from_samples(x).sample.dtype == np.float16  # type: ignore[union-attr]
+        explicit = ImplSampleValueWithError(sample=x, dtype="float64")
+        assert explicit.sample.dtype == np.float64
+        json = explicit.model_dump_json()
+    finally:
+        set_sample_dtype(None)
+    assert ImplSampleValueWithError.model_validate_json(json).sample.dtype == np.float64
+    assert from_samples(x).sample.dtype == np.float64  # type: ignore[union-attr]
+
+
+def test_CIs_at_many_levels_match_get_CI():
+    x = make_ValueWithError_from_vector(
+        np.random.default_rng(123).exponential(size=1001)
+    )
+    levels = [0.5, 0.8, 0.95, 0.99]
+    for obj in (x.obj, x.obj.compact()):  # type: ignore[union-attr]
+        lower, upper = obj.get_CIs(levels)
+        for i, level in enumerate(levels):
+            ci = obj.get_CI(level)
+            assert (lower[i], upper[i]) == (ci.lower, ci.upper)
+        # Levels within rounding of 0.95 are the 95% CI, as for the parametric estimates
+        assert isinstance(obj.get_CI(0.95 + 1e-9), CI_95)
+
+
+def test_order_statistics_index():
+    x = np.random.default_rng(123).standard_t(3, size=10_001)
+    plain = ImplSampleValueWithError(sample=x)
+    indexed = ImplSampleValueWithError(sample=x).index_order_statistics()
+    assert not indexed.is_order_statistics_indexed
+    assert indexed.value == plain.value
+    assert not indexed.is_order_statistics_indexed
+
+    levels = [0.5, 0.8, 0.9, 0.95, 0.9123]
+    for level in levels:
+        assert indexed.get_CI(level) == plain.get_CI(level)
+    assert indexed.is_order_statistics_indexed
+    assert indexed.CI95 == plain.CI95
+    assert np.array_equal(indexed.get_CIs(levels), plain.get_CIs(levels))
+    q = np.random.default_rng(1).uniform(size=100)
+    assert np.array_equal(indexed.quantile(q), np.quantile(x, q))
+    assert indexed.median == plain.median == np.median(x)
+    assert np.array_equal(indexed.compact().quantiles_, plain.compact().quantiles_)
+
+    unpickled = pickle.loads(pickle.dumps(indexed))
+    assert not unpickled.is_order_statistics_indexed
+    assert unpickled.get_CI(0.9) == plain.get_CI(0.9)
+    assert unpickled.is_order_statistics_indexed
+
+    assert (
+        from_samples(x, index_order_statistics=True).obj.is_order_statistics_indexed
+        is False
+    )  # type: ignore[union-attr]
+    with_nan = ImplSampleValueWithError(sample=np.append(x, np.nan))
+    assert np.isnan(with_nan.index_order_statistics().median)
+
+
+def test_affine_arithmetics_carries_moments():
+    np.random.seed(123)
+    vec = np.random.normal(10, 2, 10_000)
+    obj = ImplSampleValueWithError(sample=vec)
+
+    ans = -(obj * 3 + 1)
+    assert np.array_equal(ans.sample, -(vec * 3 + 1))
+    count, mean, M2 = ans.moments
+    assert count == 10_000
+    assert mean == pytest.approx(np.mean(-(vec * 3 + 1)), rel=1e-14)
+    assert M2 == pytest.approx(np.sum((vec * 3 - np.mean(vec * 3)) ** 2), rel=1e-12)
+    assert ans.get_CI(0.9).lower == pytest.approx(
+        np.percentile(-(vec * 3 + 1), 5), rel=1e-14
+    )
+
+    # Identities return the same (read-only) sample
+    assert obj + 0 is obj
+    assert obj * 1 is obj
+    assert not ans.sample.flags.writeable
+
+
+def test_arithmetics_dtypes():
+    obj = ImplSampleValueWithError(sample=np.asarray([1, 2, 3], dtype=np.float32))
+    assert (obj * 2).sample.dtype == np.float32
+    assert (-obj).sample.dtype == np.float32
+
+    obj = ImplSampleValueWithError(sample=np.asarray([1, 2, 3], dtype=np.uint8))
+    assert np.array_equal((-obj).sample, [-1.0, -2.0, -3.0])
+    assert (obj + obj).sample.dtype == np.float64
+
+
+def test_samples_combine_draw_by_draw():
+    np.random.seed(123)
+    x = np.random.normal(1, 1, 1000)
+    y = np.random.normal(2, 1, 1000)
+    a, b = make_ValueWithError_from_vector(x), make_ValueWithError_from_vector(y)
+
+    assert np.array_equal((a * b - a).obj.sample, x * y - x)  # type: ignore[union-attr]
+    # Perfectly correlated draws do not add up as independent ones
+    assert (a - a).SE == 0
+
+    with pytest.raises(ValueError):
+        print(a + make_ValueWithError_from_vector(y[:10]))
+    with pytest.raises(ValueError):
+        print(a + from_samples(y, grid_size=16))
+    with pytest.raises(ValueError):
+        print(-from_samples(y, grid_size=16))
+
+
+def test_parametric_operands_are_broadcast_as_draws():
+    np.random.seed(123)
+    vec = np.random.normal(10, 1, 200_000)
+    sample = make_ValueWithError_from_vector(vec)
+    normal = make_ValueWithError(5.0, 2.0)
+    student = make_ValueWithError(5.0, 2.0, N=5)
+
+    ans = sample + normal
+    assert ans.value == pytest.approx(15, abs=0.05)
+    assert ans.obj.SD == pytest.approx(np.sqrt(5), rel=0.01)  # type: ignore[union-attr]
+    assert (normal + sample).value == pytest.approx(15, abs=0.05)
+
+    # Reproducible with a seed, whether it is given as an int or as a generator
+    obj = sample.obj
+    seeded = obj.add(normal.obj, seed=1)  # type: ignore[union-attr]
+    assert np.array_equal(obj.add(normal.obj, seed=1).sample, seeded.sample)  # type: ignore[union-attr]
+    assert np.array_equal(
+        obj.add(normal.obj, seed=np.random.default_rng(1)).sample,  # type: ignore[union-attr]
+        seeded.sample,
+    )
+    assert not np.array_equal(obj.add(normal.obj, seed=2).sample, seeded.sample)  # type: ignore[union-attr]
+    assert np.array_equal(obj.sub(-normal.obj, seed=1).sample, seeded.sample)  # type: ignore[union-attr,operator]
+    assert obj.mul(normal.obj, seed=1).value == pytest.approx(50, rel=0.01)  # type: ignore[union-attr]
+
+    # The Student estimate keeps its heavier tails
+    draws = (sample * 0 + student).obj.sample  # type: ignore[union-attr]
+    assert np.percentile(draws, 97.5) == pytest.approx(student.CI95.upper, rel=0.01)
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from ValueWithError import QuantileSketch, CI_95, CI_any
+
+
+def test_accuracy_and_size():
+    np.random.seed(123)
+    data = np.random.normal(100, 10, 1_000_000)
+    sketch = QuantileSketch()
+    for chunk in np.array_split(data, 37):
+        sketch.update(chunk)
+
+    assert sketch.N == len(data)
+    assert sketch.nbytes < 4096
+    q = np.asarray([0.001, 0.025, 0.5, 0.975, 0.999])
+    exact = np.quantile(data, q)
+    approx = sketch.quantile(q)
+    assert np.all(np.abs(approx - exact) < 0.05)
+
+    ci = sketch.CI95
+    assert isinstance(ci, CI_95)
+    assert ci.lower == pytest.approx(exact[1], abs=0.05)
+    ci = sketch.get_CI(0.998)
+    assert isinstance(ci, CI_any)
+    assert ci.upper == pytest.approx(exact[4], abs=0.05)
+
+
+def test_merge_and_generators():
+    np.random.seed(123)
+    data = np.random.exponential(1, 200_000)
+    parts = [QuantileSketch().update(iter(part)) for part in np.array_split(data, 4)]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    assert merged.N == len(data)
+    assert merged.quantile(0.975) == pytest.approx(np.quantile(data, 0.975), rel=3e-3)
+    assert merged.quantile(0.0) == np.min(data)
+    assert merged.quantile(1.0) == np.max(data)
+
+
+def test_small_sample_is_exact():
+    sketch = QuantileSketch().update([3.0, 1.0, 2.0, 4.0])
+    assert sketch.quantile(0.5) == 2.5
+    assert str(sketch.CI95) == str(
+        CI_95.CreateFromVector(np.asarray([1.0, 2.0, 3.0, 4.0]))
+    )
+    with pytest.raises(ValueError):
+        QuantileSketch().quantile(0.5)
+
+
+def test_level_close_to_95():
+    sketch = QuantileSketch().update(np.arange(1000.0))
+    assert isinstance(sketch.get_CI(0.95 + 1e-9), CI_95)
+
+
+@pytest.mark.parametrize("level", [0.0, 1.0, 1.5, -0.5, float("nan")])
+def test_invalid_level(level):
+    with pytest.raises(ValueError):
+        QuantileSketch().update(np.arange(1000.0)).get_CI(level)
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from ValueWithError import RunningValueWithError, from_stream
+from ValueWithError.ImplStudentValueWithError import ImplStudentValueWithError
+
+
+def test_matches_numpy():
+    np.random.seed(123)
+    vec = np.random.normal(1e9, 10, 200_001)
+
+    acc = RunningValueWithError()
+    acc.add(vec[:10])
+    for x in vec[10:20]:
+        acc.add(float(x))
+    acc.add(vec[20:])
+
+    assert acc.N == len(vec)
+    assert acc.value == pytest.approx(np.mean(vec), rel=1e-15)
+    assert acc.SD == pytest.approx(np.std(vec), rel=1e-9)
+
+    est = acc.snapshot()
+    assert isinstance(est, ImplStudentValueWithError)
+    assert est.SE == pytest.approx(np.std(vec) / np.sqrt(len(vec)), rel=1e-9)
+
+
+def test_merge():
+    np.random.seed(123)
+    vec = np.random.normal(5, 2, 1000)
+    parts = [RunningValueWithError().add(part) for part in np.array_split(vec, 7)]
+
+    merged = RunningValueWithError()
+    for part in parts:
+        merged.merge(part)
+    combined = RunningValueWithError.combine(parts)
+    whole = RunningValueWithError().add(vec)
+
+    for acc in [merged, combined]:
+        assert acc.N == whole.N
+        assert acc.value == pytest.approx(whole.value, rel=1e-14)
+        assert acc.SD == pytest.approx(whole.SD, rel=1e-12)
+
+
+def test_serialization():
+    acc = RunningValueWithError().add(np.asarray([1.0, 2.0, 4.0]))
+    restored = RunningValueWithError.model_validate_json(acc.model_dump_json())
+    assert restored.moments == acc.moments
+
+
+def test_from_stream():
+    def generator():
+        for i in range(1000):
+            yield float(i)
+
+    ans = from_stream(generator())
+    assert ans.N == 1000
+    assert ans.value == pytest.approx(499.5)
+
+    ans = from_stream(generator(), max_samples=10)
+    assert ans.N == 10
+    assert ans.value == pytest.approx(4.5)
+
+    with pytest.raises(ValueError):
+        from_stream(iter([]))
+    with pytest.raises(ValueError):
+        RunningValueWithError().snapshot()
@@ -0,0 +1,208 @@
+import json
+
+import numpy as np
+import pytest
+
+from ValueWithError import (
+    RECORD_DTYPE,
+    ValueWithErrorArray,
+    VectorOfValuesWithError,
+    from_samples,
+    make_ValueWithError,
+    propagate,
+    to_records,
+)
+from ValueWithError.ImplNormalValueWithError import ImplNormalValueWithError
+from ValueWithError.ImplStudentValueWithError import ImplStudentValueWithError
+from ValueWithError.ImplValueWithoutError import ImplValueWithoutError
+
+
+def make_items():
+    return [
+        ImplValueWithoutError(value=1.5),
+        ImplNormalValueWithError(value=2.0, SE=0.5),
+        ImplStudentValueWithError(value=-3.0, SE=0.25, N=10),
+        ImplNormalValueWithError(value=4.0, SE=0.0),
+    ]
+
+
+def test_roundtrip():
+    vec = VectorOfValuesWithError(make_items())  # type: ignore[arg-type]
+    arr = ValueWithErrorArray.from_vector(vec)
+    assert len(arr) == 4
+    assert arr.to_vector() == vec
+    assert list(arr.kind) == [0, 1, 2, 1]
+    assert np.isnan(arr.SE[0])
+    assert np.isnan(arr.N[1])
+    assert arr[2] == make_items()[2]
+
+
+def test_matches_scalar_arithmetic():
+    items = make_items()
+    arr = ValueWithErrorArray.from_items(items)  # type: ignore[arg-type]
+    bare = ValueWithErrorArray.from_items([2.0, 3.0, 4.0, 5.0])
+
+    assert (-arr).to_items() == [-x for x in items]
+    assert (arr + 1).to_items() == [x + 1 for x in items]
+    # Unlike the scalar estimates, the array scales the SE with the constant
+    doubled = arr * 2
+    assert np.array_equal(doubled.value, [x.value * 2 for x in items])
+    assert np.array_equal(doubled.SE, 2 * arr.SE, equal_nan=True)
+    assert np.array_equal(doubled.kind, arr.kind) and np.array_equal(
+        doubled.N, arr.N, equal_nan=True
+    )
+    assert doubled.SE == pytest.approx(propagate(np.multiply, arr, 2).SE, nan_ok=True)
+    assert (arr - 1.5).to_items() == [x - 1.5 for x in items]
+    assert (arr + bare).to_items() == [x + y for x, y in zip(items, bare)]
+    assert np.array_equal((bare * arr).SE, arr.SE * bare.value, equal_nan=True)
+    assert np.array_equal((-2 * arr).SE, 2 * arr.SE, equal_nan=True)
+    assert (3 - arr).to_items() == [3 - x for x in items]
+    assert (arr + np.arange(4.0)).to_items() == [
+        x + float(y) for x, y in zip(items, np.arange(4.0))
+    ]
+
+    normal = ValueWithErrorArray([1.0, 2.0], SE=[3.0, 4.0])
+    assert list((normal + normal).SE) == [
+        (x + x).SE
+        for x in normal.to_items()  # type: ignore[union-attr]
+    ]
+
+
+def test_unsupported_operations():
+    arr = ValueWithErrorArray.from_items(make_items())  # type: ignore[arg-type]
+    with pytest.raises(ValueError):
+        print(arr + arr)
+    with pytest.raises(ValueError):
+        print(arr * arr)
+    with pytest.raises(ValueError):
+        print(arr + arr[:2])
+    with pytest.raises(ValueError):
+        ValueWithErrorArray([1.0], SE=[-1.0])
+
+
+def test_CI():
+    arr = ValueWithErrorArray.from_items(make_items())  # type: ignore[arg-type]
+    for level in [0.95, 0.8, 0.995]:
+        lower, upper = arr.get_CI(level)
+        assert np.isnan(lower[0]) and np.isnan(upper[0])
+        for i, item in enumerate(arr.to_items()[1:], start=1):
+            ci = item.get_CI(level)  # type: ignore[union-attr]
+            assert lower[i] == pytest.approx(ci.lower)
+            assert upper[i] == pytest.approx(ci.upper)
+    lower, upper = arr.CI95
+    assert lower[1] == pytest.approx(2.0 - 1.959963984540054 * 0.5)
+    assert arr.SD[2] == pytest.approx(0.25 * np.sqrt(10))
+    assert np.isnan(arr.SD[1])
+    for level in [0.0, 1.0, 1.5, np.nan]:
+        with pytest.raises(ValueError):
+            arr.get_CI(level)
+
+
+def test_CIs_at_many_levels():
+    items = make_items()
+    levels = [0.5, 0.9, 0.95, 0.995]
+    lower, upper = ValueWithErrorArray.from_items(items).get_CIs(levels)  # type: ignore[arg-type]
+    assert lower.shape == upper.shape == (4, 4)
+    assert np.all(np.isnan(lower[0])) and np.all(np.isnan(upper[0]))
+    for i, item in enumerate(items[1:], start=1):
+        assert np.allclose(item.get_CIs(levels), (lower[i], upper[i]), rtol=1e-14)  # type: ignore[union-attr]
+        for j, level in enumerate(levels):
+            ci = item.get_CI(level)  # type: ignore[union-attr]
+            assert lower[i, j] == pytest.approx(ci.lower, rel=1e-14)
+            assert upper[i, j] == pytest.approx(ci.upper, rel=1e-14)
+
+    sample = from_samples(np.random.default_rng(123).normal(size=1001))
+    vec = VectorOfValuesWithError([*items, sample.obj])  # type: ignore[list-item]
+    vec_lower, vec_upper = vec.get_CIs(levels)
+    assert np.array_equal(vec_lower[:4], lower, equal_nan=True)
+    assert np.array_equal(vec_upper[:4], upper, equal_nan=True)
+    assert np.array_equal(vec_lower[4], sample.get_CIs(levels)[0])  # type: ignore[index]
+    assert make_ValueWithError(1.0).get_CIs(levels) is None
+
+    with pytest.raises(ValueError):
+        vec.get_CIs([0.9, 1.0])
+
+
+def test_records_roundtrip():
+    vec = VectorOfValuesWithError(make_items())  # type: ignore[arg-type]
+    records = vec.to_records()
+    assert records.dtype == RECORD_DTYPE
+    assert records["kind"].tolist() == [0, 1, 2, 1]
+    assert VectorOfValuesWithError.from_records(records) == vec
+
+    # The columns are views of the records
+    arr = ValueWithErrorArray.from_records(records)
+    assert np.shares_memory(arr.value, records) and np.shares_memory(arr.SE, records)
+
+    # Plain numpy slicing, sorting and masking
+    by_value = ValueWithErrorArray.from_records(np.sort(records, order="value"))
+    assert by_value.value.tolist() == [-3.0, 1.5, 2.0, 4.0]
+    assert by_value[0] == make_items()[2]
+    errored = ValueWithErrorArray.from_records(records[records["kind"] != 0])
+    assert errored.to_items() == make_items()[1:]
+
+    items = [make_ValueWithError(1.0, 0.5), 2.0, make_items()[2]]
+    assert to_records(items)["SE"][0] == 0.5
+    assert to_records(arr).tobytes() == records.tobytes()
+
+
+def test_inconsistent_records_are_normalized_or_rejected():
+    records = VectorOfValuesWithError(make_items()).to_records()  # type: ignore[arg-type]
+    records["N"][1] = 5.0  # N of a normal element is ignored
+    arr = ValueWithErrorArray.from_records(records)
+    assert np.isnan(arr.N[1]) and not np.shares_memory(arr.N, records)
+
+    records["SE"][1] = -1.0
+    with pytest.raises(ValueError):
+        ValueWithErrorArray.from_records(records)
+    with pytest.raises(ValueError):
+        ValueWithErrorArray.from_records(np.zeros(3))
+
+
+def test_save_and_memory_map(tmp_path):
+    arr = ValueWithErrorArray.from_items(make_items() * 1000)  # type: ignore[arg-type]
+    path = tmp_path / "estimates.npy"
+    arr.save(path)
+
+    loaded = ValueWithErrorArray.load(path, mmap_mode="r")
+    mapped = np.load(path, mmap_mode="r")
+    assert np.shares_memory(ValueWithErrorArray.from_records(mapped).value, mapped)
+    assert loaded.to_vector() == arr.to_vector()
+    lower, upper = loaded.CI95
+    assert np.array_equal(lower, arr.CI95[0], equal_nan=True)
+
+
+def test_columnar_json():
+    vec = VectorOfValuesWithError(make_items())  # type: ignore[arg-type]
+    data = vec.to_columnar_json()
+    assert data == (
+        b'{"value":[1.5,2.0,-3.0,4.0],"SE":[null,0.5,0.25,0.0],'
+        b'"N":[null,null,10.0,null],"kind":[0,1,2,1]}'
+    )
+    assert VectorOfValuesWithError.from_columnar_json(data) == vec
+    assert VectorOfValuesWithError.from_columnar_json(data.decode()) == vec
+
+    # The list of items is still the default layout, and loads back as well
+    assert VectorOfValuesWithError.model_validate_json(vec.model_dump_json()) == vec
+
+    # Infinite values and SEs survive the round trip, as standard JSON
+    arr = ValueWithErrorArray([np.inf, 1.0, -np.inf], SE=[1.0, np.nan, np.inf])
+    data = arr.to_columnar_json()
+    json.loads(data, parse_constant=pytest.fail)
+    restored = ValueWithErrorArray.from_columnar_json(data)
+    assert restored.value.tolist() == [np.inf, 1.0, -np.inf]
+    assert np.array_equal(restored.SE, arr.SE, equal_nan=True)
+    assert np.array_equal(restored.kind, arr.kind)
+
+    # Missing columns are inferred as in the constructor
+    arr = ValueWithErrorArray.from_columnar_json(
+        b'{"value": [1.0, 2.0], "SE": [null, 0.5]}'
+    )
+    assert arr.kind.tolist() == [0, 1]
+
+    with pytest.raises(ValueError):
+        ValueWithErrorArray.from_columnar_json(b'{"value": [1.0], "SE": [-1.0]}')
+    with pytest.raises(ValueError):
+        ValueWithErrorArray.from_columnar_json(b'{"value": [1.0, 2.0], "SE": [0.1]}')
+    with pytest.raises(ValueError):
+        ValueWithErrorArray.from_columnar_json(b'{"SE": [0.1]}')
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from ValueWithError import CI_any, bootstrap, make_ValueWithError_from_vector
+from ValueWithError.bootstrap import jackknife_acceleration, mean_acceleration
+
+
+def test_replicates_do_not_depend_on_workers_or_chunks():
+    x = np.random.default_rng(123).exponential(size=1000)
+
+    result = bootstrap(x, n_resamples=2000, seed=1, max_workers=1, task_size=100_000)
+    in_pool = bootstrap(x, n_resamples=2000, seed=1, max_workers=2, task_size=100_000)
+    chunked = bootstrap(
+        x, n_resamples=2000, seed=1, max_workers=1, task_size=100_000, chunk_size=3000
+    )
+    assert np.array_equal(result.replicates, in_pool.replicates)
+    assert np.array_equal(result.replicates, chunked.replicates)
+    assert not np.array_equal(
+        result.replicates, bootstrap(x, n_resamples=2000, seed=2).replicates
+    )
+
+    assert len(result) == 2000
+    assert result.estimate == pytest.approx(np.mean(x), rel=1e-14)
+    assert result.SE == pytest.approx(np.std(x) / np.sqrt(len(x)), rel=0.05)
+
+
+def test_percentile_and_bca_CIs():
+    x = np.random.default_rng(123).exponential(size=1000)
+    result = bootstrap(x, n_resamples=4000, seed=1, max_workers=1)
+
+    ci = result.get_CI(0.9)
+    assert isinstance(ci, CI_any)
+    assert ci.level == 0.9
+    assert ci.lower == np.percentile(result.replicates, 5)
+    assert result.CI95.level == 0.95
+
+    # BCa shifts the interval of the mean of a right-skewed sample to the right
+    bca = result.get_CI(0.9, method="bca")
+    assert result.acceleration > 0
+    assert bca.lower > ci.lower and bca.upper > ci.upper
+    with pytest.raises(ValueError):
+        result.get_CI(0.9, method="basic")  # type: ignore[arg-type]
+
+
+def test_acceleration_of_mean_matches_jackknife():
+    x = np.random.default_rng(123).exponential(size=500)
+    jackknife = (np.sum(x) - x) / (len(x) - 1)
+    d = jackknife.mean() - jackknife
+    expected = np.sum(d**3) / (6 * np.sum(d**2) ** 1.5)
+    assert mean_acceleration(x, chunk_size=64) == pytest.approx(expected, rel=1e-9)
+    assert jackknife_acceleration(x, np.mean, groups=500) == pytest.approx(
+        expected, rel=1e-9
+    )
+
+
+def test_user_statistic_and_big_samples():
+    x = np.random.default_rng(123).normal(size=10_000)
+    median = bootstrap(x, np.median, n_resamples=200, seed=1, max_workers=1)
+    assert median.estimate == np.median(x)
+    assert median.SE == pytest.approx(1.2533 / np.sqrt(len(x)), rel=0.2)
+
+    # A resample bigger than a chunk is reduced piecewise
+    mean = bootstrap(x, n_resamples=200, seed=1, max_workers=1, chunk_size=1000)
+    assert mean.SE == pytest.approx(1 / np.sqrt(len(x)), rel=0.2)
+
+
+def test_bootstrap_of_memory_mapped_sample(tmp_path):
+    path = tmp_path / "draws.npy"
+    np.save(path, np.random.default_rng(123).normal(10, 1, 5000))
+    v = make_ValueWithError_from_vector(np.load(path, mmap_mode="r"))
+
+    result = v.obj.bootstrap(n_resamples=1000, seed=1, max_workers=2, task_size=10**6)  # type: ignore[union-attr]
+    in_process = bootstrap(
+        np.load(path), n_resamples=1000, seed=1, max_workers=1, task_size=10**6
+    )
+    assert np.array_equal(result.replicates, in_process.replicates)
+    assert result.estimate == v.value
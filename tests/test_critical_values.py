@@ -0,0 +1,65 @@
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+from scipy.stats import norm, t
+
+from ValueWithError import make_ValueWithError
+from ValueWithError.critical_values import (
+    critical_value,
+    critical_values,
+    normal_quantile,
+)
+
+
+def test_scalar():
+    assert critical_value(0.95) == pytest.approx(1.959963984540054, rel=1e-15)
+    assert critical_value(0.9) == pytest.approx(norm.ppf(0.95), rel=1e-15)
+    assert critical_value(0.95, df=4) == pytest.approx(t.ppf(0.975, 4), rel=1e-15)
+    assert critical_value(0.9123, df=7.5) == pytest.approx(
+        t.ppf(1 - (1 - 0.9123) / 2, 7.5), rel=1e-15
+    )
+    assert critical_value(0.95, df=np.inf) == critical_value(0.95)
+    assert critical_value(0.95, df=0) == np.inf
+
+
+def test_vectorized():
+    levels = np.asarray([0.8, 0.9, 0.95, 0.99, 0.9123])[:, None]
+    dfs = np.asarray([1.0, 9.0, 1000.5, np.nan, np.inf])[None, :]
+    expected = np.vectorize(critical_value)(
+        levels, np.where(np.isnan(dfs), np.inf, dfs)
+    )
+    assert critical_values(levels, dfs) == pytest.approx(expected, rel=1e-15)
+
+    big_levels = np.repeat(levels, 20, axis=1)
+    assert critical_values(big_levels, 9.0) == pytest.approx(
+        np.vectorize(critical_value)(big_levels, 9.0), rel=1e-15
+    )
+
+
+def test_student_CI_uses_t_quantiles():
+    a = make_ValueWithError(1.0, 0.1, N=5)
+    assert str(a.CI95) == "CI_95%: (0.72, 1.28)"
+    ci = a.get_CI(0.9)
+    assert ci.upper == pytest.approx(1.0 + 0.1 * t.ppf(0.95, 4))
+
+
+def test_normal_quantile():
+    p = np.concatenate([np.linspace(1e-12, 1 - 1e-12, 10001), [1e-300, 0.975]])
+    assert [normal_quantile(x) for x in p] == pytest.approx(norm.ppf(p), rel=1e-14)
+    assert normal_quantile(0.5) == 0.0
+    assert normal_quantile(0.0) == -np.inf
+    assert normal_quantile(1.0) == np.inf
+
+
+def test_lazy_import():
+    code = (
+        "import sys, ValueWithError as V;"
+        "assert 'pydantic' not in sys.modules and 'numpy' not in sys.modules;"
+        "V.make_ValueWithError(1.0, 0.1).get_CI(0.9);"
+        "assert 'scipy.stats' not in sys.modules;"
+        "V.make_ValueWithError(1.0, 0.1, N=5).get_CI(0.9123);"
+        "assert 'scipy.stats' in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
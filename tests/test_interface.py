@@ -22,8 +22,8 @@ def test1():
 
     c = ValueWithError.make_ValueWithError(mean=b.value, SE=b.SE, N=b.N)
     assert str(c) == "123456.3 ± 1.1"
-    assert str(c.get_CI_from_SD(level=0.95)) == "CI_95%: (123434, 123478)"
-    assert str(c.get_CI_from_SD(0.995)) == "CI_99.5%: (123425, 123488)"
+    assert str(c.get_CI_from_SD(level=0.95)) == "CI_95%: (123434, 123479)"
+    assert str(c.get_CI_from_SD(0.995)) == "CI_99.5%: (123424, 123489)"
     assert str(c.SDEstimate) == "11.3 ± 1.1"
     assert str(c.SEEstimate) == "1.13 ± 0.11"
 
@@ -40,3 +40,9 @@ def test_for_integer():
 if __name__ == "__main__":
     test_for_integer()
     test1()
+
+
+def test_public_names():
+    assert sorted(ValueWithError.__all__) == sorted(ValueWithError._LAZY_NAMES)
+    for name in ValueWithError.__all__:
+        assert getattr(ValueWithError, name) is not None
@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from ValueWithError import from_sample_files
+from ValueWithError.ImplSampleValueWithError import ImplSampleValueWithError
+from ValueWithError.ImplStudentValueWithError import ImplStudentValueWithError
+from ValueWithError.order_statistics import sample_percentiles
+from ValueWithError.parallel import parallel_moments
+from ValueWithError.pydantic_numpy import ALLOW_FILE_REFERENCES, NDARRAY_MEMMAP
+
+
+def test_shards(tmp_path):
+    np.random.seed(123)
+    data = np.random.normal(1e6, 3, 10_000)
+    shards = np.array_split(data, 3)
+    np.save(tmp_path / "a.npy", shards[0])
+    np.save(tmp_path / "b.npy", shards[1])
+    shards[2].astype(np.float32).tofile(tmp_path / "c.bin")
+    expected = np.concatenate([shards[0], shards[1], shards[2].astype(np.float32)])
+
+    count, mean, M2 = parallel_moments(
+        [tmp_path / "a.npy", tmp_path / "b.npy"], max_workers=1, task_size=1000
+    )
+    assert count == len(shards[0]) + len(shards[1])
+
+    with pytest.raises(ValueError):
+        parallel_moments([tmp_path / "c.bin"])
+
+    ans = from_sample_files(
+        [tmp_path / "a.npy", tmp_path / "b.npy", tmp_path / "c.bin"],
+        dtype=np.float32,
+        max_workers=2,
+    )
+    assert isinstance(ans.obj, ImplStudentValueWithError)
+    assert ans.N == len(expected)
+    assert ans.value == pytest.approx(np.mean(expected), rel=1e-14)
+    assert ans.SD == pytest.approx(np.std(expected), rel=1e-9)
+
+
+def test_memory_mapped_sample(tmp_path):
+    data = np.arange(1000.0)
+    np.save(tmp_path / "a.npy", data)
+
+    ans = from_sample_files(tmp_path / "a.npy", max_workers=1, memory_map_sample=True)
+    assert isinstance(ans.obj, ImplSampleValueWithError)
+    assert isinstance(ans.sample, np.memmap)
+    assert ans.value == pytest.approx(499.5)
+    assert ans.SD == pytest.approx(np.std(data))
+
+    with pytest.raises(ValueError):
+        from_sample_files(
+            [tmp_path / "a.npy", tmp_path / "a.npy"], memory_map_sample=True
+        )
+
+
+def test_sample_from_npy_path(tmp_path):
+    rng = np.random.default_rng(7)
+    data = rng.normal(3, 2, 20_000)
+    np.save(tmp_path / "draws.npy", data)
+
+    path = str(tmp_path / "draws.npy")
+    with pytest.raises(ValueError):
+        ImplSampleValueWithError(sample=path)
+    ans = ImplSampleValueWithError.model_validate(
+        {"sample": path}, context={ALLOW_FILE_REFERENCES: True}
+    )
+    assert isinstance(ans.sample, np.memmap)
+    assert ans.value == pytest.approx(np.mean(data), rel=1e-14)
+    assert ans.CI95.lower == np.percentile(data, 2.5)
+    assert ans.get_CI(0.8).upper == np.percentile(data, 90)
+
+    # The file is referenced, not inlined, and validation maps it again
+    dumped = ans.model_dump()
+    assert dumped["sample"]["path"] == str(tmp_path / "draws.npy")
+    with pytest.raises(ValueError):
+        ImplSampleValueWithError.model_validate_json(ans.model_dump_json())
+    restored = ImplSampleValueWithError.model_validate_json(
+        ans.model_dump_json(), context={ALLOW_FILE_REFERENCES: True}
+    )
+    assert isinstance(restored.sample, np.memmap)
+    assert np.array_equal(restored.sample, data)
+
+    inlined = ans.model_dump(context={NDARRAY_MEMMAP: "inline"})
+    assert inlined["sample"] == data.tolist()
+
+
+def test_memmap_view_reference(tmp_path):
+    data = np.arange(5000.0).reshape(50, 100)
+    np.save(tmp_path / "a.npy", data)
+    mapped = np.load(tmp_path / "a.npy", mmap_mode="r")
+
+    ans = ImplSampleValueWithError(sample=mapped[10:20])
+    restored = ImplSampleValueWithError.model_validate(
+        ans.model_dump(), context={ALLOW_FILE_REFERENCES: True}
+    )
+    assert isinstance(restored.sample, np.memmap)
+    assert np.array_equal(restored.sample, data[10:20])
+
+    # Not contiguous views are inlined
+    ans = ImplSampleValueWithError(sample=mapped[:, 3])
+    assert ans.model_dump()["sample"] == data[:, 3].tolist()
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        np.random.default_rng(1).standard_cauchy(50_000),
+        np.random.default_rng(2).integers(0, 5, 50_000).astype(np.float64),
+        np.concatenate([np.zeros(20_000), [-np.inf, 1e300, np.inf], np.ones(30)]),
+        np.full(20_000, -1.5, dtype=np.float32),
+    ],
+)
+def test_out_of_core_percentiles(data):
+    percentiles = [0, 1e-9, 2.5, 33.3333, 50, 97.5, 100]
+    ans = sample_percentiles(data, percentiles, chunk_size=1000, in_memory_size=1000)
+    with np.errstate(invalid="ignore"):
+        expected = np.percentile(data.astype(np.float64), percentiles)
+    assert np.array_equal(ans, expected, equal_nan=True)
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from ValueWithError import ValueWithErrorArray, make_ValueWithError, propagate
+from ValueWithError.ValueWithErrorArray import KIND_NO_ERROR, KIND_NORMAL, KIND_STUDENT
+from ValueWithError.propagation import register_derivatives
+
+
+def make_arrays(n=1000):
+    rng = np.random.default_rng(11)
+    x = ValueWithErrorArray(value=rng.uniform(1, 10, n), SE=rng.uniform(0, 0.1, n))
+    y = ValueWithErrorArray(
+        value=rng.uniform(1, 10, n), SE=rng.uniform(0, 0.1, n), N=np.full(n, 25)
+    )
+    return x, y
+
+
+def test_analytic_derivatives():
+    x, y = make_arrays()
+    ans = propagate(np.log, x)
+    assert np.array_equal(ans.value, np.log(x.value))
+    assert ans.SE == pytest.approx(x.SE / x.value, rel=1e-14)
+    assert np.all(ans.kind == KIND_NORMAL)
+
+    ratio = propagate(np.divide, x, y)
+    expected = np.hypot(x.SE / y.value, x.value * y.SE / y.value**2)
+    assert ratio.SE == pytest.approx(expected, rel=1e-12)
+    assert np.all(ratio.kind == KIND_NORMAL)
+
+
+def test_finite_differences_match_analytic():
+    x, y = make_arrays()
+    for func, numeric in [
+        (np.log, lambda u: np.log(u)),
+        (np.exp, lambda u: np.exp(u)),
+        (np.sqrt, lambda u: u**0.5),
+    ]:
+        assert propagate(numeric, x).SE == pytest.approx(
+            propagate(func, x).SE, rel=1e-8
+        )
+    assert propagate(lambda u, v: u / v, x, y).SE == pytest.approx(
+        propagate(np.divide, x, y).SE, rel=1e-8
+    )
+
+    # Small values are not stepped out of the domain, and zero still gets a step
+    near_zero = ValueWithErrorArray(
+        value=[1e-7, 1e-12, 3e-300], SE=[1e-9, 1e-14, 1e-302]
+    )
+    for func, numeric in [
+        (np.log, lambda u: np.log(u)),
+        (np.sqrt, lambda u: np.sqrt(u)),
+    ]:
+        assert propagate(numeric, near_zero).SE == pytest.approx(
+            propagate(func, near_zero).SE, rel=1e-8
+        )
+    zero = ValueWithErrorArray(value=[0.0], SE=[0.1])
+    assert propagate(lambda u: np.exp(u), zero).SE == pytest.approx([0.1], rel=1e-8)
+
+
+def test_kinds_and_broadcasting():
+    x, y = make_arrays(5)
+    # A single Student operand keeps its N, constants do not add error
+    ans = propagate(np.multiply, y, 2.0)
+    assert np.all(ans.kind == KIND_STUDENT)
+    assert np.array_equal(ans.N, y.N)
+    assert ans.SE == pytest.approx(2 * y.SE)
+
+    scalar = make_ValueWithError(3.0, 0.5)
+    ans = propagate(np.add, x, scalar)
+    assert ans.SE == pytest.approx(np.hypot(x.SE, 0.5))
+
+    bare = ValueWithErrorArray(value=[1.0, 2.0])
+    ans = propagate(np.exp, bare)
+    assert np.all(ans.kind == KIND_NO_ERROR)
+    assert np.all(np.isnan(ans.SE))
+
+    # Elements with an error only in some operands
+    mixed = ValueWithErrorArray(value=[4.0, 9.0], SE=[np.nan, 0.3])
+    ans = propagate(np.sqrt, mixed)
+    assert ans.kind.tolist() == [KIND_NO_ERROR, KIND_NORMAL]
+    assert ans.SE[1] == pytest.approx(0.3 / 6)
+
+    with pytest.raises(ValueError):
+        propagate(np.add, x, ValueWithErrorArray(value=[1.0]))
+    with pytest.raises(ValueError):
+        propagate(np.log, 1.0)
+
+
+def test_registered_derivatives():
+    def softplus(x):
+        return np.log1p(np.exp(x))
+
+    x, _ = make_arrays()
+    register_derivatives(softplus, lambda u: 1 / (1 + np.exp(-u)))
+    assert propagate(softplus, x).SE == pytest.approx(
+        x.SE / (1 + np.exp(-x.value)), rel=1e-14
+    )
+    assert propagate(lambda u: softplus(u), x).SE == pytest.approx(
+        propagate(softplus, x).SE, rel=1e-8
+    )
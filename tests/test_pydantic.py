@@ -1,10 +1,18 @@
 from ValueWithError import (
     ValueWithError,
+    from_samples,
     make_ValueWithError,
     make_ValueWithError_from_vector,
 )
+from ValueWithError.ImplNormalValueWithError import ImplNormalValueWithError
+from ValueWithError.slots_model import SlotsModel
 from pydantic import BaseModel
+import copy
+import pickle
+import sys
+
 import numpy as np
+import pytest
 
 
 # def test_basic():
@@ -56,6 +64,77 @@ def test1():
     assert repr(a) == repr(a2)
 
 
+def test_slots_objects():
+    v = make_ValueWithError(10.0, 1.0, 100)
+
+    assert not hasattr(v, "__dict__")
+    assert not hasattr(v.obj, "__dict__")
+    assert sys.getsizeof(v.obj) < 100
+    with pytest.raises(AttributeError):
+        v.obj = make_ValueWithError(1.0).obj  # type: ignore[misc]
+    with pytest.raises(AttributeError):
+        v.obj.value_ = 1.0  # type: ignore[misc]
+
+    assert pickle.loads(pickle.dumps(v)) == v
+    assert copy.deepcopy(v) == v
+    assert hash(v) == hash(make_ValueWithError(10.0, 1.0, 100))
+    assert repr(v) == (
+        "ValueWithError(obj=ImplStudentValueWithError(value_=10.0, SE_=1.0, N_=100))"
+    )
+
+    assert v.model_dump() == {
+        "obj": {"kind": "student", "value": 10.0, "SE": 1.0, "N": 100}
+    }
+    assert ValueWithError(obj={"value": 10.0, "SE": 1.0, "N": 100}) == v
+    with pytest.raises(ValueError):
+        ImplNormalValueWithError.model_validate({"value": 10.0, "SE": -1.0})
+    with pytest.raises(ValueError):
+        make_ValueWithError(10.0, float("nan"))
+
+    with pytest.raises(TypeError):
+
+        class Incomplete(SlotsModel):
+            __slots__ = ("value_",)
+            _fields = {"value_": "value"}
+
+
+def test_kind_tag():
+    normal = make_ValueWithError(1.0, 0.5)
+    sample = make_ValueWithError_from_vector(np.asarray([1.0, 2.0, 3.0]))
+    assert normal.model_dump() == {"obj": {"kind": "normal", "value": 1.0, "SE": 0.5}}
+    assert sample.model_dump()["obj"]["kind"] == "sample"
+
+    # The tag decides the implementation, even against the shape of the payload
+    tagged = ValueWithError.model_validate_json(
+        '{"obj": {"kind": "normal", "value": 1.0, "SE": 0.5, "N": 10}}'
+    )
+    assert tagged == normal
+    with pytest.raises(ValueError):
+        ValueWithError.model_validate(
+            {"obj": {"kind": "student", "value": 1.0, "SE": 0.5}}
+        )
+    with pytest.raises(ValueError):
+        ValueWithError.model_validate({"obj": {"kind": "unknown", "value": 1.0}})
+    with pytest.raises(ValueError):
+        ImplNormalValueWithError.model_validate(
+            {"kind": "student", "value": 1.0, "SE": 0.5}
+        )
+
+    # Untagged (legacy) payloads are recognized by their keys
+    for obj in (
+        make_ValueWithError(1.0),
+        normal,
+        make_ValueWithError(1.0, 0.5, 10),
+        sample,
+        from_samples(np.arange(100.0), grid_size=8),
+    ):
+        legacy = obj.model_dump()
+        del legacy["obj"]["kind"]
+        restored = ValueWithError.model_validate(legacy)
+        assert type(restored.obj) is type(obj.obj)
+        assert str(restored) == str(obj)
+
+
 #
 #
 #
@@ -0,0 +1,128 @@
+import numpy as np
+
+from ValueWithError import (
+    TableRenderer,
+    ValueWithErrorArray,
+    VectorOfValuesWithError,
+    ValueWithErrorRepresentationConfig as Config,
+)
+from ValueWithError.ImplNormalValueWithError import ImplNormalValueWithError
+from ValueWithError.ImplStudentValueWithError import ImplStudentValueWithError
+from ValueWithError.ImplValueWithoutError import ImplValueWithoutError
+from ValueWithError.repr_config import (
+    CI_repr,
+    CI_reprs,
+    repr_value_with_error,
+    repr_values_with_errors,
+    suggested_precision_digit_pos_for_CI,
+    suggested_precision_digit_pos_for_SE,
+)
+
+CONFIGS = [
+    Config(),
+    Config(pad_raw_value_with_zeros=True, significant_digit_bare=2),
+    Config(detect_integers=False, significant_digit_se=3),
+    Config(show_se=False),
+]
+
+
+def make_values():
+    rng = np.random.default_rng(123)
+    n = 2000
+    means = rng.normal(0, 1, n) * 10.0 ** rng.integers(-10, 18, n)
+    SEs = np.abs(rng.normal(0, 1, n)) * 10.0 ** rng.integers(-12, 18, n)
+    SEs[rng.random(n) < 0.3] = np.nan
+    special_means = [0.0, -0.0, np.nan, np.inf, -np.inf, 1e-9, -1.5, 0.125, 1000.0]
+    special_SEs = [0.0, 0.1, 1.0, np.inf, np.nan, 1e-9, np.nan, np.nan, 1e17]
+    return np.concatenate([means, special_means]), np.concatenate([SEs, special_SEs])
+
+
+def test_values_match_scalar():
+    means, SEs = make_values()
+    for config in CONFIGS:
+        for position in [None, -2, 0, 3]:
+            batch = repr_values_with_errors(means, SEs, config, position)
+            for mean, SE, text in zip(means.tolist(), SEs.tolist(), batch):
+                SE = None if np.isnan(SE) else SE
+                pos = position
+                if pos is None:
+                    pos = suggested_precision_digit_pos_for_SE(mean, SE, config)
+                if pos is None:
+                    pos = config.significant_digit_bare - 1
+                assert text == repr_value_with_error(mean, SE, pos, config)
+
+
+def test_CIs_match_scalar():
+    means, SEs = make_values()
+    lowers = means - np.nan_to_num(SEs, posinf=0)
+    uppers = means + 2 * np.nan_to_num(SEs, posinf=0)
+    # The scalar function fails on CIs with bounds beyond the infinity threshold.
+    ok = (lowers <= uppers) & (np.abs(lowers) < 1e15) & (np.abs(uppers) < 1e15)
+    lowers, uppers = lowers[ok], uppers[ok]
+    for config in CONFIGS:
+        batch = CI_reprs(lowers, uppers, config, level=0.995)
+        for lower, upper, text in zip(lowers.tolist(), uppers.tolist(), batch):
+            pos = suggested_precision_digit_pos_for_CI(lower, upper, config)
+            assert text == f"CI_99.5%: {CI_repr(lower, upper, pos, config)}"
+
+
+def test_table_repr():
+    items = [
+        ImplValueWithoutError(value=1.0),
+        ImplValueWithoutError(value=-2.5),
+        ImplNormalValueWithError(value=3.0, SE=0.1),
+        ImplStudentValueWithError(value=123.456, SE=0.5, N=16),
+    ]
+    vector = VectorOfValuesWithError(items)  # type: ignore[arg-type]
+    assert vector.table_repr() == ["1.00", "–2.50", "3.00 ± 0.10", "123.46 ± 0.50"]
+    assert vector.table_repr(Config(prefer_sd=True)) == [
+        "1",
+        "–2.5",
+        "3.000 ± 0.100",
+        "123.456 ± 2.000",
+    ]
+    array = ValueWithErrorArray.from_vector(vector)
+    for config in [None, Config(prefer_sd=True)]:
+        assert array.table_repr(config) == vector.table_repr(config)
+
+
+def test_table_renderer_matches_table_repr():
+    means, SEs = make_values()
+    items = [
+        ImplValueWithoutError(value=mean)
+        if np.isnan(SE)
+        else ImplNormalValueWithError(value=mean, SE=SE)
+        for mean, SE in zip(means.tolist(), SEs.tolist())
+        if not np.isnan(mean) and not np.isinf(SE)
+    ]
+    for config in [None, Config(prefer_sd=True)]:
+        renderer = TableRenderer(config)
+        for start in range(0, len(items), 250):
+            renderer.extend(items[start : start + 250])
+            expected = VectorOfValuesWithError(items[: start + 250]).table_repr(config)  # type: ignore[arg-type]
+            assert renderer.render() == expected
+    renderer = TableRenderer(absolute_precision_digit=1)
+    renderer.extend(items)
+    assert (
+        list(renderer.rows(10, 20))
+        == VectorOfValuesWithError(items).table_repr(  # type: ignore[arg-type]
+            absolute_precision_digit=1
+        )[10:20]
+    )
+
+
+def test_table_renderer_updates():
+    renderer = TableRenderer()
+    renderer.extend_values([1.0, 2.0], [0.1, 0.2])
+    assert list(renderer.updates()) == [(0, "1.00 ± 0.10"), (1, "2.00 ± 0.20")]
+    # The same precision: only the new row
+    renderer.append(ImplNormalValueWithError(value=3.0, SE=0.3))
+    assert list(renderer.updates()) == [(2, "3.00 ± 0.30")]
+    assert list(renderer.updates()) == []
+    # A more precise majority changes the shared precision, so all the rows are reported
+    renderer.extend_values([4.0, 5.0, 6.0, 7.0, 8.0], [0.001] * 5)
+    assert renderer.precision == 4
+    updates = list(renderer.updates())
+    assert [i for i, _ in updates] == list(range(8))
+    assert updates[0] == (0, "1.0000 ± 0.1000")
+    assert renderer[-1] == "8.0000 ± 0.0010"